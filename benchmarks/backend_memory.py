@@ -0,0 +1,51 @@
+"""
+Compares the memory used by the networkx and CSR graph backends.
+
+Builds the same bipartite PERSON -> {ORGANIZATION, PLACE, ACCOUNT} graph with
+each backend and reports the bytes allocated while building it, as measured by
+tracemalloc. The skill indexes are the same for both backends, so they are left
+out of the measurement.
+
+Usage: python -m benchmarks.backend_memory [people]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from pequenaarana.connection_graph import ConnectionGraph
+
+
+def people(count: int):
+    for i in range(count):
+        yield {
+            "name": f"person-{i}",
+            "org": f"org-{i % 500}",
+            "place": f"place-{i % 200}",
+            "account": f"account-{i % 1000}",
+            "skills": f"skill-{i % 300}, skill-{i % 77}",
+        }
+
+
+def measure(backend: str, count: int):
+    gc.collect()
+    tracemalloc.start()
+    graph = ConnectionGraph(backend=backend)
+    graph._invalidate_indexes()
+    graph.add_people(people(count))
+    graph._internal_graph.edges["person-0", "org-0"]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{count} people, {3 * count} edges")
+    for backend in ("networkx", "csr"):
+        graph, size = measure(backend, count)
+        print(
+            f"{backend:>8}: {size / 2**20:8.1f} MiB, "
+            f"{size / (len(graph.nodes) + len(graph.edges)):6.0f} bytes per node or edge"
+        )
+        del graph
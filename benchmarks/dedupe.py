@@ -0,0 +1,83 @@
+"""
+Measures duplicate detection on a graph of noisy ORGANIZATION labels.
+
+Generates distinct organization names, then adds variants of a share of them
+(another legal suffix, different case and punctuation, or two transposed
+letters) and reports how long ConnectionGraph.find_duplicate_nodes and
+deduplicate_nodes take, along with the precision and recall of the pairs found.
+
+Usage: python -m benchmarks.dedupe [organizations]
+"""
+
+import itertools
+import random
+import sys
+import time
+
+from pequenaarana.connection_graph import ConnectionGraph
+
+SUFFIXES = ["", " Inc", ", Inc.", " Corp", " LLC", " Ltd"]
+
+
+def variant(name: str, rng: random.Random) -> str:
+    choice = rng.randrange(3)
+    if choice == 0:
+        return name + rng.choice(SUFFIXES)
+    if choice == 1:
+        return name.upper() + rng.choice(SUFFIXES).upper()
+    i = rng.randrange(1, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+
+
+def word(rng: random.Random) -> str:
+    return "".join(
+        rng.choice("bcdfghjklmnprstvwz") + rng.choice("aeiou")
+        for _ in range(rng.randint(2, 4))
+    )
+
+
+def organizations(count: int, duplicate_share: float = 0.2, seed: int = 0):
+    rng = random.Random(seed)
+    entities = {}
+    for i in range(int(count / (1 + duplicate_share))):
+        name = f"{word(rng).title()} {word(rng).title()}"
+        entities[name + rng.choice(SUFFIXES)] = name
+    for name in rng.sample(sorted(set(entities.values())), count - len(entities)):
+        entities.setdefault(variant(name, rng), name)
+    return entities
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    entities = organizations(count)
+    g = ConnectionGraph()
+    g.add_nodes((label, "ORGANIZATION") for label in entities)
+
+    start = time.perf_counter()
+    groups = g.find_duplicate_nodes("ORGANIZATION")
+    found_seconds = time.perf_counter() - start
+    found = {
+        frozenset(pair) for group in groups for pair in itertools.combinations(group, 2)
+    }
+    by_entity = {}
+    for label, name in entities.items():
+        by_entity.setdefault(name, []).append(label)
+    expected = {
+        frozenset(pair)
+        for labels in by_entity.values()
+        for pair in itertools.combinations(labels, 2)
+    }
+    correct = len(found & expected)
+
+    start = time.perf_counter()
+    merged = g.deduplicate_nodes(["ORGANIZATION"])
+    merge_seconds = time.perf_counter() - start
+    print(f"{len(entities)} organizations, {len(expected)} duplicate pairs")
+    print(f"find_duplicate_nodes: {found_seconds:6.2f} s, {len(groups)} groups")
+    print(
+        f"  precision {correct / max(len(found), 1):.3f}, recall {correct / len(expected):.3f}"
+    )
+    print(
+        f"deduplicate_nodes:    {merge_seconds:6.2f} s, "
+        f"{sum(map(len, merged.values()))} nodes merged"
+    )
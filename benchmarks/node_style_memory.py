@@ -0,0 +1,50 @@
+"""
+Measures the memory saved by not storing node style attributes on every node.
+
+Adds the same 100,000 PERSON nodes to a networkx graph twice: once with their
+label, color and size copied into each node's attribute dict, as they used to
+be stored, and once as ConnectionGraph stores them now. Memory is measured
+with tracemalloc.
+
+Usage: python -m benchmarks.node_style_memory [nodes]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import networkx as nx
+
+from pequenaarana.connection_graph import ConnectionGraph
+
+
+def measure(count: int, inline_style: bool) -> int:
+    g = ConnectionGraph()
+    gc.collect()
+    tracemalloc.start()
+    graph = nx.DiGraph()
+    for i in range(count):
+        label = f"person-{i}"
+        attributes = g._node_attributes(
+            label, "PERSON", {"skills": f"skill-{i % 300}", "role": "", "notes": ""}
+        )
+        if inline_style:
+            attributes |= g.node_style(label, "PERSON")
+        graph.add_node(label, **attributes)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    inline = measure(count, inline_style=True)
+    shared = measure(count, inline_style=False)
+    print(f"{count} nodes")
+    print(
+        f"  per-node style: {inline / 2**20:7.1f} MiB, {inline / count:5.0f} bytes per node"
+    )
+    print(
+        f"  shared style:   {shared / 2**20:7.1f} MiB, {shared / count:5.0f} bytes per node"
+    )
+    print(f"  saved:          {(inline - shared) / count:5.0f} bytes per node")
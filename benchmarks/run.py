@@ -0,0 +1,250 @@
+"""
+Benchmarks the main ConnectionGraph operations on synthetic graphs.
+
+Every operation runs twice: once to time each call, reporting throughput and
+latency percentiles, and once under tracemalloc to report its peak memory
+(tracemalloc slows allocation down, so the two are never mixed). The graphs
+come from pequenaarana.synthetic, so runs with the same parameters are
+comparable across commits. Results are printed and written as JSON, by default
+to benchmarks/results/<commit>.json; passing --compare with an earlier results
+file prints how each operation changed.
+
+Usage: python -m benchmarks.run [--people N] [--backend csr] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pequenaarana.connection_graph import (
+    ConnectionGraph,
+    export_graph_to_graphml_file,
+    export_graph_to_snapshot_file,
+    import_graph_from_graphml_file,
+    import_graph_from_snapshot_file,
+)
+from pequenaarana.synthetic import generate_graph, generate_people, skill_name
+
+RESULTS_DIRECTORY = Path(__file__).resolve().parent / "results"
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of an ordered list.
+    """
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(setup, calls: int, items_per_call: int = 1) -> dict:
+    """
+    Times and profiles an operation.
+
+    Args:
+        setup (callable): Prepares a fresh run and returns the operation, which is
+            called as operation(i) for i in range(calls).
+        calls (int): The number of calls per run.
+        items_per_call (int, optional): The number of items (people, elements,
+            queries) each call processes, for the throughput. Defaults to 1.
+
+    Returns:
+        dict: The calls, throughput in items per second, latency percentiles in
+        milliseconds and peak traced memory in bytes.
+    """
+    operation = setup()
+    gc.collect()
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - start)
+    del operation
+
+    operation = setup()
+    gc.collect()
+    tracemalloc.start()
+    for i in range(calls):
+        operation(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del operation
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "calls": calls,
+        "items": calls * items_per_call,
+        "seconds": total,
+        "throughput": calls * items_per_call / total if total else None,
+        "latency_ms": {
+            name: percentile(latencies, fraction) * 1000
+            for name, fraction in [
+                ("p50", 0.5),
+                ("p90", 0.9),
+                ("p99", 0.99),
+                ("max", 1),
+            ]
+        },
+        "peak_memory_bytes": peak,
+    }
+
+
+def run(people: int, backend: str, queries: int, directory: Path) -> dict:
+    """
+    Runs every benchmark.
+
+    Args:
+        people (int): The number of people in the synthetic graph.
+        backend (str): The graph backend, see ConnectionGraph.BACKENDS.
+        queries (int): The number of calls for each search benchmark.
+        directory (Path): A directory for the exported files.
+
+    Returns:
+        dict: The results of measure, by operation name.
+    """
+    records = list(generate_people(people))
+    g = generate_graph(people, backend=backend)
+    g.search_for_person_with_skill(skill_name(0))
+    elements = len(g.nodes) + len(g.edges)
+    # Queries cycle through common and rare skills alike.
+    skills = [skill_name(rank) for rank in range(0, 2000, 2000 // queries or 1)]
+    graphml = directory / "bench.graphml"
+    snapshot = directory / "bench.pqa"
+    export_graph_to_graphml_file(g, graphml)
+    export_graph_to_snapshot_file(g, snapshot)
+
+    def fresh_graph():
+        fresh = ConnectionGraph(backend=backend)
+        return lambda i: fresh.add_person(**records[i])
+
+    def batch():
+        return lambda i: ConnectionGraph(backend=backend).add_people(records)
+
+    def search(method, **arguments):
+        return lambda: lambda i: method(skills[i % len(skills)], **arguments)
+
+    def boolean_query():
+        return lambda i: g.query_people(
+            f"{skills[i % len(skills)]} AND NOT {skills[(i + 1) % len(skills)]}"
+        )
+
+    def introductions(source=None):
+        # Without a fixed source, every query starts from someone new and misses the cache.
+        def introduce(i):
+            origin = source or records[(7919 * i) % people]["name"]
+            return g.introduction_path(
+                origin, records[(104729 * i + 1) % people]["name"]
+            )
+
+        return lambda: introduce
+
+    def call(function, *arguments):
+        return lambda: lambda i: function(*arguments)
+
+    return {
+        "add_person": measure(fresh_graph, people),
+        "add_people": measure(batch, 1, people),
+        "search_for_person_with_skill": measure(
+            search(g.search_for_person_with_skill), queries
+        ),
+        "search_people_prefix": measure(
+            search(g.search_people, match="prefix"), queries
+        ),
+        "search_people_fuzzy": measure(search(g.search_people, match="fuzzy"), queries),
+        "query_people": measure(boolean_query, queries),
+        "rank_people_by_skills": measure(search(g.rank_people_by_skills), queries),
+        "introduction_path_cold": measure(introductions(), queries),
+        "introduction_path_cached": measure(introductions(records[0]["name"]), queries),
+        "export_graphml": measure(
+            call(export_graph_to_graphml_file, g, graphml), 1, elements
+        ),
+        "import_graphml": measure(
+            call(import_graph_from_graphml_file, graphml, None, backend), 1, elements
+        ),
+        "export_snapshot": measure(
+            call(export_graph_to_snapshot_file, g, snapshot), 1, elements
+        ),
+        "import_snapshot": measure(
+            call(import_graph_from_snapshot_file, snapshot, backend), 1, elements
+        ),
+    }
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print(f"\nchange against {baseline['commit']} (new / old):")
+    for name, result in results["operations"].items():
+        old = baseline["operations"].get(name)
+        if old is None:
+            continue
+        print(
+            f"  {name:<30} throughput {result['throughput'] / old['throughput']:5.2f}x"
+            f"  p50 {result['latency_ms']['p50'] / old['latency_ms']['p50']:5.2f}x"
+            f"  peak memory {result['peak_memory_bytes'] / max(old['peak_memory_bytes'], 1):5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--people", type=int, default=20000)
+    parser.add_argument("--backend", default="networkx")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        operations = run(
+            arguments.people, arguments.backend, arguments.queries, Path(directory)
+        )
+    results = {
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            "people": arguments.people,
+            "backend": arguments.backend,
+            "queries": arguments.queries,
+        },
+        "operations": operations,
+    }
+
+    print(f"{arguments.people} people, {arguments.backend} backend")
+    print(
+        f"  {'operation':<30} {'items/s':>12} {'p50 ms':>9} {'p90 ms':>9}"
+        f" {'p99 ms':>9} {'peak MiB':>9}"
+    )
+    for name, result in operations.items():
+        latency = result["latency_ms"]
+        print(
+            f"  {name:<30} {result['throughput']:12.0f} {latency['p50']:9.3f}"
+            f" {latency['p90']:9.3f} {latency['p99']:9.3f}"
+            f" {result['peak_memory_bytes'] / 2**20:9.1f}"
+        )
+
+    output = arguments.output or RESULTS_DIRECTORY / f"{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nresults written to {output}")
+    if arguments.compare:
+        compare(results, json.loads(arguments.compare.read_text()))
@@ -0,0 +1,89 @@
+"""
+Measures how long the console tool takes to start.
+
+Reports two numbers, each the median of several fresh interpreters:
+
+- the import time of console-app.py (without running the application), with
+  the slowest modules from a `python -X importtime` breakdown, and
+- the wall-clock time from launching console-app.py in a pseudo-terminal until
+  the main menu is first painted.
+
+Usage: python -m benchmarks.startup [runs]
+"""
+
+import os
+import pty
+import select
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CONSOLE_APP = Path(__file__).resolve().parent.parent / "console-app.py"
+
+# Loads console-app.py as a module, so that main does not run.
+LOAD_CONSOLE_APP = (
+    "import importlib.util; "
+    f"spec = importlib.util.spec_from_file_location('console_app', {str(CONSOLE_APP)!r}); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+
+def import_times() -> dict:
+    """
+    Returns the cumulative import time, in microseconds, of every top-level
+    module imported while loading console-app.py.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOAD_CONSOLE_APP],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=CONSOLE_APP.parent,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def time_to_first_paint(timeout: float = 30.0) -> float:
+    """
+    Returns the seconds between launching console-app.py in a pseudo-terminal
+    and the main menu appearing on it.
+    """
+    start = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(CONSOLE_APP.parent)
+        os.environ["TERM"] = "xterm"
+        os.execv(sys.executable, [sys.executable, str(CONSOLE_APP)])
+    output = b""
+    try:
+        while b"Main Menu" not in output:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("The main menu was never painted.")
+            if select.select([fd], [], [], 0.01)[0]:
+                output += os.read(fd, 65536)
+        return time.perf_counter() - start
+    finally:
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+        os.close(fd)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    imports = [import_times() for _ in range(runs)]
+    totals = [sum(times.values()) for times in imports]
+    print(f"import console-app.py: {statistics.median(totals) / 1000:7.1f} ms")
+    slowest = sorted(imports[-1].items(), key=lambda item: -item[1])[:10]
+    for name, cumulative in slowest:
+        print(f"  {name:<40} {cumulative / 1000:7.1f} ms")
+    paints = [time_to_first_paint() for _ in range(runs)]
+    print(f"time to first paint:   {statistics.median(paints) * 1000:7.1f} ms")
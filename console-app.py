@@ -1,9 +1,9 @@
 import npyscreen
-from pequenaarana.connection_graph import (
-    ConnectionGraph,
-    import_graph_from_graphml_file,
-    export_graph_to_graphml_file,
-)
+import os
+
+# pequenaarana.connection_graph pulls in networkx and numpy, which take longer
+# to import than everything else put together, so it is only imported by the
+# forms that need it, the first time they are used.
 
 
 class MainMenu(npyscreen.Form):
@@ -23,12 +23,15 @@ class MainMenu(npyscreen.Form):
         self.menu_value = self.add(
             MainMenuSelector,
             scroll_exit=True,
-            max_height=9,
+            max_height=12,
             name="Main Menu Options",
             values=[
                 "New Graph",
                 "Load Graph",
+                "Merge Graphs",
                 "Clear Graph",
+                "Undo",
+                "Redo",
                 "Add Person",
                 "Add Node",
                 "Add Edge",
@@ -45,11 +48,14 @@ class MainMenuSelector(npyscreen.MultiLineAction):
             self._handle_destructive_action("NEWGRAPH")
         elif act_on_this == "Load Graph":  # Destructive
             self._handle_destructive_action("LOADGRAPH")
-        elif act_on_this == "Clear Graph":  # Destructive
-            self.parent.parentApp.getForm("MAIN").connection_graph = None
-            self.parent.parentApp.getForm("MAIN").graph_name = None
-            self.parent.parentApp.getForm("MAIN").edited = False
-            self.parent.parentApp.switchForm("MAIN")
+        elif act_on_this == "Merge Graphs":  # Destructive
+            self._handle_destructive_action("MERGEGRAPHS")
+        elif act_on_this == "Clear Graph":  # Undoable
+            self._edit_graph("clear")
+        elif act_on_this == "Undo":
+            self._edit_graph("undo", "Nothing to undo.")
+        elif act_on_this == "Redo":
+            self._edit_graph("redo", "Nothing to redo.")
         elif act_on_this == "Add Person":
             self._fail_if_no_graph("ADDPERSON")
         elif act_on_this == "Add Node":
@@ -71,6 +77,16 @@ class MainMenuSelector(npyscreen.MultiLineAction):
         else:
             self.parent.parentApp.switchForm(next_form)
 
+    def _edit_graph(self, operation, nothing_done_message=""):
+        main_form = self.parent.parentApp.getForm("MAIN")
+        if not main_form.connection_graph:
+            npyscreen.notify_confirm("No open graph!", title="Error")
+        elif getattr(main_form.connection_graph, operation)() is False:
+            npyscreen.notify_confirm(nothing_done_message, title="Error")
+        else:
+            main_form.edited = True
+        self.parent.parentApp.switchForm("MAIN")
+
     def _fail_if_no_graph(self, form_for_success):
         curr_graph = self.parent.parentApp.getForm("MAIN").connection_graph
         if not curr_graph:
@@ -100,6 +116,9 @@ class OverwriteGraph(npyscreen.Form):
             self.parentApp.getForm("SAVEGRAPH").next_form = self.next_form
             self.parentApp.setNextForm("SAVEGRAPH")
         else:
+            curr_graph = self.parentApp.getForm("MAIN").connection_graph
+            if curr_graph:
+                curr_graph.detach_journal()
             self.parentApp.setNextForm(self.next_form)
 
 
@@ -237,20 +256,89 @@ class LoadGraph(npyscreen.Form):
         )
 
     def afterEditing(self):
+        from pequenaarana.background import BackgroundTask
+        from pequenaarana.connection_graph import has_unsaved_changes, load_graph
+
+        filename = self.input_graph_file.value
         try:
-            g = import_graph_from_graphml_file(self.input_graph_file.value)
-            self.parentApp.getForm("MAIN").connection_graph = g
-            self.parentApp.getForm("MAIN").graph_name = self.graph_name.value
-        except FileNotFoundError:
-            npyscreen.notify_confirm(
-                f"File {self.input_graph_file.value} not found!", title="Error"
+            recover = has_unsaved_changes(filename) and npyscreen.notify_yes_no(
+                "This graph has changes that were never saved. Recover them?",
+                title="Recover Changes",
             )
-        self.parentApp.setNextForm("MAIN")
+        except FileNotFoundError:
+            npyscreen.notify_confirm(f"File {filename} not found!", title="Error")
+            self.parentApp.setNextForm("MAIN")
+            return
+        self.recovered = bool(recover)
+        task = BackgroundTask(
+            load_graph,
+            filename,
+            recover_unsaved=recover,
+            status=f"Loading {filename}...",
+            report_progress=True,
+        )
+        self.parentApp.getForm("TASKPROGRESS").start(
+            task, self._loaded, failed_form="MAIN"
+        )
+        self.parentApp.setNextForm("TASKPROGRESS")
+
+    def _loaded(self, g):
+        # The graph is only swapped in once it has been loaded completely.
+        main_form = self.parentApp.getForm("MAIN")
+        g.enable_history()
+        main_form.connection_graph = g
+        main_form.graph_name = self.graph_name.value
+        main_form.edited = self.recovered
+        return "MAIN"
+
+
+class MergeGraphs(npyscreen.Form):
+    def create(self):
+        self.graph_name = self.add(
+            npyscreen.TitleText,
+            name="Graph Name:",
+        )
+        self.input_directory = self.add(
+            npyscreen.TitleFilenameCombo,
+            name="Directory:",
+            select_dir=True,
+        )
+
+    def afterEditing(self):
+        from pequenaarana.background import BackgroundTask
+        from pequenaarana.connection_graph import import_graphs_from_directory
+
+        directory = self.input_directory.value
+        if not directory or not os.path.isdir(directory):
+            npyscreen.notify_confirm(f"Directory {directory} not found!", title="Error")
+            self.parentApp.setNextForm("MAIN")
+            return
+        task = BackgroundTask(
+            import_graphs_from_directory,
+            directory,
+            status=f"Merging the graphs in {directory}...",
+            report_progress=True,
+        )
+        self.parentApp.getForm("TASKPROGRESS").start(
+            task, self._merged, failed_form="MAIN"
+        )
+        self.parentApp.setNextForm("TASKPROGRESS")
+
+    def _merged(self, g):
+        main_form = self.parentApp.getForm("MAIN")
+        g.enable_history()
+        main_form.connection_graph = g
+        main_form.graph_name = self.graph_name.value
+        main_form.edited = True
+        return "MAIN"
 
 
 class NewGraph(npyscreen.Form):
     def afterEditing(self):
+        from pequenaarana.connection_graph import ConnectionGraph
+
         self.parentApp.getForm("MAIN").connection_graph = ConnectionGraph()
+        self.parentApp.getForm("MAIN").connection_graph.enable_history()
         self.parentApp.getForm("MAIN").graph_name = self.graph_name.value
         self.parentApp.getForm("MAIN").edited = True
         self.parentApp.setNextForm("MAIN")
@@ -278,11 +366,27 @@ class SaveGraph(npyscreen.Form):
         )
 
     def afterEditing(self):
-        export_graph_to_graphml_file(
-            self.parentApp.getForm("MAIN").connection_graph, self.save_file.value
+        from pequenaarana.background import BackgroundTask
+        from pequenaarana.connection_graph import SNAPSHOT_SUFFIX, save_graph
+
+        # Gephi only reads the GraphML file itself, not its journal, so GraphML
+        # saves are always written in full.
+        task = BackgroundTask(
+            save_graph,
+            self.parentApp.getForm("MAIN").connection_graph,
+            self.save_file.value,
+            compact=not self.save_file.value.endswith(SNAPSHOT_SUFFIX),
+            status=f"Saving {self.save_file.value}...",
+            report_progress=True,
         )
+        self.parentApp.getForm("TASKPROGRESS").start(
+            task, self._saved, failed_form="MAIN"
+        )
+        self.parentApp.setNextForm("TASKPROGRESS")
+
+    def _saved(self, result):
         self.parentApp.getForm("MAIN").edited = False
-        self.parentApp.setNextForm(self.next_form)
+        return self.next_form
 
 
 class AddPerson(npyscreen.Form):
@@ -333,100 +437,190 @@ class SkillSearch(npyscreen.Form):
             npyscreen.TitleText,
             name="Skill Query:",
         )
-
-    def _tabulate_results(self, node_results, additional_data):
-        sorted_results = dict(
-            sorted(node_results.items(), key=lambda item: item[1]["label"])
+        self.match_mode = self.add(
+            npyscreen.TitleSelectOne,
+            max_height=6,
+            name="Match:",
+            value=[0],
+            values=["Exact", "Prefix", "Substring", "Fuzzy", "Boolean"],
+            scroll_exit=True,
+        )
+        self.order = self.add(
+            npyscreen.TitleSelectOne,
+            max_height=3,
+            name="Order:",
+            value=[0],
+            values=["Name", "Best connected"],
+            scroll_exit=True,
         )
-        out = f'{"NAME":<30}{"ROLE":<50}{"LOCATION":<30}{"ORGANIZATION":<50}{"ACCOUNT":<30}{"SKILLS"}\n'
-        out += f"{'='*200}\n"
-        for key, value in sorted_results.items():
-            if "role" not in value:
-                value["role"] = ""
-            tmp_data = additional_data[key]
-            place_str, org_str, account_str = "", "", ""
-            if "PLACE" in tmp_data:
-                place_str = ",".join(tmp_data["PLACE"])
-            if "ORGANIZATION" in tmp_data:
-                org_str = ",".join(tmp_data["ORGANIZATION"])
-            if "ACCOUNT" in tmp_data:
-                account_str = ",".join(tmp_data["ACCOUNT"])
-
-            out += f'{value["label"]:<30}{value["role"]:<50}{place_str:<30}{org_str:<50}{account_str:<30}{value["skills"]}\n'
-            if "notes" in value and value["notes"]:
-                out += f'\tNOTES: {value["notes"]}\n'
-        return out
 
     def afterEditing(self):
+        from pequenaarana.background import BackgroundTask
+
         curr_graph = self.parentApp.getForm("MAIN").connection_graph
-        matching_persons, neighbor_nodes = curr_graph.search_for_person_with_skill(
-            self.query.value
+        match = self.match_mode.values[self.match_mode.value[0]].lower()
+        task = BackgroundTask(
+            curr_graph.search_people,
+            self.query.value,
+            match=match,
+            order=("label", "centrality")[self.order.value[0]],
+            status=f"Searching for {self.query.value}...",
+            report_progress=True,
         )
-        additional_data = {}
-        # for each person node with matching skills
-        for person in neighbor_nodes:
-            additional_data[person] = {}
-            # for each neighbor node of the person node
-            for neighbor_id in neighbor_nodes[person]:
-                edge_info = neighbor_nodes[person][neighbor_id]
-                if (
-                    edge_info["kind"] == "BASEDIN"
-                    and curr_graph.nodes[neighbor_id]["kind"] == "PLACE"
-                ):
-                    if "PLACE" not in additional_data[person]:
-                        additional_data[person]["PLACE"] = []
-                    additional_data[person]["PLACE"].append(
-                        curr_graph.nodes[neighbor_id]["label"]
-                    )
-                elif (
-                    edge_info["kind"] == "ASSOCWITH"
-                    and curr_graph.nodes[neighbor_id]["kind"] == "ORGANIZATION"
-                ):
-                    if "ORGANIZATION" not in additional_data[person]:
-                        additional_data[person]["ORGANIZATION"] = []
-                    additional_data[person]["ORGANIZATION"].append(
-                        curr_graph.nodes[neighbor_id]["label"]
-                    )
-                elif (
-                    edge_info["kind"] == "ONACCOUNT"
-                    and curr_graph.nodes[neighbor_id]["kind"] == "ACCOUNT"
-                ):
-                    if "ACCOUNT" not in additional_data[person]:
-                        additional_data[person]["ACCOUNT"] = []
-                    additional_data[person]["ACCOUNT"].append(
-                        curr_graph.nodes[neighbor_id]["label"]
-                    )
-        table = self._tabulate_results(matching_persons, additional_data)
-        npyscreen.notify_confirm(f"{table}", title="Results", wide=True)
+        self.parentApp.getForm("TASKPROGRESS").start(
+            task, self._searched, failed_form="SKILLSEARCH"
+        )
+        self.parentApp.setNextForm("TASKPROGRESS")
+
+    def _searched(self, results):
+        self.parentApp.getForm("SEARCHRESULTS").results = results
+        self.parentApp.getForm("SEARCHRESULTS").page_number = 0
+        return "SEARCHRESULTS"
+
+
+class SearchResultsView(npyscreen.Form):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.results = None
+        self.page_number = 0
+
+    def create(self):
+        self.table = self.add(npyscreen.Pager)
+        self.table.add_handlers({">": self._next_page, "<": self._previous_page})
+
+    def beforeEditing(self):
+        self._show_page()
+
+    def _show_page(self):
+        page = self.results.page(self.page_number)
+        self.name = (
+            f"Social Graph Tool - Search Results ({len(self.results)} matches, "
+            f"page {self.page_number + 1}/{self.results.page_count}, "
+            "'>' next page, '<' previous page)"
+        )
+        self.table.values = [
+            f'{"NAME":<30}{"ROLE":<50}{"LOCATION":<30}{"ORGANIZATION":<50}{"ACCOUNT":<30}{"SKILLS"}',
+            "=" * 200,
+        ]
+        for profile in page:
+            place_str = ",".join(profile["place"])
+            org_str = ",".join(profile["org"])
+            account_str = ",".join(profile["account"])
+            self.table.values.append(
+                f'{profile["label"]:<30}{profile["role"]:<50}{place_str:<30}{org_str:<50}{account_str:<30}{profile["skills"]}'
+            )
+            if profile["notes"]:
+                self.table.values.append(f'    NOTES: {profile["notes"]}')
+        self.table.start_display_at = 0
+        self.display()
+
+    def _next_page(self, key_press):
+        if self.page_number + 1 < self.results.page_count:
+            self.page_number += 1
+            self._show_page()
+
+    def _previous_page(self, key_press):
+        if self.page_number > 0:
+            self.page_number -= 1
+            self._show_page()
+
+    def afterEditing(self):
+        self.results = None
         self.parentApp.setNextForm("MAIN")
 
 
+class TaskProgress(npyscreen.Form):
+    OK_BUTTON_TEXT = "Cancel"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task = None
+        self.on_success = None
+        self.failed_form = "MAIN"
+
+    def create(self):
+        self.keypress_timeout = 2
+        self.status = self.add(npyscreen.FixedText, value="", editable=False)
+        self.progress = self.add(
+            npyscreen.TitleSlider, name="Progress:", out_of=100, editable=False
+        )
+
+    def start(self, task, on_success, failed_form="MAIN"):
+        self.task = task
+        self.on_success = on_success
+        self.failed_form = failed_form
+        self.status.value = task.status
+        self.progress.value = 0
+
+    def while_waiting(self):
+        self.progress.value = int(100 * self.task.fraction)
+        self.display()
+        if self.task.done:
+            self.parentApp.switchFormNow()
+
+    def _finish(self):
+        if self.task.cancelled:
+            npyscreen.notify_confirm("The operation was cancelled.", title="Cancelled")
+            return self.failed_form
+        try:
+            result = self.task.result()
+        except FileNotFoundError as error:
+            npyscreen.notify_confirm(f"File {error.filename} not found!", title="Error")
+            return self.failed_form
+        except Exception as error:
+            npyscreen.notify_confirm(str(error), title="Error")
+            return self.failed_form
+        return self.on_success(result)
+
+    def afterEditing(self):
+        if self.task.done:
+            self.parentApp.setNextForm(self._finish())
+        else:
+            # The Cancel button only requests cancellation; the form stays up
+            # until the worker has actually stopped.
+            self.task.cancel()
+            self.status.value = "Cancelling..."
+            self.parentApp.setNextForm("TASKPROGRESS")
+
+
 class ConsoleSocialGraphTool(npyscreen.NPSAppManaged):
+    # Forms are only constructed the first time they are shown or looked up, so
+    # startup only pays for the main menu.
+    FORMS = {
+        "MAIN": (MainMenu, "Social Graph Tool - Main Menu ()"),
+        "LOADGRAPH": (LoadGraph, "Social Graph Tool - Load Graph"),
+        "SAVEGRAPH": (SaveGraph, "Social Graph Tool - Save Graph"),
+        "MERGEGRAPHS": (MergeGraphs, "Social Graph Tool - Merge Graphs"),
+        "NEWGRAPH": (NewGraph, "Social Graph Tool - New Graph"),
+        "ADDPERSON": (AddPerson, "Social Graph Tool - Add Person"),
+        "ADDEDGECHOICE": (AddEdgeChoice, "Social Graph Tool - Choose Edge Type to Add"),
+        "ADDEDGE": (AddEdge, "Social Graph Tool - Add Edge"),
+        "ADDNODECHOICE": (AddNodeChoice, "Social Graph Tool - Choose Node Type to Add"),
+        "ADDNODE": (AddNode, "Social Graph Tool - Add Node"),
+        "SKILLSEARCH": (SkillSearch, "Social Graph Tool - Skill Search"),
+        "SEARCHRESULTS": (SearchResultsView, "Social Graph Tool - Search Results"),
+        "TASKPROGRESS": (TaskProgress, "Social Graph Tool - Working..."),
+        "OVERWRITE": (OverwriteGraph, "Social Graph Tool - Overwrite Graph?"),
+    }
+
     def onStart(self):
-        self.addForm("MAIN", MainMenu, name="Social Graph Tool - Main Menu ()")
-        self.addForm("LOADGRAPH", LoadGraph, name="Social Graph Tool - Load Graph")
-        self.addForm("SAVEGRAPH", SaveGraph, name="Social Graph Tool - Save Graph")
-        self.addForm("NEWGRAPH", NewGraph, name="Social Graph Tool - New Graph")
-        self.addForm("ADDPERSON", AddPerson, name="Social Graph Tool - Add Person")
-        self.addForm(
-            "ADDEDGECHOICE",
-            AddEdgeChoice,
-            name="Social Graph Tool - Choose Edge Type to Add",
-        )
-        self.addForm("ADDEDGE", AddEdge, name="Social Graph Tool - Add Edge")
-        self.addForm(
-            "ADDNODECHOICE",
-            AddNodeChoice,
-            name="Social Graph Tool - Choose Node Type to Add",
-        )
-        self.addForm("ADDNODE", AddNode, name="Social Graph Tool - Add Node")
-        self.addForm(
-            "SKILLSEARCH", SkillSearch, name="Social Graph Tool - Skill Search"
-        )
-        self.addForm(
-            "OVERWRITE", OverwriteGraph, name="Social Graph Tool - Overwrite Graph?"
-        )
+        self.getForm("MAIN")
+
+    def getForm(self, fmid):
+        if fmid not in self._Forms and fmid in self.FORMS:
+            form_class, name = self.FORMS[fmid]
+            self.addForm(fmid, form_class, name=name)
+        return super().getForm(fmid)
+
+    def setNextForm(self, fmid):
+        if fmid is not None:
+            self.getForm(fmid)
+        super().setNextForm(fmid)
 
 
 if __name__ == "__main__":
+    if os.environ.get("PEQUENAARANA_STATS"):
+        from pequenaarana.instrumentation import export_stats_on_exit
+
+        export_stats_on_exit(os.environ["PEQUENAARANA_STATS"])
     TestApp = ConsoleSocialGraphTool().run()
@@ -0,0 +1,134 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class TaskCancelled(Exception):
+    """
+    Raised inside a background task, from its progress callback, once it was cancelled.
+    """
+
+
+class BackgroundTask:
+    """
+    Runs a long operation (loading, saving or searching a graph) on a worker thread,
+    so that a user interface can keep polling its progress instead of blocking.
+
+    Tasks run one at a time on a single shared worker, so two operations never
+    touch the same graph concurrently. Cancellation is cooperative: the task's
+    progress callback raises TaskCancelled the next time it is called, which
+    aborts imports and exports cleanly.
+
+    Attributes:
+        status (str): A short description of the task, for display.
+        progress (tuple): The last (done, total) pair the task reported.
+        _cancel_requested (threading.Event): Set once cancel is called.
+        _future (Future): The result of the operation.
+
+    Methods:
+        report(self, done: int, total: int) -> None: Records progress; used as the operation's progress callback.
+        cancel(self) -> None: Asks the task to stop.
+        done(self) -> bool: Whether the task has finished, failed or been cancelled.
+        cancelled(self) -> bool: Whether the task stopped because it was cancelled.
+        fraction(self) -> float: The completed fraction of the task, between 0 and 1.
+        result(self, timeout: float = None): Returns the operation's result, raising its exception if it failed.
+    """
+
+    def __init__(
+        self, function, *args, status: str = "", report_progress=False, **kwargs
+    ):
+        """
+        Starts an operation in the background.
+
+        Args:
+            function (callable): The operation to run.
+            *args: Positional arguments for the operation.
+            status (str, optional): A short description of the task. Defaults to "".
+            report_progress (bool, optional): Whether to pass report as the operation's
+                progress keyword argument. Defaults to False.
+            **kwargs: Keyword arguments for the operation.
+        """
+        self.status = status
+        self.progress = (0, 0)
+        self._cancel_requested = threading.Event()
+        if report_progress:
+            kwargs["progress"] = self.report
+        self._future = _get_executor().submit(self._run, function, args, kwargs)
+
+    def _run(self, function, args, kwargs):
+        if self._cancel_requested.is_set():
+            raise TaskCancelled()
+        return function(*args, **kwargs)
+
+    def report(self, done: int, total: int) -> None:
+        """
+        Records the progress of the operation.
+
+        Args:
+            done (int): The amount of work done, e.g. bytes read.
+            total (int): The total amount of work.
+
+        Raises:
+            TaskCancelled: If the task was cancelled.
+        """
+        self.progress = (done, total)
+        if self._cancel_requested.is_set():
+            raise TaskCancelled()
+
+    def cancel(self) -> None:
+        """
+        Asks the task to stop. A task that has not started yet never runs; a running
+        one stops at its next progress report.
+        """
+        self._cancel_requested.set()
+        self._future.cancel()
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._future.done():
+            return False
+        return self._future.cancelled() or isinstance(
+            self._future.exception(), TaskCancelled
+        )
+
+    @property
+    def fraction(self) -> float:
+        done, total = self.progress
+        if self._future.done():
+            return 1.0
+        return min(done / total, 1.0) if total else 0.0
+
+    def result(self, timeout: float = None):
+        """
+        Waits for the operation and returns its result.
+
+        Args:
+            timeout (float, optional): Seconds to wait before raising TimeoutError.
+
+        Returns:
+            The value returned by the operation.
+
+        Raises:
+            Exception: Whatever the operation raised, TaskCancelled if it was
+            cancelled while running, or CancelledError if it never started.
+        """
+        return self._future.result(timeout)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the single worker shared by every background task, creating it on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pequenaarana-worker"
+            )
+        return _executor
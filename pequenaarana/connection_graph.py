@@ -1,6 +1,101 @@
+import contextlib
+import csv
+import functools
+import gc
 import logging
 import networkx as nx
+import numpy as np
+import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from pequenaarana.centrality import pagerank
+from pequenaarana.csr_graph import CSRDiGraph
+from pequenaarana.entity_resolution import find_duplicates
+from pequenaarana.graphml_stream import iter_graphml, write_graphml
+from pequenaarana.history import (
+    UNDO_LIMIT,
+    GraphHistory,
+    GraphView,
+    edge_state as _edge_state,
+    node_state as _node_state,
+    set_states,
+)
+from pequenaarana.instrumentation import instrumented
+from pequenaarana.journal import GraphJournal
+from pequenaarana.paths import IntroductionSearch
+from pequenaarana.projection import CoMembershipProjection
+from pequenaarana.search_results import RESULTS_PAGE_SIZE, SearchResults
+from pequenaarana.skill_embeddings import EMBEDDING_DIMENSIONS, SkillEmbeddings
+from pequenaarana.skill_index import SkillIndex
+from pequenaarana.skill_query import evaluate_skill_query, parse_skill_query
+from pequenaarana.snapshot import (
+    column_rows,
+    is_snapshot_file,
+    read_snapshot_columns,
+    write_snapshot,
+)
+from pequenaarana.skill_scoring import SkillMatrix, idf_weights
+
+GRAPHML_BATCH_SIZE = 10000
+SNAPSHOT_SUFFIX = ".pqa"
+INDEX_PROGRESS_CHUNK = 10000
+GRAPHML_SUFFIXES = (".graphml", ".graphml.gz")
+JOURNAL_COMPACTION_MIN_BYTES = 64 * 1024
+JOURNAL_COMPACTION_RATIO = 0.5
+BACKENDS = {"networkx": nx.DiGraph, "csr": CSRDiGraph}
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector, which otherwise runs over and over while
+    a bulk load allocates hundreds of thousands of attribute dictionaries.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _stage_progress(progress, stage: int, stages: int):
+    """
+    Returns a progress callback that reports one stage of a multi-stage operation
+    as its share of the whole, or None if there is no progress callback.
+    """
+    if progress is None:
+        return None
+
+    def report(done: int, total: int) -> None:
+        if total:
+            progress(stage * total + done, stages * total)
+        else:
+            progress(stage, stages)
+
+    return report
+
+
+def _undoable(method):
+    """
+    Makes a mutating ConnectionGraph method a single undo step, however many
+    other mutating methods it calls, while the graph has history enabled.
+    """
+
+    @functools.wraps(method)
+    def undoable(self, *args, **kwargs):
+        if self._history is None:
+            return method(self, *args, **kwargs)
+        self._history.begin()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._history.end()
+
+    return undoable
 
 
 class ConnectionGraph:
@@ -8,29 +103,105 @@ class ConnectionGraph:
     A class representing a connection graph.
 
     Attributes:
-        _internal_graph (nx.DiGraph): The internal directed graph representing the connections.
+        _internal_graph (nx.DiGraph): The internal directed graph representing the connections, or a
+            CSRDiGraph when the compact backend was chosen.
+        _skill_index (SkillIndex): Inverted index from skills to PERSON nodes, kept in sync with the graph.
+        _skill_matrix (SkillMatrix): Sparse person x skill matrix used to rank multi-skill queries.
+        _indexes_stale (bool): Whether the indexes must be rebuilt before their next use.
+        _projection (CoMembershipProjection): Cached person-person co-membership weights, used to find experts.
+        _generation (int): Counts the mutations of the graph, so that caches can tell they are outdated.
+        _introductions (OrderedDict): The most recently used IntroductionSearch per (source, edge kinds).
+        _centrality (tuple): The generation, node index and PageRank scores last computed, or None.
+        _skill_embeddings (SkillEmbeddings): The skill vectors last trained or loaded with the graph, or None.
+        _history (GraphHistory): The undo and redo steps, or None until enable_history is called.
+        _views (weakref.WeakSet): The live GraphViews, which must be told before elements change.
+        _snapshots (dict): Maps snapshot names to their GraphViews.
+        _journal (GraphJournal): The journal mutations are recorded into, or None.
         NODETYPES (list): The valid types of nodes in the graph.
         EDGETYPES (list): The valid types of edges in the graph.
         NODESIZE (dict): The default size of nodes in the graph.
         NODECOLORS (dict): The default colors of nodes based on their types.
+        STYLE_ATTRIBUTES (list): The visual attributes derived from a node's label and kind rather than stored.
+        PERSON_LINKS (dict): Maps person record fields to the node and edge kinds they link to.
+        PROJECTION_WEIGHTS (dict): The weight of sharing an organization (ASSOCWITH) or account (ONACCOUNT) with someone.
+        INTRODUCTION_CACHE_SIZE (int): The number of introduction searches kept between queries.
+        SEMANTIC_NEIGHBORS (int): The number of similar skills a semantic search looks for.
+        JOURNALED_OPERATIONS (list): The mutating methods recorded in the journal.
 
     Methods:
-        __init__(self, graph_attributes: dict = {}): Initializes a new ConnectionGraph instance.
+        __init__(self, graph_attributes: dict = {}, backend: str = "networkx"): Initializes a new ConnectionGraph instance.
         graph(self): Returns the graph attribute of the internal graph.
         nodes(self): Returns the nodes attribute of the internal graph.
         edges(self): Returns the edges attribute of the internal graph.
+        backend(self): Returns the name of the storage backend.
         clear(self): Clears the internal graph.
         add_node(self, label: str, kind: str, keys: dict = {}) -> None: Adds a node to the graph.
         add_edge(self, origin_node: str, endpoint_node: str, kind: str, keys: dict = {}) -> None: Adds an edge to the graph.
         add_person(self, name: str, place: str = "", org: str = "", account: str = "", skills: str = ""): Adds a person node to the graph with optional connections to place, organization, and account nodes.
+        add_nodes(self, nodes) -> int: Adds many nodes to the graph in a single batch.
+        add_edges(self, edges) -> int: Adds many edges to the graph in a single batch.
+        add_people(self, people) -> int: Adds many person records to the graph in a single batch.
+        merge_nodes(self, keep: str, duplicates) -> int: Merges duplicate nodes into one, rewiring their edges.
         add_person_org_edge(self, name: str, org: str): Adds an association edge between a person and an organization.
         add_person_place_edge(self, name: str, place: str): Adds a based-in edge between a person and a place.
         add_person_account_edge(self, name: str, account: str): Adds an on-account edge between a person and an account.
+        search_for_person_with_skill(self, skill: str, match: str = "exact", max_distance: int = None): Searches for persons with a specific skill.
+        search_person_profiles(self, skill: str, match: str = "exact", max_distance: int = None) -> dict: Searches for persons with a specific skill and returns their profiles.
+        search_people(self, query: str, match: str = "exact", max_distance: int = None, page_size: int = RESULTS_PAGE_SIZE, order: str = "label") -> SearchResults: Returns a lazy, paginated cursor over the persons matching a search.
+        query_people(self, query: str) -> list: Returns the persons matching a boolean skill query.
+        match_skills(self, skill: str, match: str = "exact", max_distance: int = None) -> list: Returns the skills in the graph matching a query.
+        rank_people_by_skills(self, skills: str, k: int = 10) -> list: Ranks persons by weighted coverage of several skills.
+        train_skill_embeddings(self, dimensions: int = EMBEDDING_DIMENSIONS) -> SkillEmbeddings: Learns skill vectors from the skills people list together.
+        rank_people_semantically(self, skills: str, k: int = 10) -> list: Ranks persons by how related their skills are to a query.
+        find_experts(self, person: str, skills: str, k: int = 10, max_hops: int = 2) -> list: Ranks the people a person knows by skill match and closeness.
+        introduction_path(self, source: str, target: str, via=("org", "account", "place"), max_length: int = None) -> list: Returns a shortest chain of introductions between two persons.
+        centrality(self, persons=None) -> dict: Returns how well-connected persons are.
+        get_person_profiles(self, names) -> dict: Returns the resolved profiles of many persons.
+        people_linked_to(self, target: str) -> set: Returns the persons linked to an organization, place or account.
+        filter_people(self, skills: str = "", place: str = "", org: str = "", account: str = "", match: str = "exact") -> list: Returns the persons meeting every given criterion.
+        find_duplicate_nodes(self, kind: str, threshold: float = 0.8) -> list: Finds groups of nodes whose labels probably name the same entity.
+        deduplicate_nodes(self, kinds=("ORGANIZATION", "PLACE", "ACCOUNT"), threshold: float = 0.8) -> dict: Finds and merges duplicate nodes.
+        node_style(self, label: str, kind: str) -> dict: Returns the default visual attributes of a node.
+        styled_nodes(self): Yields every node with its visual attributes filled in.
+        replay(self, entries) -> None: Re-applies mutations recorded in a journal.
+        enable_history(self, limit: int = UNDO_LIMIT) -> None: Starts recording undo steps.
+        can_undo(self) -> bool: Returns whether there is an operation to undo.
+        can_redo(self) -> bool: Returns whether there is an operation to redo.
+        undo(self) -> bool: Reverts the most recent operation.
+        redo(self) -> bool: Re-applies the most recently undone operation.
+        snapshot(self, name: str = None) -> GraphView: Takes a named, read-only view of the graph as it is now.
+        restore(self, name: str) -> bool: Brings the graph back to a snapshot, as one undoable operation.
+        drop_snapshot(self, name: str) -> None: Releases a snapshot.
+        apply_states(self, nodes, edges) -> None: Sets nodes and edges to recorded states.
+        detach_journal(self, discard_unsaved: bool = True) -> None: Stops recording mutations into the journal.
+        _record(self, operation: str, **arguments) -> None: Appends a mutation to the journal.
+        _node_attributes(self, label: str, kind: str, keys: dict = {}) -> dict: Builds the attributes stored for a node.
+        _without_default_style(self, label: str, attributes: dict) -> dict: Drops style attributes that hold their default values.
+        _persons_with_skill(self, skill: str, match: str = "exact", max_distance: int = None) -> dict: Looks up the persons with a matching skill.
+        _successors_by_kind(self, label: str) -> dict: Groups the endpoints of a node's edges by edge kind.
+        _predecessors_by_kind(self, label: str) -> dict: Groups the origins of the edges into a node by edge kind.
+        _degree(self, label: str) -> int: Counts the edges into and out of a node.
+        _projected_memberships(self, person: str): Yields the organizations and accounts a person is linked to.
+        _projected_members(self, group: str, kind: str) -> list: Returns the persons linked to an organization or account.
+        _linked_nodes(self, label: str, kinds) -> list: Returns the nodes linked to a node, in either direction, by edges of some kinds.
+        _step(self, undo: bool) -> bool: Applies the next undo or redo step.
+        _preserve(self, nodes=(), edges=()) -> None: Hands the states of elements about to change to the history and views.
+        _preserve_in_views(self, graph, nodes, edges) -> None: Hands the states of elements about to change to the views.
+        _replace_graph(self, graph) -> None: Replaces the internal graph wholesale, keeping the old one for the history and views.
+        _after_states_set(self, nodes, edges) -> None: Updates indexes, caches and the journal after states were set.
+        _centrality_scores(self) -> tuple: Returns the PageRank of every node, computing it if the graph changed.
+        _index_node(self, label: str) -> None: Updates the indexes for a single node.
+        _index_nodes(self, labels) -> None: Updates the indexes for many nodes at once.
+        _rebuild_indexes(self) -> None: Rebuilds every index from the internal graph.
+        _invalidate_indexes(self) -> None: Drops every index until it is next needed.
+        _ensure_indexes(self) -> None: Rebuilds the indexes if they were invalidated.
         _node_type_valid(self, potential_node: str) -> bool: Checks if a potential node type is valid.
         _edge_type_valid(self, potential_edge: str) -> bool: Checks if a potential edge type is valid.
     """
 
     _internal_graph: nx.DiGraph
+    _skill_index: SkillIndex
+    _skill_matrix: SkillMatrix
 
     NODETYPES = ["PERSON", "ORGANIZATION", "PLACE", "ACCOUNT"]
     EDGETYPES = ["ASSOCWITH", "BASEDIN", "ONACCOUNT"]
@@ -41,9 +212,49 @@ class ConnectionGraph:
         "PLACE": {"r": 0, "g": 199, "b": 255},
         "ACCOUNT": {"r": 255, "g": 122, "b": 69},
     }
+    STYLE_ATTRIBUTES = ["label", "r", "g", "b", "size"]
+    PERSON_LINKS = {
+        "place": ("PLACE", "BASEDIN"),
+        "org": ("ORGANIZATION", "ASSOCWITH"),
+        "account": ("ACCOUNT", "ONACCOUNT"),
+    }
+    PROJECTION_WEIGHTS = {"ASSOCWITH": 1.0, "ONACCOUNT": 0.5}
+    INTRODUCTION_CACHE_SIZE = 16
+    SEMANTIC_NEIGHBORS = 20
+    JOURNALED_OPERATIONS = [
+        "add_node",
+        "add_edge",
+        "clear",
+        "add_nodes",
+        "add_edges",
+        "add_people",
+        "merge_nodes",
+        "apply_states",
+    ]
 
-    def __init__(self, graph_attributes: dict = {}):
-        self._internal_graph = nx.DiGraph(**graph_attributes)
+    def __init__(self, graph_attributes: dict = {}, backend: str = "networkx"):
+        if backend not in BACKENDS:
+            logging.error(
+                "Unknown graph backend '%s'. Using networkx instead.", backend
+            )
+            backend = "networkx"
+        self._internal_graph = BACKENDS[backend](**graph_attributes)
+        self._skill_index = SkillIndex()
+        self._skill_matrix = SkillMatrix()
+        self._indexes_stale = False
+        self._projection = CoMembershipProjection(
+            self.PROJECTION_WEIGHTS,
+            self._projected_memberships,
+            self._projected_members,
+        )
+        self._generation = 0
+        self._introductions = OrderedDict()
+        self._centrality = None
+        self._skill_embeddings = None
+        self._history = None
+        self._views = weakref.WeakSet()
+        self._snapshots = {}
+        self._journal = None
 
     @property
     def graph(self):
@@ -57,12 +268,37 @@ class ConnectionGraph:
     def edges(self):
         return self._internal_graph.edges
 
+    @property
+    def backend(self) -> str:
+        return next(
+            name
+            for name, backend in BACKENDS.items()
+            if isinstance(self._internal_graph, backend)
+        )
+
+    @instrumented
+    @_undoable
     def clear(self):
         """
         Clears the internal graph.
+
+        With history enabled or snapshots taken, the internal graph is replaced by
+        a new, empty one instead, so that undoing the clear costs nothing.
         """
-        self._internal_graph.clear()
+        self._record("clear")
+        if self._tracking:
+            self._replace_graph(type(self._internal_graph)())
+        else:
+            self._internal_graph.clear()
+        self._skill_index.clear()
+        self._skill_matrix.clear()
+        self._indexes_stale = False
+        self._projection.clear()
+        self._skill_embeddings = None
+        self._generation += 1
 
+    @instrumented
+    @_undoable
     def add_node(self, label: str, kind: str, keys: dict = {}) -> None:
         """
         Adds a node to the graph.
@@ -75,19 +311,22 @@ class ConnectionGraph:
         Returns:
             None
         """
-        logging.info(f"Adding node '{label}' of kind {kind}.")
+        logging.info("Adding node '%s' of kind %s.", label, kind)
         if self._node_type_valid(kind):
+            self._record("add_node", label=label, kind=kind, keys=keys)
+            self._preserve([label])
             self._internal_graph.add_node(
-                label,
-                label=label,
-                kind=kind,
-                **(keys | self.NODECOLORS[kind] | self.NODESIZE),
+                label, **self._node_attributes(label, kind, keys)
             )
+            self._index_node(label)
+            self._generation += 1
         else:
             logging.error(
-                "Attempted to add unknown node " f"type '{kind}'. Doing nothing."
+                "Attempted to add unknown node type '%s'. Doing nothing.", kind
             )
 
+    @instrumented
+    @_undoable
     def add_edge(
         self, origin_node: str, endpoint_node: str, kind: str, keys: dict = {}
     ) -> None:
@@ -104,17 +343,38 @@ class ConnectionGraph:
         None
         """
         logging.info(
-            f"Adding edge ({origin_node}, " f"{endpoint_node}) of kind '{kind}'."
+            "Adding edge (%s, %s) of kind '%s'.", origin_node, endpoint_node, kind
         )
         if self._edge_type_valid(kind):
+            self._record(
+                "add_edge",
+                origin_node=origin_node,
+                endpoint_node=endpoint_node,
+                kind=kind,
+                keys=keys,
+            )
+            edges = self._internal_graph.edges
+            previous_kind = (
+                edges[origin_node, endpoint_node].get("kind")
+                if (origin_node, endpoint_node) in edges
+                else None
+            )
+            self._preserve([origin_node, endpoint_node], [(origin_node, endpoint_node)])
             self._internal_graph.add_edge(
                 origin_node, endpoint_node, label=kind, kind=kind, **keys
             )
+            if previous_kind is None:
+                self._projection.add_membership(origin_node, endpoint_node, kind)
+            elif previous_kind != kind:
+                self._projection.clear()
+            self._generation += 1
         else:
             logging.error(
-                "Attempted to add unknown edge " f"type '{kind}'. Doing nothing."
+                "Attempted to add unknown edge type '%s'. Doing nothing.", kind
             )
 
+    @instrumented
+    @_undoable
     def add_person(
         self,
         name: str,
@@ -136,7 +396,7 @@ class ConnectionGraph:
             skills (str, optional): The skills of the person. Defaults to "".
         """
         if name in self._internal_graph.nodes:
-            logging.warning("Node '{name}' already exists in the graph!")
+            logging.warning("Node '%s' already exists in the graph!", name)
         self.add_node(
             name, kind="PERSON", keys={"skills": skills, "role": role, "notes": notes}
         )
@@ -150,28 +410,250 @@ class ConnectionGraph:
         if account:
             self.add_person_account_edge(name, account)
 
-    def search_for_person_with_skill(self, skill: str):
+    @instrumented
+    @_undoable
+    def add_nodes(self, nodes) -> int:
+        """
+        Adds many nodes to the graph in a single batch.
+
+        Nodes of an unknown kind are skipped, and a single summary line is logged
+        instead of one line per node.
+
+        Args:
+            nodes (iterable): (label, kind) or (label, kind, keys) tuples.
+
+        Returns:
+            int: The number of nodes added or updated.
+        """
+        if self._journal is not None:
+            nodes = list(nodes)
+            self._record("add_nodes", nodes=nodes)
+        batch = {}
+        skipped = 0
+        with _gc_paused():
+            for label, kind, *keys in nodes:
+                if self._node_type_valid(kind):
+                    batch[label] = self._node_attributes(
+                        label, kind, keys[0] if keys else {}
+                    )
+                else:
+                    skipped += 1
+            self._preserve(batch)
+            self._internal_graph.add_nodes_from(batch.items())
+            self._index_nodes(batch)
+        self._generation += 1
+        logging.info(
+            "Added %d nodes in bulk, skipped %d of unknown kind.", len(batch), skipped
+        )
+        return len(batch)
+
+    @instrumented
+    @_undoable
+    def add_edges(self, edges) -> int:
+        """
+        Adds many edges to the graph in a single batch.
+
+        Edges of an unknown kind are skipped, and a single summary line is logged
+        instead of one line per edge.
+
+        Args:
+            edges (iterable): (origin, endpoint, kind) or (origin, endpoint, kind, keys) tuples.
+
+        Returns:
+            int: The number of edges added or updated.
+        """
+        if self._journal is not None:
+            edges = list(edges)
+            self._record("add_edges", edges=edges)
+        batch = []
+        skipped = 0
+        with _gc_paused():
+            for origin_node, endpoint_node, kind, *keys in edges:
+                if self._edge_type_valid(kind):
+                    batch.append(
+                        (
+                            origin_node,
+                            endpoint_node,
+                            {"label": kind, "kind": kind, **(keys[0] if keys else {})},
+                        )
+                    )
+                else:
+                    skipped += 1
+            if self._tracking:
+                self._preserve(
+                    (
+                        node
+                        for origin, endpoint, _ in batch
+                        for node in (origin, endpoint)
+                    ),
+                    [(origin, endpoint) for origin, endpoint, _ in batch],
+                )
+            self._internal_graph.add_edges_from(batch)
+            self._projection.clear()
+        self._generation += 1
+        logging.info(
+            "Added %d edges in bulk, skipped %d of unknown kind.", len(batch), skipped
+        )
+        return len(batch)
+
+    @instrumented
+    @_undoable
+    def add_people(self, people) -> int:
+        """
+        Adds many people to the graph in a single batch.
+
+        This is equivalent to calling add_person for each record, but the
+        ORGANIZATION, PLACE and ACCOUNT targets are deduplicated in one pass and
+        nodes and edges are inserted with one batched call each.
+
+        Args:
+            people (iterable): Mappings with a "name" and optional "role", "place",
+                "org", "account", "skills" and "notes" entries, e.g. the rows of
+                a csv.DictReader.
+
+        Returns:
+            int: The number of person records added.
+        """
+        if self._journal is not None:
+            fields = ["name", "role", *self.PERSON_LINKS, "skills", "notes"]
+            people = [
+                {field: person.get(field) for field in fields} for person in people
+            ]
+            self._record("add_people", people=people)
+        person_nodes = {}
+        targets = {}
+        edges = []
+        with _gc_paused():
+            for person in people:
+                name = person.get("name")
+                if not name:
+                    continue
+                person_nodes[name] = self._node_attributes(
+                    name,
+                    "PERSON",
+                    {key: person.get(key) or "" for key in ("skills", "role", "notes")},
+                )
+                for field, (node_kind, edge_kind) in self.PERSON_LINKS.items():
+                    target = person.get(field)
+                    if target:
+                        targets.setdefault(target, node_kind)
+                        edges.append(
+                            (name, target, {"label": edge_kind, "kind": edge_kind})
+                        )
+
+            if self._tracking:
+                self._preserve(
+                    [*person_nodes, *targets],
+                    [(origin, endpoint) for origin, endpoint, _ in edges],
+                )
+            self._internal_graph.add_nodes_from(person_nodes.items())
+            new_targets = [
+                (target, self._node_attributes(target, kind))
+                for target, kind in targets.items()
+                if target not in self._internal_graph
+            ]
+            self._internal_graph.add_nodes_from(new_targets)
+            self._internal_graph.add_edges_from(edges)
+            self._index_nodes(person_nodes)
+            self._projection.clear()
+        self._generation += 1
+        logging.info(
+            "Added %d people, %d new linked nodes and %d edges in bulk.",
+            len(person_nodes),
+            len(new_targets),
+            len(edges),
+        )
+        return len(person_nodes)
+
+    @instrumented
+    @_undoable
+    def merge_nodes(self, keep: str, duplicates) -> int:
+        """
+        Merges duplicate nodes into one, rewiring their edges to it.
+
+        Attributes missing from the kept node are taken from the duplicates, and a
+        PERSON keeps the union of every merged person's skills. Edges of a
+        duplicate are moved to the kept node unless it already has the same edge.
+
+        Args:
+            keep (str): The label of the node to keep.
+            duplicates (iterable): The labels of the nodes to merge into it.
+
+        Returns:
+            int: The number of nodes merged and removed.
+        """
+        graph = self._internal_graph
+        if keep not in graph.nodes:
+            logging.error("Node '%s' does not exist. Doing nothing.", keep)
+            return 0
+        duplicates = [
+            label for label in duplicates if label != keep and label in graph.nodes
+        ]
+        self._record("merge_nodes", keep=keep, duplicates=duplicates)
+        self._projection.clear()
+        self._generation += 1
+        for duplicate in duplicates:
+            incoming = [
+                (source, dict(graph.edges[source, duplicate]))
+                for source in list(graph.predecessors(duplicate))
+            ]
+            outgoing = [
+                (target, dict(graph.edges[duplicate, target]))
+                for target in list(graph.successors(duplicate))
+            ]
+            if self._tracking:
+                self._preserve(
+                    [keep, duplicate],
+                    [
+                        edge
+                        for source, _ in incoming
+                        for edge in ((source, duplicate), (source, keep))
+                    ]
+                    + [
+                        edge
+                        for target, _ in outgoing
+                        for edge in ((duplicate, target), (keep, target))
+                    ],
+                )
+            _merge_node_attributes(graph.nodes[keep], graph.nodes[duplicate])
+            graph.remove_node(duplicate)
+            if not self._indexes_stale:
+                self._skill_index.discard(duplicate)
+                self._skill_matrix.discard(duplicate)
+            for source, attributes in incoming:
+                if source != keep and (source, keep) not in graph.edges:
+                    graph.add_edge(source, keep, **attributes)
+            for target, attributes in outgoing:
+                if target != keep and (keep, target) not in graph.edges:
+                    graph.add_edge(keep, target, **attributes)
+        self._index_node(keep)
+        return len(duplicates)
+
+    @instrumented
+    def search_for_person_with_skill(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ):
         """
         Searches for persons in the graph who have a specific skill.
 
+        The lookup goes through the skill index, so its cost grows with the number
+        of matches rather than with the size of the graph. Matching ignores case
+        and surrounding whitespace. Partial and misspelled skills can be matched
+        with the "prefix", "substring" and "fuzzy" modes, which only consult the
+        index of distinct skills.
+
         Parameters:
         - skill (str): The skill to search for.
+        - match (str): How to match the skill: "exact" (default), "prefix", "substring" or "fuzzy".
+        - max_distance (int): The maximum edit distance for "fuzzy" matches. Defaults to one or two edits depending on the skill length.
 
         Returns:
         - matching_persons (dict): A dictionary containing the matching persons as keys and their corresponding attributes as values.
         """
-        matching_persons = dict(
-            filter(
-                lambda x: (
-                    x[0]
-                    if isinstance(x[1], dict)
-                    and x[1].get("kind") == "PERSON"
-                    and skill.lower() in x[1].get("skills", "").lower().split(",")
-                    else False
-                ),
-                self._internal_graph.nodes(data=True),
-            )
-        )
+        matching_persons = {
+            node_id: self._internal_graph.nodes[node_id]
+            for node_id in self._persons_with_skill(skill, match, max_distance)
+        }
         neighbor_nodes = {}
         for node_id in matching_persons:
             neighbor_nodes[node_id] = self._internal_graph[
@@ -179,6 +661,555 @@ class ConnectionGraph:
             ]  # self._internal_graph.neighbors(node_id)
         return matching_persons, neighbor_nodes
 
+    @instrumented
+    def search_person_profiles(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ) -> dict:
+        """
+        Searches for persons with a specific skill and returns their resolved profiles.
+
+        Args:
+            skill (str): The skill to search for.
+            match (str, optional): "exact", "prefix", "substring" or "fuzzy". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            dict: Maps the matching persons to their profiles, see get_person_profiles.
+        """
+        return self.get_person_profiles(
+            self._persons_with_skill(skill, match, max_distance)
+        )
+
+    @instrumented
+    def search_people(
+        self,
+        query: str,
+        match: str = "exact",
+        max_distance: int = None,
+        page_size: int = RESULTS_PAGE_SIZE,
+        order: str = "label",
+        progress=None,
+    ) -> SearchResults:
+        """
+        Searches for persons by skill and returns a lazy, paginated cursor over them.
+
+        Only the matching labels are collected; ordering and profile resolution
+        happen page by page as the results are read, so broad queries stay cheap.
+        The search runs in three stages, each reporting progress: rebuilding the
+        skill indexes if they were invalidated (e.g. by loading a snapshot),
+        matching, and computing the centrality scores when ordering by them.
+
+        Args:
+            query (str): The skill to search for, or a boolean query if match is "boolean".
+            match (str, optional): "exact", "prefix", "substring", "fuzzy" or "boolean". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+            page_size (int, optional): The number of persons per page. Defaults to RESULTS_PAGE_SIZE.
+            order (str, optional): "label", or "centrality" for the best-connected
+                persons first (see centrality). Defaults to "label".
+            progress (callable, optional): Called as progress(done, total) during
+                the search; raising from it aborts the search. Defaults to None.
+
+        Returns:
+            SearchResults: The matching persons, in the requested order.
+
+        Raises:
+            ValueError: If match is "boolean" and the query is malformed.
+        """
+        self._ensure_indexes(_stage_progress(progress, 0, 3))
+        if match == "boolean":
+            persons = self.query_people(query, _stage_progress(progress, 1, 3))
+        else:
+            persons = self._persons_with_skill(
+                query, match, max_distance, _stage_progress(progress, 1, 3)
+            )
+        return SearchResults(
+            self, persons, page_size, order, _stage_progress(progress, 2, 3)
+        )
+
+    @instrumented
+    def query_people(self, query: str, progress=None) -> list:
+        """
+        Returns the persons matching a boolean skill query, e.g.
+        "(python OR scala) AND spark AND NOT junior".
+
+        See parse_skill_query for the syntax. The query is compiled once and
+        cached, and its terms are evaluated most selective first.
+
+        Args:
+            query (str): The boolean skill query.
+            progress (callable, optional): Called as progress(done, total) after
+                each top-level term is evaluated. Defaults to None.
+
+        Returns:
+            list: The labels of the matching persons, sorted.
+
+        Raises:
+            ValueError: If the query is malformed.
+        """
+        tree = parse_skill_query(query)
+        self._ensure_indexes()
+        return sorted(evaluate_skill_query(tree, self._skill_index, progress))
+
+    @instrumented
+    def match_skills(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ) -> list:
+        """
+        Returns the distinct skills in the graph that match a query.
+
+        Args:
+            skill (str): The skill to look for, e.g. "pyhton" or "kube".
+            match (str, optional): "exact", "prefix", "substring" or "fuzzy". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            list: The matching skills, closest matches first.
+        """
+        self._ensure_indexes()
+        return self._skill_index.match_skills(skill, match, max_distance)
+
+    @instrumented
+    def rank_people_by_skills(self, skills: str, k: int = 10) -> list:
+        """
+        Ranks PERSON nodes by how much of a multi-skill query they cover.
+
+        Each query skill is weighted by its inverse document frequency, so rare
+        skills count for more than common ones, and a person's score is the
+        weighted fraction of the query found in their skills (1.0 means every
+        skill matched). Scores for all people are computed at once as a sparse
+        person x skill matrix times the query vector.
+
+        Args:
+            skills (str): The CSV skills to look for, e.g. "python, spark, aws".
+            k (int, optional): The maximum number of results; None returns every match. Defaults to 10.
+
+        Returns:
+            list: (person, score) tuples, best first, ties ordered by name.
+        """
+        self._ensure_indexes()
+        query = SkillIndex.split_skills(skills)
+        if not query:
+            return []
+        weights = idf_weights(
+            query,
+            [self._skill_index.document_frequency(skill) for skill in query],
+            len(self._skill_index),
+        )
+        return self._skill_matrix.top_k(weights, k)
+
+    @instrumented
+    def train_skill_embeddings(
+        self, dimensions: int = EMBEDDING_DIMENSIONS
+    ) -> SkillEmbeddings:
+        """
+        Learns skill vectors from the skills people list together, see SkillEmbeddings.
+
+        Training runs locally on the graph's skill matrix. When the graph already
+        has embeddings, e.g. loaded with it, they seed the new ones, so retraining
+        after some people were added or changed is faster than the first training.
+        The embeddings are saved next to the graph file by save_graph.
+
+        Args:
+            dimensions (int, optional): The length of the vectors. Defaults to EMBEDDING_DIMENSIONS.
+
+        Returns:
+            SkillEmbeddings: The new embeddings, also used by rank_people_semantically.
+        """
+        self._ensure_indexes()
+        self._skill_embeddings = SkillEmbeddings.train(
+            self._skill_matrix.skill_sets(), dimensions, self._skill_embeddings
+        )
+        return self._skill_embeddings
+
+    @instrumented
+    def rank_people_semantically(self, skills: str, k: int = 10) -> list:
+        """
+        Ranks PERSON nodes by how related their skills are to a query, so that "ML"
+        also finds people listing "machine learning, pytorch".
+
+        The SEMANTIC_NEIGHBORS skills whose vectors are closest (by cosine
+        similarity) to the query's mean vector are looked up, and a person's score
+        is the summed similarity of those skills they have, computed for everyone
+        at once like rank_people_by_skills. Query skills without a vector are
+        ignored. Requires train_skill_embeddings, or embeddings loaded with the graph.
+
+        Args:
+            skills (str): The CSV skills to look for, e.g. "ml".
+            k (int, optional): The maximum number of results; None returns every match. Defaults to 10.
+
+        Returns:
+            list: (person, score) tuples, best first, ties ordered by name.
+        """
+        if self._skill_embeddings is None:
+            logging.error(
+                "No skill embeddings. Call train_skill_embeddings first. Doing nothing."
+            )
+            return []
+        self._ensure_indexes()
+        similar = self._skill_embeddings.most_similar(
+            SkillIndex.split_skills(skills), self.SEMANTIC_NEIGHBORS
+        )
+        return self._skill_matrix.top_k(dict(similar), k)
+
+    @instrumented
+    def find_experts(
+        self, person: str, skills: str, k: int = 10, max_hops: int = 2
+    ) -> list:
+        """
+        Answers "who do I know that is an expert in FOO?": ranks the people connected
+        to a person through shared organizations and accounts by how well they match
+        some skills, weighted by how closely they are connected.
+
+        A person's skill score is the same IDF-weighted coverage used by
+        rank_people_by_skills. Closeness comes from the cached co-membership
+        projection: people sharing organizations (PROJECTION_WEIGHTS) or accounts
+        with the person score the summed weight of those memberships, and people
+        two hops away a discounted score through their strongest mutual contact.
+
+        Args:
+            person (str): The person looking for experts.
+            skills (str): The CSV skills to look for, e.g. "python, spark".
+            k (int, optional): The maximum number of results; None returns every match. Defaults to 10.
+            max_hops (int, optional): 1 for direct co-members only, 2 to include their co-members. Defaults to 2.
+
+        Returns:
+            list: (person, score, hops) tuples, best first, ties ordered by name.
+        """
+        nodes = self._internal_graph.nodes
+        if person not in nodes or nodes[person].get("kind") != "PERSON":
+            logging.error("'%s' is not a person in the graph. Doing nothing.", person)
+            return []
+        self._ensure_indexes()
+        query = SkillIndex.split_skills(skills)
+        if not query:
+            return []
+        weights = idf_weights(
+            query,
+            [self._skill_index.document_frequency(skill) for skill in query],
+            len(self._skill_index),
+        )
+        proximity = self._projection.proximity(person, max_hops)
+        results = sorted(
+            (
+                (other, skill_score * proximity[other][0], proximity[other][1])
+                for other, skill_score in self._skill_matrix.scores_of(
+                    weights, proximity
+                ).items()
+            ),
+            key=lambda result: (-result[1], result[0]),
+        )
+        return results if k is None else results[:k]
+
+    @instrumented
+    def introduction_path(
+        self,
+        source: str,
+        target: str,
+        via=("org", "account", "place"),
+        max_length: int = None,
+    ) -> list:
+        """
+        Answers "how can I get introduced to Jane?": returns a shortest chain of
+        persons from one person to another, where each consecutive pair shares an
+        organization, account or place.
+
+        Edges all point from a PERSON to the node it is linked to, so the search
+        follows them in both directions. It is a bidirectional breadth-first
+        search whose half from the source is cached: repeated lookups from the same
+        person reuse every layer already explored until the graph next changes.
+
+        Args:
+            source (str): The person asking for an introduction.
+            target (str): The person to be introduced to.
+            via (iterable, optional): The PERSON_LINKS fields whose shared nodes
+                connect people. Defaults to ("org", "account", "place").
+            max_length (int, optional): The most introductions worth suggesting;
+                None for no limit. Defaults to None.
+
+        Returns:
+            list: The persons and shared nodes along the chain, alternating and from
+            the source to the target, e.g. ["Me", "Acme", "Bo", "Madrid", "Jane"], or an
+            empty list if the two persons are not connected.
+        """
+        nodes = self._internal_graph.nodes
+        for person in (source, target):
+            if person not in nodes or nodes[person].get("kind") != "PERSON":
+                logging.error(
+                    "'%s' is not a person in the graph. Doing nothing.", person
+                )
+                return []
+        unknown = [field for field in via if field not in self.PERSON_LINKS]
+        if unknown:
+            logging.error(
+                "Unknown person link(s) %s. Doing nothing.", ", ".join(unknown)
+            )
+            return []
+        kinds = frozenset(self.PERSON_LINKS[field][1] for field in via)
+        key = (source, kinds)
+        search = self._introductions.pop(key, None)
+        if search is None or search.generation != self._generation:
+            search = IntroductionSearch(
+                source, lambda label: self._linked_nodes(label, kinds), self._generation
+            )
+        self._introductions[key] = search
+        while len(self._introductions) > self.INTRODUCTION_CACHE_SIZE:
+            self._introductions.popitem(last=False)
+        return search.path_to(target, None if max_length is None else 2 * max_length)
+
+    @instrumented
+    def centrality(self, persons=None, progress=None) -> dict:
+        """
+        Returns how well-connected persons are: their PageRank over the graph with
+        every edge followed both ways, so people rank high when they share many
+        well-connected organizations, places and accounts.
+
+        Scores are computed with NumPy power iteration over the edge arrays and
+        cached until the graph next changes. After a change, the iteration starts
+        from the previous scores, so it converges in fewer iterations after small edits.
+
+        Args:
+            persons (iterable, optional): The persons to score. Defaults to None (every PERSON node).
+            progress (callable, optional): Called as progress(iteration, max_iterations)
+                while the scores are computed, see pagerank. Defaults to None.
+
+        Returns:
+            dict: Maps each person in the graph to its score; scores of all nodes sum to 1.
+        """
+        index, scores = self._centrality_scores(progress)
+        if persons is None:
+            persons = (
+                label
+                for label, kind in self._internal_graph.nodes(data="kind")
+                if kind == "PERSON"
+            )
+        return {
+            person: float(scores[index[person]])
+            for person in persons
+            if person in index
+        }
+
+    @instrumented
+    def get_person_profiles(self, names) -> dict:
+        """
+        Returns fully resolved profiles for a batch of persons, e.g. the matches of
+        search_for_person_with_skill, ready to be displayed by any frontend.
+
+        Each person's out-edges are grouped by kind in a single pass, and only
+        edges whose kind and endpoint kind match PERSON_LINKS are reported.
+
+        Args:
+            names (iterable): The labels of the PERSON nodes.
+
+        Returns:
+            dict: Maps each name to a profile with "label", "role", "skills" and "notes"
+            strings, and "place", "org" and "account" lists of linked node labels.
+            Names that are not PERSON nodes are left out.
+        """
+        nodes = self._internal_graph.nodes
+        links = {
+            edge_kind: (field, node_kind)
+            for field, (node_kind, edge_kind) in self.PERSON_LINKS.items()
+        }
+        profiles = {}
+        for name in names:
+            attributes = nodes[name] if name in nodes else {}
+            if attributes.get("kind") != "PERSON":
+                continue
+            profile = {
+                "label": attributes.get("label", name),
+                "role": attributes.get("role") or "",
+                "skills": attributes.get("skills") or "",
+                "notes": attributes.get("notes") or "",
+                **{field: [] for field in self.PERSON_LINKS},
+            }
+            for edge_kind, targets in self._successors_by_kind(name).items():
+                if edge_kind not in links:
+                    continue
+                field, node_kind = links[edge_kind]
+                for target in targets:
+                    target_attributes = nodes[target]
+                    if target_attributes.get("kind") == node_kind:
+                        profile[field].append(target_attributes.get("label", target))
+            profiles[name] = profile
+        return profiles
+
+    @instrumented
+    def people_linked_to(self, target: str) -> set:
+        """
+        Returns the persons linked to an ORGANIZATION, PLACE or ACCOUNT node through
+        the edge kind PERSON_LINKS assigns to it, e.g. everyone ASSOCWITH an organization.
+
+        The lookup reads the node's incoming edges of that kind only, rather than
+        scanning every person.
+
+        Args:
+            target (str): The label of the organization, place or account.
+
+        Returns:
+            set: The labels of the linked PERSON nodes.
+        """
+        nodes = self._internal_graph.nodes
+        if target not in nodes:
+            return set()
+        edge_kinds = dict(self.PERSON_LINKS.values())
+        kind = nodes[target].get("kind")
+        if kind not in edge_kinds:
+            logging.error(
+                "Node '%s' of kind %s has no linked persons. Doing nothing.",
+                target,
+                kind,
+            )
+            return set()
+        return {
+            source
+            for source in self._predecessors_by_kind(target).get(edge_kinds[kind], [])
+            if nodes[source].get("kind") == "PERSON"
+        }
+
+    @instrumented
+    def filter_people(
+        self,
+        skills: str = "",
+        place: str = "",
+        org: str = "",
+        account: str = "",
+        match: str = "exact",
+    ) -> list:
+        """
+        Returns the persons meeting every given criterion, e.g. who on the ACME
+        account knows Kafka and is based in Madrid.
+
+        Each criterion is turned into a set of persons, through the skill index or
+        the reverse lookups of people_linked_to, and the sets are intersected
+        smallest first, so the cost is bounded by the most selective criterion.
+
+        Args:
+            skills (str, optional): CSV skills the persons must all have. Defaults to "".
+            place (str, optional): The place they must be based in. Defaults to "".
+            org (str, optional): The organization they must be associated with. Defaults to "".
+            account (str, optional): The account they must be on. Defaults to "".
+            match (str, optional): How to match each skill, see match_skills. Defaults to "exact".
+
+        Returns:
+            list: The labels of the matching persons, sorted. Empty if no criterion is given.
+        """
+        postings = [
+            self._persons_with_skill(skill, match).keys()
+            for skill in SkillIndex.split_skills(skills)
+        ]
+        nodes = self._internal_graph.nodes
+        links = {"place": place, "org": org, "account": account}
+        for field, target in links.items():
+            if not target:
+                continue
+            node_kind = self.PERSON_LINKS[field][0]
+            if target in nodes and nodes[target].get("kind") == node_kind:
+                postings.append(self.people_linked_to(target))
+            else:
+                postings.append(set())
+        if not postings:
+            return []
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches = {person for person in matches if person in posting}
+        return sorted(matches)
+
+    @instrumented
+    def find_duplicate_nodes(self, kind: str, threshold: float = 0.8) -> list:
+        """
+        Finds groups of nodes of one kind whose labels probably name the same entity,
+        e.g. "Acme Inc", "ACME" and "Acme, Inc.".
+
+        Candidates are found by blocking rather than by comparing every pair of
+        nodes; see entity_resolution.find_duplicates.
+
+        Args:
+            kind (str): The kind of node to look at, one of NODETYPES.
+            threshold (float, optional): The trigram Jaccard similarity at which two
+                normalized labels match. Defaults to 0.8.
+
+        Returns:
+            list: Sorted lists of the labels in each group of duplicates.
+        """
+        if not self._node_type_valid(kind):
+            logging.error("Unknown node type '%s'. Doing nothing.", kind)
+            return []
+        return find_duplicates(
+            (
+                label
+                for label, node_kind in self._internal_graph.nodes(data="kind")
+                if node_kind == kind
+            ),
+            threshold,
+        )
+
+    @instrumented
+    @_undoable
+    def deduplicate_nodes(
+        self, kinds=("ORGANIZATION", "PLACE", "ACCOUNT"), threshold: float = 0.8
+    ) -> dict:
+        """
+        Finds and merges duplicate nodes, keeping the best connected node of each group.
+
+        PERSON nodes are left alone by default, since different people often share
+        a name.
+
+        Args:
+            kinds (iterable, optional): The kinds of node to deduplicate. Defaults to
+                ORGANIZATION, PLACE and ACCOUNT.
+            threshold (float, optional): See find_duplicate_nodes. Defaults to 0.8.
+
+        Returns:
+            dict: Maps the label of each kept node to the labels merged into it.
+        """
+        merged = {}
+        for kind in kinds:
+            for group in self.find_duplicate_nodes(kind, threshold):
+                keep = min(group, key=lambda label: (-self._degree(label), label))
+                merged[keep] = [label for label in group if label != keep]
+                self.merge_nodes(keep, merged[keep])
+        logging.info(
+            "Merged %d duplicate nodes into %d.",
+            sum(map(len, merged.values())),
+            len(merged),
+        )
+        return merged
+
+    def node_style(self, label: str, kind: str) -> dict:
+        """
+        Returns the visual attributes Gephi expects for a node: its label and the
+        color and size shared by every node of its kind.
+
+        These are not stored on each node; they are only written out on export.
+
+        Args:
+            label (str): The label of the node.
+            kind (str): The kind of the node.
+
+        Returns:
+            dict: The node's default "label", "r", "g", "b" and "size" attributes.
+        """
+        return {"label": label, **self.NODECOLORS.get(kind, {}), **self.NODESIZE}
+
+    def styled_nodes(self):
+        """
+        Yields every node along with its visual attributes, e.g. for a GraphML export.
+
+        Style attributes stored on a node, such as a color edited in Gephi, take
+        precedence over the defaults of its kind.
+
+        Yields:
+            tuple: (label, attributes) for each node.
+        """
+        for label, attributes in self.nodes(data=True):
+            styled = dict(attributes)
+            for name, value in self.node_style(label, attributes.get("kind")).items():
+                styled.setdefault(name, value)
+            yield label, styled
+
     def add_person_org_edge(self, name: str, org: str):
         """
         Adds an edge between a person and an organization in the graph.
@@ -193,7 +1224,7 @@ class ConnectionGraph:
         if org not in self._internal_graph.nodes:
             self.add_node(org, kind="ORGANIZATION")
         if (name, org) in self._internal_graph.edges:
-            logging.warning(f"Edge ({name}, {org}) already exists in the graph!")
+            logging.warning("Edge (%s, %s) already exists in the graph!", name, org)
         self.add_edge(name, org, kind="ASSOCWITH")
 
     def add_person_place_edge(self, name: str, place: str):
@@ -211,7 +1242,7 @@ class ConnectionGraph:
             self.add_node(place, kind="PLACE")
 
         if (name, place) in self._internal_graph.edges:
-            logging.warning(f"Edge ({name}, {place}) already exists in the graph!")
+            logging.warning("Edge (%s, %s) already exists in the graph!", name, place)
         self.add_edge(name, place, kind="BASEDIN")
 
     def add_person_account_edge(self, name: str, account: str):
@@ -229,59 +1260,1056 @@ class ConnectionGraph:
             self.add_node(account, kind="ACCOUNT")
 
         if (name, account) in self._internal_graph.edges:
-            logging.warning(f"Edge ({name}, {account}) already exists in the graph!")
+            logging.warning("Edge (%s, %s) already exists in the graph!", name, account)
         self.add_edge(name, account, kind="ONACCOUNT")
 
-    def _node_type_valid(self, potential_node: str) -> bool:
+    @instrumented
+    @_undoable
+    def replay(self, entries) -> None:
         """
-        Checks if the given potential_node is a valid node type.
+        Re-applies mutations recorded in a journal. They are not recorded again.
 
         Args:
-            potential_node (str): The potential node type to check.
+            entries (iterable): Journal entries, each naming one of JOURNALED_OPERATIONS
+                in its "op" key along with that method's arguments.
 
         Returns:
-            bool: True if the potential_node is a valid node type, False otherwise.
+            None
         """
-        return potential_node in self.NODETYPES
+        journal, self._journal = self._journal, None
+        try:
+            for entry in entries:
+                arguments = dict(entry)
+                operation = arguments.pop("op")
+                if operation in self.JOURNALED_OPERATIONS:
+                    getattr(self, operation)(**arguments)
+                else:
+                    logging.error(
+                        "Unknown journal operation '%s'. Skipping it.", operation
+                    )
+        finally:
+            self._journal = journal
 
-    def _edge_type_valid(self, potential_edge: str) -> bool:
+    def detach_journal(self, discard_unsaved: bool = True) -> None:
         """
-        Check if the given potential_edge is a valid edge type.
+        Stops recording mutations into the journal, e.g. before the graph is discarded.
 
         Args:
-            potential_edge (str): The potential edge type to check.
+            discard_unsaved (bool, optional): Whether to drop the mutations recorded
+                since the last save, so they are not offered for recovery. Defaults to True.
 
         Returns:
-            bool: True if the potential_edge is a valid edge type, False otherwise.
+            None
         """
-        return potential_edge in self.EDGETYPES
+        if self._journal is not None:
+            if discard_unsaved:
+                self._journal.discard_uncommitted()
+            self._journal.close()
+            self._journal = None
 
+    def enable_history(self, limit: int = UNDO_LIMIT) -> None:
+        """
+        Starts recording undo steps, one per operation (add_person, merge_nodes,
+        clear, ...). Each step keeps the previous states of the nodes and edges it
+        changed, and a clear keeps the cleared graph as it was, so history costs
+        memory in proportion to the changes made rather than to the graph.
 
-def import_graph_from_graphml_file(filename: Path):
-    """
-    Imports a graph from a GraphML file.
-
-    Args:
-        filename (Path): The path to the GraphML file.
+        Args:
+            limit (int, optional): The maximum number of undo steps kept. Defaults to UNDO_LIMIT.
 
-    Returns:
+        Returns:
+            None
+        """
+        if self._history is None:
+            self._history = GraphHistory(limit)
+        self._history.limit = limit
+
+    @property
+    def can_undo(self) -> bool:
+        return self._history is not None and self._history.can_undo
+
+    @property
+    def can_redo(self) -> bool:
+        return self._history is not None and self._history.can_redo
+
+    @instrumented
+    def undo(self) -> bool:
+        """
+        Reverts the most recent operation recorded since enable_history.
+
+        Returns:
+            bool: Whether there was an operation to undo.
+        """
+        return self._step(undo=True)
+
+    @instrumented
+    def redo(self) -> bool:
+        """
+        Re-applies the most recently undone operation, unless the graph was changed since.
+
+        Returns:
+            bool: Whether there was an operation to redo.
+        """
+        return self._step(undo=False)
+
+    def _step(self, undo: bool) -> bool:
+        """
+        Applies the next undo or redo step and stores its reverse.
+        """
+        if self._history is None:
+            logging.error("History is not enabled. Doing nothing.")
+            return False
+        delta = self._history.pop(undo)
+        if delta is None:
+            return False
+        target = delta.graph if delta.graph is not None and not undo else None
+        self._preserve_in_views(
+            self._internal_graph if target is None else target,
+            delta.nodes,
+            delta.edges,
+        )
+        graph, reverse = delta.apply(self._internal_graph, undo)
+        self._history.push(reverse, undo)
+        if graph is not self._internal_graph:
+            self._internal_graph = graph
+            self._invalidate_indexes()
+            self._projection.clear()
+            self._generation += 1
+            if self._journal is not None:
+                self._record("clear")
+                self._record(
+                    "apply_states",
+                    nodes=[
+                        [label, dict(state)] for label, state in graph.nodes(data=True)
+                    ],
+                    edges=[
+                        [origin, endpoint, dict(state)]
+                        for origin, endpoint, state in graph.edges(data=True)
+                    ],
+                )
+        else:
+            self._after_states_set(delta.nodes, delta.edges)
+        return True
+
+    def snapshot(self, name: str = None) -> GraphView:
+        """
+        Takes a read-only view of the graph as it is now, kept under a name.
+
+        The view shares the graph's elements and only copies those changed
+        afterwards, just before they change, so taking it costs nothing and keeping
+        it costs memory in proportion to the changes made since. It can be read,
+        and searched with the same read-only person queries as the graph (e.g.
+        search_person_profiles and filter_people), while the graph keeps changing,
+        and restore brings the graph back to it.
+
+        Args:
+            name (str, optional): The name of the snapshot. Defaults to None, which
+                names it after the current version, e.g. "v42".
+
+        Returns:
+            GraphView: The view.
+        """
+        if name is None:
+            name = f"v{self._generation}"
+        view = GraphView(
+            self._internal_graph, name, self._generation, self.PERSON_LINKS
+        )
+        self._views.add(view)
+        self._snapshots[name] = view
+        return view
+
+    def drop_snapshot(self, name: str) -> None:
+        """
+        Releases a snapshot, so that its copies no longer need to be kept.
+
+        Args:
+            name (str): The name of the snapshot.
+
+        Returns:
+            None
+        """
+        self._snapshots.pop(name, None)
+
+    @instrumented
+    @_undoable
+    def restore(self, name: str) -> bool:
+        """
+        Brings the graph back to the state of a snapshot, as one undoable operation.
+
+        Only the elements changed since the snapshot are set back, unless the graph
+        was cleared since, in which case the snapshot's whole graph is copied.
+
+        Args:
+            name (str): The name of the snapshot.
+
+        Returns:
+            bool: Whether the snapshot exists.
+        """
+        view = self._snapshots.get(name)
+        if view is None:
+            logging.error("Unknown snapshot '%s'. Doing nothing.", name)
+            return False
+        if view._graph is self._internal_graph:
+            self.apply_states(
+                [[label, state] for label, state in view._delta.nodes.items()],
+                [[*edge, state] for edge, state in view._delta.edges.items()],
+            )
+        else:
+            self.clear()
+            self.apply_states(
+                [list(node) for node in view.nodes(data=True)],
+                [list(edge) for edge in view.edges(data=True)],
+            )
+        return True
+
+    @instrumented
+    @_undoable
+    def apply_states(self, nodes, edges) -> None:
+        """
+        Sets nodes and edges to recorded states, adding, updating or removing them.
+        Used to restore snapshots, and to journal undo and redo.
+
+        Args:
+            nodes (iterable): [label, attributes] pairs, attributes being None to remove the node.
+            edges (iterable): [origin, endpoint, attributes] triples, attributes being None to remove the edge.
+
+        Returns:
+            None
+        """
+        nodes = {label: state for label, state in nodes}
+        edges = {(origin, endpoint): state for origin, endpoint, state in edges}
+        self._preserve(nodes, edges)
+        set_states(self._internal_graph, nodes, edges)
+        self._after_states_set(nodes, edges)
+
+    def _record(self, operation: str, **arguments) -> None:
+        """
+        Appends a mutation to the journal, if one is attached.
+
+        Mutating methods record themselves before changing the graph, so that an
+        entry that cannot be journaled (e.g. a keys value that is not JSON
+        serializable) raises before the graph and its journal can diverge.
+
+        Args:
+            operation (str): The name of the mutating method.
+            **arguments: The arguments needed to replay it.
+
+        Returns:
+            None
+        """
+        if self._journal is not None:
+            self._journal.append({"op": operation, **arguments})
+
+    def _node_attributes(self, label: str, kind: str, keys: dict = {}) -> dict:
+        """
+        Builds the attribute dictionary stored for a node of a valid kind.
+
+        The label, color and size are left out since they always take the defaults
+        given by node_style.
+
+        Args:
+            label (str): The label of the node.
+            kind (str): The kind of the node.
+            keys (dict, optional): Additional properties of the node. Defaults to {}.
+
+        Returns:
+            dict: The node's attributes.
+        """
+        return {
+            "kind": kind,
+            **{
+                name: value
+                for name, value in keys.items()
+                if name not in self.STYLE_ATTRIBUTES
+            },
+        }
+
+    def _without_default_style(self, label: str, attributes: dict) -> dict:
+        """
+        Drops the style attributes of an imported node that hold their default values.
+
+        Args:
+            label (str): The label of the node.
+            attributes (dict): The node's attributes as read from a file.
+
+        Returns:
+            dict: The attributes to store for the node.
+        """
+        style = self.node_style(label, attributes.get("kind"))
+        return {
+            name: value
+            for name, value in attributes.items()
+            if name not in style or style[name] != value
+        }
+
+    def _persons_with_skill(
+        self, skill: str, match: str = "exact", max_distance: int = None, progress=None
+    ) -> dict:
+        """
+        Looks up the persons having any of the skills that match a query.
+
+        Args:
+            skill (str): The skill to search for.
+            match (str, optional): The match mode, see match_skills. Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+            progress (callable, optional): Called as progress(done, total) after each
+                matched skill. Defaults to None.
+
+        Returns:
+            dict: The matching person labels, in order of match quality, as dict keys.
+        """
+        persons = {}
+        matched_skills = self.match_skills(skill, match, max_distance)
+        for done, matched_skill in enumerate(matched_skills, 1):
+            persons.update(dict.fromkeys(self._skill_index.get(matched_skill)))
+            if progress is not None:
+                progress(done, len(matched_skills))
+        return persons
+
+    def _successors_by_kind(self, label: str) -> dict:
+        """
+        Returns the endpoints of a node's outgoing edges grouped by edge kind.
+
+        Args:
+            label (str): The label of the node.
+
+        Returns:
+            dict: Maps edge kinds to lists of endpoint labels.
+        """
+        if isinstance(self._internal_graph, CSRDiGraph):
+            return self._internal_graph.successors_by_kind(label)
+        grouped = {}
+        for target, edge in self._internal_graph.adj[label].items():
+            grouped.setdefault(edge.get("kind"), []).append(target)
+        return grouped
+
+    def _predecessors_by_kind(self, label: str) -> dict:
+        """
+        Returns the origins of a node's incoming edges grouped by edge kind.
+
+        Args:
+            label (str): The label of the node.
+
+        Returns:
+            dict: Maps edge kinds to lists of origin labels.
+        """
+        if isinstance(self._internal_graph, CSRDiGraph):
+            return self._internal_graph.predecessors_by_kind(label)
+        grouped = {}
+        for source, edge in self._internal_graph.pred[label].items():
+            grouped.setdefault(edge.get("kind"), []).append(source)
+        return grouped
+
+    def _degree(self, label: str) -> int:
+        """
+        Counts the edges into and out of a node.
+
+        Args:
+            label (str): The label of the node.
+
+        Returns:
+            int: The number of incoming and outgoing edges.
+        """
+        return sum(map(len, self._successors_by_kind(label).values())) + sum(
+            map(len, self._predecessors_by_kind(label).values())
+        )
+
+    def _projected_memberships(self, person: str):
+        """
+        Yields the (group, kind) pairs of a person's edges of a kind in PROJECTION_WEIGHTS.
+        """
+        for kind, groups in self._successors_by_kind(person).items():
+            if kind in self.PROJECTION_WEIGHTS:
+                for group in groups:
+                    yield group, kind
+
+    def _projected_members(self, group: str, kind: str) -> list:
+        """
+        Returns the origins of the edges of a kind into an organization or account.
+        """
+        return self._predecessors_by_kind(group).get(kind, [])
+
+    def _linked_nodes(self, label: str, kinds) -> list:
+        """
+        Returns the nodes linked to a node by edges of some kinds, in either direction.
+        """
+        linked = []
+        for grouped in (
+            self._successors_by_kind(label),
+            self._predecessors_by_kind(label),
+        ):
+            for kind, labels in grouped.items():
+                if kind in kinds:
+                    linked.extend(labels)
+        return linked
+
+    @property
+    def _tracking(self) -> bool:
+        """
+        Whether the states of elements must be preserved before they change.
+        """
+        return self._history is not None or bool(self._views)
+
+    def _preserve(self, nodes=(), edges=()) -> None:
+        """
+        Hands the current states of nodes and edges about to change to the history
+        and to the live views.
+
+        Args:
+            nodes (iterable, optional): Node labels. Defaults to ().
+            edges (iterable, optional): (origin, endpoint) pairs. Defaults to ().
+
+        Returns:
+            None
+        """
+        if not self._tracking:
+            return
+        nodes, edges = list(nodes), list(edges)
+        if self._history is not None:
+            self._history.preserve(self._internal_graph, nodes, edges)
+        self._preserve_in_views(self._internal_graph, nodes, edges)
+
+    def _preserve_in_views(self, graph, nodes, edges) -> None:
+        for view in list(self._views):
+            view.preserve(graph, nodes, edges)
+
+    def _replace_graph(self, graph) -> None:
+        """
+        Replaces the internal graph wholesale. The old graph is handed to the history
+        as it is and is never changed again, so views keep reading from it.
+
+        Args:
+            graph (nx.DiGraph or CSRDiGraph): The new internal graph.
+
+        Returns:
+            None
+        """
+        if self._history is not None:
+            self._history.replace_graph(self._internal_graph)
+        self._internal_graph = graph
+
+    def _after_states_set(self, nodes: dict, edges: dict) -> None:
+        """
+        Brings the indexes, caches and journal up to date after nodes and edges were
+        set to recorded states, e.g. by undo.
+
+        Args:
+            nodes (dict): Maps the labels of the nodes set to their new state.
+            edges (dict): Maps the (origin, endpoint) pairs of the edges set to their new state.
+
+        Returns:
+            None
+        """
+        present = [label for label in nodes if label in self._internal_graph.nodes]
+        if not self._indexes_stale:
+            for label in nodes:
+                if label not in self._internal_graph.nodes:
+                    self._skill_index.discard(label)
+                    self._skill_matrix.discard(label)
+        self._index_nodes(present)
+        self._projection.clear()
+        self._generation += 1
+        if self._journal is not None:
+            graph = self._internal_graph
+            self._record(
+                "apply_states",
+                nodes=[[label, _node_state(graph, label)] for label in nodes],
+                edges=[[*edge, _edge_state(graph, *edge)] for edge in edges],
+            )
+
+    def _centrality_scores(self, progress=None) -> tuple:
+        """
+        Returns the PageRank of every node, recomputing it if the graph changed since
+        it was last computed, warm-started from the previous scores.
+
+        Returns:
+            tuple: A dict mapping each node label to its position, and the scores array.
+        """
+        if self._centrality is not None and self._centrality[0] == self._generation:
+            return self._centrality[1], self._centrality[2]
+        graph = self._internal_graph
+        if isinstance(graph, CSRDiGraph):
+            labels = graph.labels_by_id()
+            sources, targets = graph.edge_arrays()
+            index = {label: i for i, label in enumerate(labels) if label is not None}
+        else:
+            labels = list(graph)
+            index = {label: i for i, label in enumerate(labels)}
+            adjacency = graph.adj
+            sources = np.repeat(
+                np.arange(len(labels)),
+                np.fromiter(map(len, adjacency.values()), np.int64, len(labels)),
+            )
+            targets = np.fromiter(
+                (index[target] for targets in adjacency.values() for target in targets),
+                dtype=np.int64,
+                count=len(sources),
+            )
+        positions = np.fromiter(index.values(), dtype=np.int64, count=len(index))
+        alive = np.zeros(len(labels), dtype=bool)
+        alive[positions] = True
+
+        start = None
+        if self._centrality is not None:
+            _, previous_index, previous_scores = self._centrality
+            previous = np.fromiter(
+                (previous_index.get(label, -1) for label in index),
+                dtype=np.int64,
+                count=len(index),
+            )
+            start = np.full(len(labels), 1.0 / max(len(index), 1))
+            found = previous >= 0
+            start[positions[found]] = previous_scores[previous[found]]
+        scores, iterations = pagerank(
+            sources, targets, len(labels), start=start, alive=alive, progress=progress
+        )
+        logging.info(
+            "Computed the centrality of %d nodes in %d iterations.",
+            len(index),
+            iterations,
+        )
+        self._centrality = (self._generation, index, scores)
+        return index, scores
+
+    def _index_node(self, label: str) -> None:
+        """
+        Brings the indexes up to date with the current attributes of a node.
+
+        Args:
+            label (str): The label of the node that was added or updated.
+
+        Returns:
+            None
+        """
+        if self._indexes_stale:
+            return
+        attributes = self._internal_graph.nodes[label]
+        if attributes.get("kind") == "PERSON":
+            if self._skill_index.add(label, attributes.get("skills", "")):
+                self._skill_matrix.update(label, self._skill_index.skills_of(label))
+        else:
+            self._skill_index.discard(label)
+            self._skill_matrix.discard(label)
+
+    def _index_nodes(self, labels) -> None:
+        """
+        Brings the indexes up to date with the current attributes of many nodes.
+
+        Args:
+            labels (iterable): The labels of the nodes that were added or updated.
+
+        Returns:
+            None
+        """
+        if self._indexes_stale:
+            return
+        nodes = self._internal_graph.nodes
+        persons = []
+        for label in labels:
+            attributes = nodes[label]
+            if attributes.get("kind") == "PERSON":
+                persons.append((label, attributes.get("skills", "")))
+            elif label in self._skill_index:
+                self._skill_index.discard(label)
+                self._skill_matrix.discard(label)
+        changed = self._skill_index.add_many(persons)
+        self._skill_matrix.update_many(
+            (label, self._skill_index.skills_of(label)) for label in changed
+        )
+
+    def _rebuild_indexes(self, progress=None) -> None:
+        """
+        Rebuilds every index from scratch, e.g. after the internal graph was replaced.
+
+        Args:
+            progress (callable, optional): Called as progress(nodes_indexed, total_nodes)
+                after every INDEX_PROGRESS_CHUNK nodes. If it raises, the indexes are
+                left invalidated. Defaults to None.
+
+        Returns:
+            None
+        """
+        self._skill_index.clear()
+        self._skill_matrix.clear()
+        self._indexes_stale = False
+        if progress is None:
+            self._index_nodes(self._internal_graph.nodes)
+            return
+        labels = list(self._internal_graph.nodes)
+        try:
+            for start in range(0, len(labels), INDEX_PROGRESS_CHUNK):
+                self._index_nodes(labels[start : start + INDEX_PROGRESS_CHUNK])
+                progress(min(start + INDEX_PROGRESS_CHUNK, len(labels)), len(labels))
+        except BaseException:
+            self._invalidate_indexes()
+            raise
+
+    def _invalidate_indexes(self) -> None:
+        """
+        Drops every index and defers rebuilding it until a query needs it, e.g. after
+        loading a snapshot, so that opening a graph does not pay for indexing it.
+
+        Returns:
+            None
+        """
+        self._skill_index.clear()
+        self._skill_matrix.clear()
+        self._indexes_stale = True
+
+    def _ensure_indexes(self, progress=None) -> None:
+        """
+        Rebuilds the indexes if they were invalidated.
+
+        Args:
+            progress (callable, optional): See _rebuild_indexes. Defaults to None.
+
+        Returns:
+            None
+        """
+        if self._indexes_stale:
+            self._rebuild_indexes(progress)
+
+    def _node_type_valid(self, potential_node: str) -> bool:
+        """
+        Checks if the given potential_node is a valid node type.
+
+        Args:
+            potential_node (str): The potential node type to check.
+
+        Returns:
+            bool: True if the potential_node is a valid node type, False otherwise.
+        """
+        return potential_node in self.NODETYPES
+
+    def _edge_type_valid(self, potential_edge: str) -> bool:
+        """
+        Check if the given potential_edge is a valid edge type.
+
+        Args:
+            potential_edge (str): The potential edge type to check.
+
+        Returns:
+            bool: True if the potential_edge is a valid edge type, False otherwise.
+        """
+        return potential_edge in self.EDGETYPES
+
+
+@instrumented
+def import_graph_from_graphml_file(
+    filename: Path, progress=None, backend: str = "networkx"
+):
+    """
+    Imports a graph from a GraphML file.
+
+    The file is parsed incrementally and added to the graph in batches, so the
+    whole XML document is never held in memory. Nodes and edges whose kind is
+    not one of NODETYPES or EDGETYPES are skipped, as are edges whose endpoints
+    were skipped or never declared.
+
+    Args:
+        filename (Path): The path to the GraphML file.
+        progress (callable, optional): Called as progress(bytes_read, total_bytes)
+            while the file is read. Raising from it aborts the import.
+        backend (str, optional): The storage backend, one of BACKENDS. Defaults to "networkx".
+
+    Returns:
         ConnectionGraph: The imported graph.
     """
-    graphml_graph = nx.read_graphml(filename)
-    g = ConnectionGraph()
-    g._internal_graph = graphml_graph
+    g = ConnectionGraph(backend=backend)
+    nodes, edges, deferred_edges = [], [], []
+    skipped_nodes = skipped_edges = 0
+
+    def flush_nodes():
+        g._internal_graph.add_nodes_from(nodes)
+        g._index_nodes(label for label, _ in nodes)
+        nodes.clear()
+
+    def flush_edges(pending):
+        flush_nodes()
+        g._internal_graph.add_edges_from(
+            edge for edge in pending if edge[0] in g.nodes and edge[1] in g.nodes
+        )
+        missing = [
+            edge for edge in pending if edge[0] not in g.nodes or edge[1] not in g.nodes
+        ]
+        pending.clear()
+        return missing
+
+    with _gc_paused():
+        for element in iter_graphml(filename, progress):
+            if element[0] == "node":
+                _, label, attributes = element
+                if g._node_type_valid(attributes.get("kind")):
+                    nodes.append((label, g._without_default_style(label, attributes)))
+                    if len(nodes) >= GRAPHML_BATCH_SIZE:
+                        flush_nodes()
+                else:
+                    skipped_nodes += 1
+            elif element[0] == "edge":
+                _, source, target, attributes = element
+                if g._edge_type_valid(attributes.get("kind")):
+                    edges.append((source, target, attributes))
+                    if len(edges) >= GRAPHML_BATCH_SIZE:
+                        deferred_edges += flush_edges(edges)
+                else:
+                    skipped_edges += 1
+            else:
+                g.graph.update(element[1])
+        deferred_edges += flush_edges(edges)
+        skipped_edges += len(flush_edges(deferred_edges))
+
+    if skipped_nodes or skipped_edges:
+        logging.error(
+            "Skipped %d nodes and %d edges of unknown kind or with unknown endpoints "
+            "while importing '%s'.",
+            skipped_nodes,
+            skipped_edges,
+            filename,
+        )
     return g
 
 
-def export_graph_to_graphml_file(g: ConnectionGraph, path: Path):
+@instrumented
+def import_graphs_from_directory(
+    directory: Path, workers: int = None, progress=None, backend: str = "networkx"
+):
+    """
+    Imports every GraphML file in a directory and merges them into one graph.
+
+    The files are parsed in parallel in a pool of worker processes and merged in
+    file name order as they come back. PERSON nodes with the same label are
+    merged into one, with the union of their skills; ORGANIZATION, PLACE and
+    ACCOUNT nodes are deduplicated by label, ignoring case and whitespace, and
+    keep the spelling of the first file they appear in. Other attributes keep the
+    first non-empty value found.
+
+    Args:
+        directory (Path): The directory holding the GraphML files (".graphml" or ".graphml.gz").
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        progress (callable, optional): Called as progress(files_merged, total_files)
+            after each file. Raising from it aborts the import.
+        backend (str, optional): The storage backend, one of BACKENDS. Defaults to "networkx".
+
+    Returns:
+        ConnectionGraph: The merged graph.
+    """
+    filenames = sorted(
+        path
+        for path in Path(directory).iterdir()
+        if path.name.endswith(GRAPHML_SUFFIXES)
+    )
+    g = ConnectionGraph(backend=backend)
+    nodes, edges, canonical, aliases = {}, {}, {}, {}
+    workers = min(workers or os.cpu_count() or 1, len(filenames))
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers)
+        parsed = executor.map(_read_graphml_for_merge, filenames)
+    else:
+        parsed = map(_read_graphml_for_merge, filenames)
+    try:
+        for merged_files, (graph_attributes, file_nodes, file_edges) in enumerate(
+            parsed, 1
+        ):
+            for key, value in graph_attributes.items():
+                g.graph.setdefault(key, value)
+            for label, attributes in file_nodes:
+                kind = attributes.get("kind")
+                if kind != "PERSON":
+                    key = (
+                        kind,
+                        " ".join(attributes.get("label", label).split()).casefold(),
+                    )
+                    aliases[label] = canonical.setdefault(key, label)
+                    label = aliases[label]
+                _merge_node_attributes(nodes.setdefault(label, {}), attributes)
+            for source, target, attributes in file_edges:
+                edges.setdefault(
+                    (aliases.get(source, source), aliases.get(target, target)),
+                    attributes,
+                )
+            if progress is not None:
+                progress(merged_files, len(filenames))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    with _gc_paused():
+        g._internal_graph.add_nodes_from(nodes.items())
+        g._index_nodes(nodes)
+        g._internal_graph.add_edges_from(
+            (source, target, attributes)
+            for (source, target), attributes in edges.items()
+            if source in nodes and target in nodes
+        )
+    logging.info(
+        "Merged %d GraphML files into %d nodes and %d edges.",
+        len(filenames),
+        len(g.nodes),
+        len(g.edges),
+    )
+    return g
+
+
+def _read_graphml_for_merge(filename: Path):
+    """
+    Parses a GraphML file into (graph_attributes, nodes, edges) lists, keeping only
+    the nodes and edges of known kinds. Runs in the worker processes of
+    import_graphs_from_directory.
+    """
+    g = ConnectionGraph()
+    graph_attributes, nodes, edges = {}, [], []
+    for element in iter_graphml(filename):
+        if element[0] == "node":
+            _, label, attributes = element
+            if g._node_type_valid(attributes.get("kind")):
+                nodes.append((label, g._without_default_style(label, attributes)))
+        elif element[0] == "edge":
+            if g._edge_type_valid(element[3].get("kind")):
+                edges.append(element[1:])
+        else:
+            graph_attributes.update(element[1])
+    return graph_attributes, nodes, edges
+
+
+def _merge_node_attributes(merged: dict, attributes: dict) -> None:
+    """
+    Merges the attributes of a duplicate node into those of the node it duplicates.
+    """
+    for name, value in attributes.items():
+        if name == "skills" and merged.get("skills"):
+            skills = {
+                skill.strip().lower(): skill.strip() for skill in value.split(",")
+            }
+            for skill in merged["skills"].split(","):
+                skills.pop(skill.strip().lower(), None)
+            skills.pop("", None)
+            if skills:
+                merged["skills"] = ", ".join([merged["skills"], *skills.values()])
+        elif merged.get(name) in (None, ""):
+            merged[name] = value
+
+
+class _StyledNodes:
+    """
+    The nodes of a graph with their visual attributes filled in, iterable more than once.
+    """
+
+    def __init__(self, g: ConnectionGraph):
+        self._graph = g
+
+    def __iter__(self):
+        return self._graph.styled_nodes()
+
+
+@instrumented
+def import_people_from_csv_file(g: ConnectionGraph, filename: Path) -> int:
+    """
+    Adds the people listed in a CSV file to a graph in a single batch.
+
+    The file must have a header row with a "name" column and may have "role",
+    "place", "org", "account", "skills" and "notes" columns.
+
+    Args:
+        g (ConnectionGraph): The graph to add the people to.
+        filename (Path): The path to the CSV file.
+
+    Returns:
+        int: The number of person records added.
+    """
+    with open(filename, newline="", encoding="utf-8") as csv_file:
+        return g.add_people(csv.DictReader(csv_file))
+
+
+@instrumented
+def export_graph_to_graphml_file(g: ConnectionGraph, path: Path, progress=None):
     """
     Export the connection graph to a GraphML file.
 
+    Nodes and edges are streamed to the file as they are written instead of
+    building the whole XML document first. Paths ending in ".gz" (e.g.
+    "team.graphml.gz") are gzip-compressed; Gephi can open them once decompressed.
+    Each node's label, color and size are written out as Gephi expects them.
+
     Args:
         g (ConnectionGraph): The connection graph to export.
         path (Path): The path to save the GraphML file.
+        progress (callable, optional): Called as progress(elements_written, total_elements)
+            while the file is written. Raising from it aborts the export.
+
+    Returns:
+        None
+    """
+    write_graphml(path, g.graph, _StyledNodes(g), g.edges(data=True), progress=progress)
+
+
+@instrumented
+def import_graph_from_snapshot_file(filename: Path, backend: str = "networkx"):
+    """
+    Imports a graph from a binary snapshot file.
+
+    Snapshots load much faster than GraphML but can only be read by this library;
+    use GraphML to exchange graphs with Gephi. Snapshots hold the attributes as
+    stored, without default styles, so they are loaded as they are: the CSR
+    backend takes the columns and builds its arrays from the edge arrays in bulk,
+    and networkx gets one attribute dictionary per element. The skill indexes
+    are built on the first search rather than during the load.
+
+    Args:
+        filename (Path): The path to the snapshot file.
+        backend (str, optional): The storage backend, one of BACKENDS. Defaults to "networkx".
+
+    Returns:
+        ConnectionGraph: The imported graph.
+    """
+    g = ConnectionGraph(backend=backend)
+    csr = g.backend == "csr"
+    with _gc_paused():
+        graph_attributes, labels, node_columns, sources, targets, edge_columns = (
+            read_snapshot_columns(filename, CSRDiGraph.MISSING if csr else None)
+        )
+        if csr:
+            g._internal_graph = CSRDiGraph.from_columns(
+                labels, node_columns, sources, targets, edge_columns, **graph_attributes
+            )
+        else:
+            internal_graph = g._internal_graph
+            internal_graph.graph.update(graph_attributes)
+            internal_graph.add_nodes_from(
+                zip(labels, column_rows(node_columns, len(labels)))
+            )
+            internal_graph.add_edges_from(
+                zip(
+                    [labels[i] for i in sources.tolist()],
+                    [labels[i] for i in targets.tolist()],
+                    column_rows(edge_columns, len(sources)),
+                )
+            )
+    g._invalidate_indexes()
+    return g
+
+
+@instrumented
+def export_graph_to_snapshot_file(g: ConnectionGraph, path: Path):
+    """
+    Export the connection graph to a binary snapshot file.
+
+    Args:
+        g (ConnectionGraph): The connection graph to export.
+        path (Path): The path to save the snapshot file.
 
     Returns:
         None
     """
-    nx.write_graphml(g._internal_graph, path)
+    write_snapshot(path, g.graph, g.nodes(data=True), g.edges(data=True))
+
+
+@instrumented
+def load_graph(
+    filename: Path,
+    progress=None,
+    recover_unsaved: bool = False,
+    backend: str = "networkx",
+):
+    """
+    Loads a graph from either a snapshot or a GraphML file, detected from its content.
+
+    Changes saved to the file's journal since it was last written in full are
+    replayed, and the journal is attached to the graph so that further changes
+    are recorded. Skill embeddings saved next to the file are loaded too.
+
+    Args:
+        filename (Path): The path to the graph file.
+        progress (callable, optional): Progress callback for GraphML files, see
+            import_graph_from_graphml_file.
+        recover_unsaved (bool, optional): Whether to also replay changes that were
+            recorded but never saved, e.g. because the program crashed. See
+            has_unsaved_changes. Defaults to False, which discards them.
+        backend (str, optional): The storage backend, one of BACKENDS. Defaults to "networkx".
+
+    Returns:
+        ConnectionGraph: The loaded graph.
+    """
+    if is_snapshot_file(filename):
+        g = import_graph_from_snapshot_file(filename, backend)
+    else:
+        g = import_graph_from_graphml_file(filename, progress, backend)
+    committed, uncommitted = GraphJournal.read(filename)
+    g.replay(committed + uncommitted if recover_unsaved else committed)
+    g._journal = GraphJournal.open(filename, keep_uncommitted=recover_unsaved)
+    embeddings_path = SkillEmbeddings.path_for(filename)
+    if embeddings_path.exists():
+        g._skill_embeddings = SkillEmbeddings.load(embeddings_path)
+    return g
+
+
+def has_unsaved_changes(filename: Path) -> bool:
+    """
+    Checks whether a graph file's journal holds changes that were never saved.
+
+    Args:
+        filename (Path): The path to the graph file.
+
+    Returns:
+        bool: True if load_graph(filename, recover_unsaved=True) would recover changes.
+    """
+    return bool(GraphJournal.read(filename)[1])
+
+
+@instrumented
+def save_graph(g: ConnectionGraph, path: Path, compact: bool = False, progress=None):
+    """
+    Saves a graph as a snapshot if the path ends in SNAPSHOT_SUFFIX, or as GraphML otherwise.
+    Skill embeddings, if any were trained, are saved next to it (see SkillEmbeddings.path_for).
+
+    When the graph was loaded from (or last saved to) the same path, saving only
+    marks the changes recorded in its journal as saved. The file is rewritten in
+    full, and the journal emptied, when saving to a new path, when compact is set,
+    when the file no longer exists, or once the journal grows past a fraction of
+    the file's size.
+
+    Args:
+        g (ConnectionGraph): The connection graph to save.
+        path (Path): The path to save the graph to.
+        compact (bool, optional): Whether to always rewrite the file in full, e.g.
+            before handing it to Gephi. Defaults to False.
+        progress (callable, optional): Progress callback for GraphML files, see
+            export_graph_to_graphml_file. Raising from it aborts the save and leaves
+            the existing file untouched.
+
+    Returns:
+        None
+    """
+    path = Path(path)
+    if g._skill_embeddings is not None:
+        embeddings_path = SkillEmbeddings.path_for(path)
+        temporary_path = embeddings_path.with_name(f".tmp-{embeddings_path.name}")
+        g._skill_embeddings.save(temporary_path)
+        os.replace(temporary_path, embeddings_path)
+    journal = g._journal
+    if (
+        journal is not None
+        and journal.graph_path == path
+        and not compact
+        and path.exists()
+    ):
+        threshold = max(
+            JOURNAL_COMPACTION_MIN_BYTES,
+            JOURNAL_COMPACTION_RATIO * os.path.getsize(path),
+        )
+        if journal.size <= threshold:
+            journal.commit()
+            return
+
+    temporary_path = path.with_name(f".tmp-{path.name}")
+    try:
+        if str(path).endswith(SNAPSHOT_SUFFIX):
+            export_graph_to_snapshot_file(g, temporary_path)
+        else:
+            export_graph_to_graphml_file(g, temporary_path, progress)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+    os.replace(temporary_path, path)
+    g.detach_journal()
+    g._journal = GraphJournal.create(path)
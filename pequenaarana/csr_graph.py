@@ -0,0 +1,761 @@
+import itertools
+import operator
+import sys
+from collections.abc import Mapping, MutableMapping, Set
+
+import numpy as np
+
+_MISSING = object()
+MERGE_MIN_PENDING = 1024
+MERGE_PENDING_RATIO = 0.1
+
+
+class CSRDiGraph:
+    """
+    A compact, array-backed directed graph exposing the subset of the nx.DiGraph API
+    used by ConnectionGraph.
+
+    Nodes get consecutive integer ids and their labels are interned. Node attributes
+    are stored column by column (one list per attribute name) instead of one dict per
+    node. Edges are stored as CSR adjacency arrays, one set per edge kind, in both
+    directions; an edge's "kind" and "label" attributes are implied by the partition
+    it lives in, and only unusual extra attributes are kept in a side table.
+
+    New edges go to a small per-node pending buffer that is merged into the arrays
+    once it reaches a fraction of the graph's size, so inserting edges one at a time
+    stays cheap. Removed edges that already live in the arrays are tombstoned until
+    the next merge.
+
+    Attributes:
+        MISSING: The placeholder of absent values in attribute columns.
+        graph (dict): Graph-level attributes.
+        _ids (dict): Maps node labels to integer ids.
+        _labels (list): Maps integer ids to node labels, or None for removed nodes.
+        _columns (dict): Maps attribute names to per-node value lists.
+        _kinds (list): The distinct edge kinds, indexed by kind id.
+        _out (dict): Maps kind ids to (indptr, indices) arrays of outgoing edges.
+        _in (dict): Maps kind ids to (indptr, indices) arrays of incoming edges.
+        _pending_out (dict): Maps node ids to [target id, kind id] pairs not yet merged.
+        _pending_in (dict): Maps node ids to sets of source ids not yet merged.
+        _tombstones (set): (source id, target id) pairs removed from the arrays.
+        _edge_extras (dict): Maps (source id, target id) to extra edge attributes.
+        _edge_count (int): The number of live edges.
+
+    Methods:
+        add_node(self, node_for_adding, **attributes) -> None: Adds or updates a node.
+        add_nodes_from(self, nodes) -> None: Adds or updates many nodes.
+        add_edge(self, u_of_edge, v_of_edge, **attributes) -> None: Adds or updates an edge.
+        add_edges_from(self, edges) -> None: Adds or updates many edges.
+        remove_edge(self, source, target) -> None: Removes an edge.
+        remove_node(self, label) -> None: Removes a node and its edges.
+        successors(self, label) -> list: Returns the targets of a node's edges.
+        predecessors(self, label) -> list: Returns the sources of the edges into a node.
+        predecessors_by_kind(self, label) -> dict: Returns the sources of the edges into a node grouped by edge kind.
+        successors_by_kind(self, label) -> dict: Returns the targets of a node's edges grouped by edge kind.
+        edge_arrays(self) -> tuple: Returns every live edge as integer id arrays.
+        labels_by_id(self) -> list: Returns the node labels indexed by integer id.
+        from_columns(cls, labels, node_columns, sources, targets, edge_columns, **graph_attributes): Builds a graph from attribute columns and edge arrays.
+        clear(self) -> None: Removes every node, edge and graph attribute.
+        memory_usage(self) -> int: Approximates the bytes used by the graph's structures.
+    """
+
+    MISSING = _MISSING
+
+    def __init__(self, **graph_attributes):
+        self.graph = dict(graph_attributes)
+        self._reset()
+
+    @classmethod
+    def from_columns(
+        cls, labels, node_columns, sources, targets, edge_columns, **graph_attributes
+    ):
+        """
+        Builds a graph from attribute columns and edge arrays, e.g. as read from a
+        snapshot file, filling the columns and CSR arrays in bulk rather than
+        adding nodes and edges one at a time.
+
+        Args:
+            labels (list): The node labels, whose positions become the node ids.
+            node_columns (dict): Maps attribute names to lists of one value per
+                node, or MISSING for nodes without the attribute. The lists are
+                used as they are, not copied.
+            sources (np.ndarray): The node id of the origin of every edge.
+            targets (np.ndarray): The node id of the endpoint of every edge.
+            edge_columns (dict): Maps attribute names to one value per edge, or
+                MISSING for edges without the attribute.
+            **graph_attributes: Graph-level attributes.
+
+        Returns:
+            CSRDiGraph: The graph.
+        """
+        graph = cls(**graph_attributes)
+        node_count = len(labels)
+        # Unlike _new_node, labels are not interned: readers such as a snapshot's
+        # string table already share one object per distinct string.
+        graph._labels = list(labels)
+        graph._ids = dict(zip(graph._labels, range(node_count)))
+        graph._columns = dict(node_columns)
+
+        edge_columns = dict(edge_columns)
+        edge_count = len(sources)
+        kind_names = edge_columns.pop("kind", [_MISSING] * edge_count)
+        edge_labels = edge_columns.pop("label", [_MISSING] * edge_count)
+        kind_ids = {
+            kind: graph._kind_id(None if kind is _MISSING else kind)
+            for kind in dict.fromkeys(kind_names)
+        }
+        kinds = np.fromiter(
+            map(kind_ids.__getitem__, kind_names), dtype=np.int32, count=edge_count
+        )
+        # Labels equal to the kind are implied by the partition, see _set_edge.
+        extras = {
+            edge: {"label": edge_labels[edge]}
+            for edge in itertools.compress(
+                range(edge_count), map(operator.ne, edge_labels, kind_names)
+            )
+        }
+        for name, values in edge_columns.items():
+            for edge, value in enumerate(values):
+                if value is not _MISSING:
+                    extras.setdefault(edge, {})[name] = value
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        graph._edge_extras = {
+            (int(sources[edge]), int(targets[edge])): attributes
+            for edge, attributes in extras.items()
+        }
+        for kind in range(len(graph._kinds)):
+            mask = kinds == kind
+            graph._out[kind] = _csr(sources[mask], targets[mask], node_count)
+            graph._in[kind] = _csr(targets[mask], sources[mask], node_count)
+        graph._base_nodes = node_count
+        graph._edge_count = edge_count
+        return graph
+
+    def clear(self) -> None:
+        """
+        Removes every node, edge and graph attribute.
+        """
+        self.graph.clear()
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Removes every node and edge, keeping the graph attributes.
+        """
+        self._ids = {}
+        self._labels = []
+        self._columns = {}
+        self._kinds = []
+        self._kind_ids = {}
+        self._out = {}
+        self._in = {}
+        self._base_nodes = 0
+        self._pending_out = {}
+        self._pending_in = {}
+        self._pending_count = 0
+        self._tombstones = set()
+        self._edge_extras = {}
+        self._edge_count = 0
+        self._merge_deferred = False
+
+    # -- nx.DiGraph compatible API ---------------------------------------------
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    @property
+    def edges(self):
+        return _EdgeView(self)
+
+    def __contains__(self, label) -> bool:
+        return label in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, label) -> dict:
+        source = self._ids[label]
+        return {
+            self._labels[target]: self._edge_attributes(source, target, kind)
+            for target, kind in self._out_edges(source)
+        }
+
+    def number_of_nodes(self) -> int:
+        return len(self._ids)
+
+    def number_of_edges(self) -> int:
+        return self._edge_count
+
+    def add_node(self, node_for_adding, **attributes) -> None:
+        """
+        Adds a node, or updates the attributes of an existing one.
+
+        Args:
+            node_for_adding: The node label.
+            **attributes: The attributes to set.
+
+        Returns:
+            None
+        """
+        node = self._ids.get(node_for_adding)
+        if node is None:
+            node = self._new_node(node_for_adding)
+        for name, value in attributes.items():
+            self._set_attribute(node, name, value)
+
+    def add_nodes_from(self, nodes) -> None:
+        """
+        Adds or updates many nodes.
+
+        Args:
+            nodes (iterable): Labels or (label, attributes) tuples.
+
+        Returns:
+            None
+        """
+        for node in nodes:
+            if isinstance(node, tuple):
+                self.add_node(node[0], **node[1])
+            else:
+                self.add_node(node)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attributes) -> None:
+        """
+        Adds an edge, or updates an existing one. Missing endpoints are created.
+
+        The edge's partition is taken from its "kind" attribute.
+
+        Args:
+            u_of_edge: The label of the origin node.
+            v_of_edge: The label of the endpoint node.
+            **attributes: The attributes of the edge.
+
+        Returns:
+            None
+        """
+        source_id = self._ids.get(u_of_edge)
+        if source_id is None:
+            source_id = self._new_node(u_of_edge)
+        target_id = self._ids.get(v_of_edge)
+        if target_id is None:
+            target_id = self._new_node(v_of_edge)
+
+        existing = self._find_edge(source_id, target_id)
+        if existing is None:
+            self._edge_count += 1
+        else:
+            attributes = {
+                **self._edge_attributes(source_id, target_id, existing),
+                **attributes,
+            }
+        self._set_edge(source_id, target_id, existing, attributes)
+        self._maybe_merge()
+
+    def add_edges_from(self, edges) -> None:
+        """
+        Adds or updates many edges, merging them into the CSR arrays at most once.
+
+        Args:
+            edges (iterable): (source, target) or (source, target, attributes) tuples.
+
+        Returns:
+            None
+        """
+        self._merge_deferred = True
+        try:
+            for edge in edges:
+                self.add_edge(edge[0], edge[1], **(edge[2] if len(edge) > 2 else {}))
+        finally:
+            self._merge_deferred = False
+        self._maybe_merge()
+
+    def remove_edge(self, source, target) -> None:
+        """
+        Removes an edge.
+
+        Args:
+            source: The label of the origin node.
+            target: The label of the endpoint node.
+
+        Raises:
+            KeyError: If the edge does not exist.
+        """
+        source_id, target_id = self._ids[source], self._ids[target]
+        kind = self._find_edge(source_id, target_id)
+        if kind is None:
+            raise KeyError((source, target))
+        self._drop_edge(source_id, target_id, kind)
+        self._edge_extras.pop((source_id, target_id), None)
+        self._edge_count -= 1
+
+    def remove_node(self, label) -> None:
+        """
+        Removes a node along with its incoming and outgoing edges.
+
+        Args:
+            label: The node label.
+
+        Raises:
+            KeyError: If the node does not exist.
+        """
+        node = self._ids[label]
+        for target in [self._labels[t] for t, _ in self._out_edges(node)]:
+            self.remove_edge(label, target)
+        for source in [self._labels[s] for s, _ in self._in_edges(node)]:
+            self.remove_edge(source, label)
+        del self._ids[label]
+        self._labels[node] = None
+        for column in self._columns.values():
+            column[node] = _MISSING
+
+    def successors(self, label) -> list:
+        """
+        Returns the labels of the endpoints of a node's outgoing edges.
+        """
+        return [self._labels[target] for target, _ in self._out_edges(self._ids[label])]
+
+    def predecessors(self, label) -> list:
+        """
+        Returns the labels of the origins of a node's incoming edges.
+        """
+        return [self._labels[source] for source, _ in self._in_edges(self._ids[label])]
+
+    def predecessors_by_kind(self, label) -> dict:
+        """
+        Returns the labels of the origins of a node's incoming edges, grouped by
+        edge kind. Each group is read straight from its kind's reverse CSR partition.
+
+        Args:
+            label: The node label.
+
+        Returns:
+            dict: Maps edge kinds to lists of origin labels.
+        """
+        grouped = {}
+        for source, kind in self._in_edges(self._ids[label]):
+            grouped.setdefault(self._kinds[kind], []).append(self._labels[source])
+        return grouped
+
+    def successors_by_kind(self, label) -> dict:
+        """
+        Returns the labels of the endpoints of a node's outgoing edges, grouped by
+        edge kind. Each group is read straight from its kind's CSR partition.
+
+        Args:
+            label: The node label.
+
+        Returns:
+            dict: Maps edge kinds to lists of endpoint labels.
+        """
+        grouped = {}
+        for target, kind in self._out_edges(self._ids[label]):
+            grouped.setdefault(self._kinds[kind], []).append(self._labels[target])
+        return grouped
+
+    def edge_arrays(self) -> tuple:
+        """
+        Returns every live edge as integer id arrays, merging the pending buffer
+        into the CSR arrays first.
+
+        Returns:
+            tuple: The (source ids, target ids) arrays; ids index the node labels,
+            see labels_by_id.
+        """
+        if self._pending_count or self._tombstones:
+            self._merge()
+        sources, targets = [np.zeros(0, np.int32)], [np.zeros(0, np.int32)]
+        for indptr, indices in self._out.values():
+            sources.append(
+                np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+            )
+            targets.append(indices)
+        return np.concatenate(sources), np.concatenate(targets)
+
+    def labels_by_id(self) -> list:
+        """
+        Returns the node labels indexed by integer id, with None for removed nodes.
+        """
+        return self._labels
+
+    def memory_usage(self) -> int:
+        """
+        Approximates the bytes used by the graph's structures, counting the arrays,
+        lists and dicts it owns but not the label and attribute values themselves.
+
+        Returns:
+            int: The approximate size in bytes.
+        """
+        size = sys.getsizeof(self._ids) + sys.getsizeof(self._labels)
+        size += sum(sys.getsizeof(column) for column in self._columns.values())
+        for arrays in (*self._out.values(), *self._in.values()):
+            size += sum(array.nbytes for array in arrays)
+        size += sys.getsizeof(self._pending_out) + sys.getsizeof(self._pending_in)
+        for pending in self._pending_out.values():
+            size += sys.getsizeof(pending) + sum(sys.getsizeof(p) for p in pending)
+        size += sum(sys.getsizeof(pending) for pending in self._pending_in.values())
+        size += sys.getsizeof(self._edge_extras) + sum(
+            sys.getsizeof(extras) for extras in self._edge_extras.values()
+        )
+        return size + sys.getsizeof(self._tombstones)
+
+    # -- Internals -------------------------------------------------------------
+
+    def _new_node(self, label) -> int:
+        node = len(self._labels)
+        if isinstance(label, str):
+            label = sys.intern(label)
+        self._ids[label] = node
+        self._labels.append(label)
+        for column in self._columns.values():
+            column.append(_MISSING)
+        return node
+
+    def _set_attribute(self, node: int, name: str, value) -> None:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = [_MISSING] * len(self._labels)
+        if isinstance(value, str) and len(value) < 64:
+            value = sys.intern(value)
+        column[node] = value
+
+    def _kind_id(self, kind) -> int:
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self._kind_ids[kind] = len(self._kinds)
+            self._kinds.append(kind)
+        return kind_id
+
+    def _base_row(self, arrays: dict, kind: int, node: int):
+        indptr, indices = arrays[kind]
+        if node >= len(indptr) - 1:
+            return indices[:0]
+        return indices[indptr[node] : indptr[node + 1]]
+
+    def _out_edges(self, source: int):
+        """
+        Yields (target id, kind id) pairs for a node's live outgoing edges.
+        """
+        for kind in self._out:
+            for target in self._base_row(self._out, kind, source).tolist():
+                if (source, target) not in self._tombstones:
+                    yield target, kind
+        for target, kind in self._pending_out.get(source, ()):
+            yield target, kind
+
+    def _in_edges(self, target: int):
+        """
+        Yields (source id, kind id) pairs for a node's live incoming edges.
+        """
+        for kind in self._in:
+            for source in self._base_row(self._in, kind, target).tolist():
+                if (source, target) not in self._tombstones:
+                    yield source, kind
+        for source in self._pending_in.get(target, ()):
+            for pending_target, kind in self._pending_out[source]:
+                if pending_target == target:
+                    yield source, kind
+
+    def _find_edge(self, source: int, target: int):
+        """
+        Returns the kind id of the edge between two nodes, or None if there is none.
+        """
+        for pending_target, kind in self._pending_out.get(source, ()):
+            if pending_target == target:
+                return kind
+        if source >= self._base_nodes or (source, target) in self._tombstones:
+            return None
+        for kind in self._out:
+            row = self._base_row(self._out, kind, source)
+            if len(row) and target in row:
+                return kind
+        return None
+
+    def _drop_edge(self, source: int, target: int, kind: int) -> None:
+        pending = self._pending_out.get(source, [])
+        for i, (pending_target, _) in enumerate(pending):
+            if pending_target == target:
+                del pending[i]
+                self._pending_in[target].discard(source)
+                self._pending_count -= 1
+                return
+        self._tombstones.add((source, target))
+
+    def _set_edge(self, source: int, target: int, existing, attributes: dict) -> None:
+        """
+        Sets all the attributes of an edge, moving it to the partition of its kind.
+
+        A label equal to the kind is implied by the partition; a missing label on
+        an edge with a kind is recorded as _MISSING in the side table.
+        """
+        extras = dict(attributes)
+        kind_name = extras.pop("kind", None)
+        kind = self._kind_id(kind_name)
+        if existing != kind:
+            if existing is not None:
+                self._drop_edge(source, target, existing)
+            self._pending_out.setdefault(source, []).append([target, kind])
+            self._pending_in.setdefault(target, set()).add(source)
+            self._pending_count += 1
+        if kind_name is not None:
+            label = extras.pop("label", _MISSING)
+            if label != kind_name:
+                extras["label"] = label
+        if extras:
+            self._edge_extras[(source, target)] = extras
+        else:
+            self._edge_extras.pop((source, target), None)
+
+    def _edge_attributes(self, source: int, target: int, kind: int) -> dict:
+        kind_name = self._kinds[kind]
+        attributes = {"label": kind_name, "kind": kind_name} if kind_name else {}
+        extras = self._edge_extras.get((source, target))
+        if extras:
+            attributes.update(extras)
+            if attributes.get("label") is _MISSING:
+                del attributes["label"]
+        return attributes
+
+    def _maybe_merge(self) -> None:
+        if self._merge_deferred:
+            return
+        threshold = max(MERGE_MIN_PENDING, MERGE_PENDING_RATIO * self._edge_count)
+        if self._pending_count + len(self._tombstones) > threshold:
+            self._merge()
+
+    def _merge(self) -> None:
+        """
+        Rebuilds the CSR arrays from their live entries plus the pending buffer.
+        """
+        node_count = len(self._labels)
+        sources, targets, kinds = [], [], []
+        for kind in self._out:
+            indptr, indices = self._out[kind]
+            row_sources = np.repeat(
+                np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr)
+            )
+            if self._tombstones:
+                keep = np.fromiter(
+                    (
+                        (s, t) not in self._tombstones
+                        for s, t in zip(row_sources.tolist(), indices.tolist())
+                    ),
+                    dtype=bool,
+                    count=len(indices),
+                )
+                row_sources, indices = row_sources[keep], indices[keep]
+            sources.append(row_sources)
+            targets.append(indices)
+            kinds.append(np.full(len(indices), kind, dtype=np.int32))
+        pending = [
+            (source, target, kind)
+            for source, edges in self._pending_out.items()
+            for target, kind in edges
+        ]
+        if pending:
+            pending_array = np.array(pending, dtype=np.int32)
+            sources.append(pending_array[:, 0])
+            targets.append(pending_array[:, 1])
+            kinds.append(pending_array[:, 2])
+
+        all_sources = np.concatenate(sources) if sources else np.zeros(0, np.int32)
+        all_targets = np.concatenate(targets) if targets else np.zeros(0, np.int32)
+        all_kinds = np.concatenate(kinds) if kinds else np.zeros(0, np.int32)
+        self._out, self._in = {}, {}
+        for kind in range(len(self._kinds)):
+            mask = all_kinds == kind
+            self._out[kind] = _csr(all_sources[mask], all_targets[mask], node_count)
+            self._in[kind] = _csr(all_targets[mask], all_sources[mask], node_count)
+        self._base_nodes = node_count
+        self._pending_out, self._pending_in = {}, {}
+        self._pending_count = 0
+        self._tombstones = set()
+
+
+def _csr(rows: np.ndarray, columns: np.ndarray, row_count: int):
+    """
+    Builds (indptr, indices) CSR arrays from coordinate lists.
+    """
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=indptr[1:])
+    return indptr, columns[order].astype(np.int32)
+
+
+class _NodeAttributes(MutableMapping):
+    """
+    A dict-like view of one node's attributes, read from and written to the columns.
+    """
+
+    __slots__ = ("_graph", "_node")
+
+    def __init__(self, graph: CSRDiGraph, node: int):
+        self._graph = graph
+        self._node = node
+
+    def __getitem__(self, name):
+        column = self._graph._columns.get(name)
+        if column is None or column[self._node] is _MISSING:
+            raise KeyError(name)
+        return column[self._node]
+
+    def __setitem__(self, name, value):
+        self._graph._set_attribute(self._node, name, value)
+
+    def __delitem__(self, name):
+        self[name]
+        self._graph._columns[name][self._node] = _MISSING
+
+    def __iter__(self):
+        node = self._node
+        for name, column in self._graph._columns.items():
+            if column[node] is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _EdgeAttributes(MutableMapping):
+    """
+    A dict-like view of one edge's attributes; changes are written back to the graph.
+    """
+
+    __slots__ = ("_graph", "_source", "_target")
+
+    def __init__(self, graph: CSRDiGraph, source: int, target: int):
+        self._graph = graph
+        self._source = source
+        self._target = target
+
+    def _attributes(self) -> tuple:
+        graph = self._graph
+        kind = graph._find_edge(self._source, self._target)
+        if kind is None:
+            raise KeyError((self._source, self._target))
+        return kind, graph._edge_attributes(self._source, self._target, kind)
+
+    def __getitem__(self, name):
+        return self._attributes()[1][name]
+
+    def __setitem__(self, name, value):
+        kind, attributes = self._attributes()
+        attributes[name] = value
+        self._graph._set_edge(self._source, self._target, kind, attributes)
+        self._graph._maybe_merge()
+
+    def __delitem__(self, name):
+        kind, attributes = self._attributes()
+        del attributes[name]
+        self._graph._set_edge(self._source, self._target, kind, attributes)
+        self._graph._maybe_merge()
+
+    def __iter__(self):
+        return iter(self._attributes()[1])
+
+    def __len__(self):
+        return len(self._attributes()[1])
+
+    def __repr__(self):
+        return repr(self._attributes()[1])
+
+
+class _NodeView(Mapping, Set):
+    """
+    A read-only view of the nodes, mirroring networkx's NodeView.
+    """
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: CSRDiGraph):
+        self._graph = graph
+
+    def __getitem__(self, label):
+        return _NodeAttributes(self._graph, self._graph._ids[label])
+
+    def __contains__(self, label):
+        return label in self._graph._ids
+
+    def __iter__(self):
+        return iter(self._graph._ids)
+
+    def __len__(self):
+        return len(self._graph._ids)
+
+    def __call__(self, data=False, default=None):
+        if data is False:
+            return self
+        if data is True:
+            return [(label, self[label]) for label in self]
+        return [(label, self[label].get(data, default)) for label in self]
+
+    __eq__ = Mapping.__eq__
+    __hash__ = None
+
+    def __repr__(self):
+        return f"NodeView({tuple(self)})"
+
+
+class _EdgeView(Mapping):
+    """
+    A view of the edges, mirroring networkx's OutEdgeView. Like in networkx,
+    the attributes returned by edges[u, v] can be changed in place; the
+    attribute dicts yielded by edges(data=True) are copies.
+    """
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: CSRDiGraph):
+        self._graph = graph
+
+    def __getitem__(self, edge):
+        graph = self._graph
+        source, target = graph._ids[edge[0]], graph._ids[edge[1]]
+        if graph._find_edge(source, target) is None:
+            raise KeyError(edge)
+        return _EdgeAttributes(graph, source, target)
+
+    def __contains__(self, edge):
+        try:
+            source, target = edge
+            source, target = self._graph._ids[source], self._graph._ids[target]
+        except (KeyError, TypeError, ValueError):
+            return False
+        return self._graph._find_edge(source, target) is not None
+
+    def _iter_ids(self):
+        graph = self._graph
+        for source, label in enumerate(graph._labels):
+            if label is not None:
+                for target, kind in graph._out_edges(source):
+                    yield source, target, kind
+
+    def __iter__(self):
+        labels = self._graph._labels
+        for source, target, _ in self._iter_ids():
+            yield labels[source], labels[target]
+
+    def __len__(self):
+        return self._graph._edge_count
+
+    def __call__(self, data=False, default=None):
+        if data is False:
+            return self
+        graph = self._graph
+        labels = graph._labels
+        result = []
+        for source, target, kind in self._iter_ids():
+            attributes = graph._edge_attributes(source, target, kind)
+            value = attributes if data is True else attributes.get(data, default)
+            result.append((labels[source], labels[target], value))
+        return result
+
+    def __repr__(self):
+        return f"OutEdgeView({list(self)})"
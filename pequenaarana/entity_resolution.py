@@ -0,0 +1,160 @@
+import re
+import zlib
+
+import numpy as np
+
+from pequenaarana.skill_index import SkillVocabulary
+
+LEGAL_SUFFIXES = {
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "gmbh",
+    "inc",
+    "incorporated",
+    "limited",
+    "llc",
+    "ltd",
+    "plc",
+    "sa",
+}
+SHINGLE_SIZE = 3
+MINHASH_BANDS = 5
+MINHASH_ROWS = 4
+BLOCK_WINDOW = 50
+TYPO_MIN_LENGTH = 5
+
+_MINHASH_PRIME = 4294967311
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+")
+
+
+def normalize_label(label: str) -> str:
+    """
+    Reduces a label to the form duplicates share: lower case, without punctuation
+    and without a trailing legal suffix, so that "Acme, Inc." becomes "acme".
+
+    Args:
+        label (str): The label to normalize.
+
+    Returns:
+        str: The normalized label, or the lower-cased label if nothing else is left.
+    """
+    words = _WORD.findall(label.casefold())
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words) or label.casefold().strip()
+
+
+def find_duplicates(labels, threshold: float = 0.8) -> list:
+    """
+    Groups labels that probably name the same entity, without comparing every pair.
+
+    Labels with the same normalized form are grouped directly. Normalized forms
+    are then blocked twice: by MinHash locality-sensitive hashing over their
+    character trigrams, and by their sorted letters, which catches transposed
+    letters ("Madird"). Only forms sharing a block are compared, within a
+    sliding window of BLOCK_WINDOW neighbours so that a crowded block stays
+    linear. A pair is confirmed when both forms contain the same numbers ("Team
+    1" is not "Team 2") and either the Jaccard similarity of their trigrams
+    reaches the threshold or, for forms of at least TYPO_MIN_LENGTH characters,
+    they are a single edit apart.
+
+    Args:
+        labels (iterable): The labels to resolve, e.g. every ORGANIZATION node.
+        threshold (float, optional): The trigram Jaccard similarity at which two
+            normalized labels are considered the same. Defaults to 0.8.
+
+    Returns:
+        list: Sorted lists of two or more labels, one per group of duplicates.
+    """
+    by_key = {}
+    for label in labels:
+        by_key.setdefault(normalize_label(label), []).append(label)
+    keys = list(by_key)
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingles = [_shingles(key) for key in keys]
+    numbers = [_NUMBER.findall(key) for key in keys]
+    for i, j in _candidate_pairs(keys, shingles):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j or numbers[i] != numbers[j]:
+            continue
+        common = len(shingles[i] & shingles[j])
+        larger = max(len(shingles[i]), len(shingles[j]))
+        # A single edit changes at most four trigrams, so the costly edit distance
+        # is only computed for pairs that nearly share their trigrams already.
+        if common >= threshold * (len(shingles[i]) + len(shingles[j]) - common) or (
+            min(len(keys[i]), len(keys[j])) >= TYPO_MIN_LENGTH
+            and abs(len(keys[i]) - len(keys[j])) <= 1
+            and common >= larger - 4
+            and SkillVocabulary.edit_distance(keys[i], keys[j], 1) <= 1
+        ):
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(i), []).extend(by_key[key])
+    return sorted(sorted(group) for group in groups.values() if len(group) > 1)
+
+
+def _shingles(key: str) -> set:
+    padded = f" {key} "
+    return {
+        padded[i : i + SHINGLE_SIZE]
+        for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))
+    }
+
+
+def _candidate_pairs(keys: list, shingles: list):
+    """
+    Yields the (i, j) index pairs, i < j, of normalized labels sharing a block:
+    a band of their MinHash signatures or their sorted letters. Within each
+    block, labels are paired with their next BLOCK_WINDOW neighbours.
+    """
+    if len(keys) < 2:
+        return
+    lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(keys))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    flattened = [shingle for s in shingles for shingle in s]
+    codes = {shingle: zlib.crc32(shingle.encode()) for shingle in set(flattened)}
+    hashes = np.fromiter(
+        map(codes.__getitem__, flattened), dtype=np.uint64, count=len(flattened)
+    )
+    rng = np.random.default_rng(0)
+    permutations = MINHASH_BANDS * MINHASH_ROWS
+    a = rng.integers(1, 2**32, size=(permutations, 1), dtype=np.uint64)
+    b = rng.integers(0, 2**32, size=(permutations, 1), dtype=np.uint64)
+    signatures = np.minimum.reduceat((a * hashes + b) % _MINHASH_PRIME, offsets, axis=1)
+
+    blockings = []
+    for band in range(MINHASH_BANDS):
+        rows = np.ascontiguousarray(
+            signatures[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS].T
+        )
+        buckets = rows.view(np.dtype((np.void, rows.dtype.itemsize * MINHASH_ROWS)))
+        blockings.append(np.unique(buckets.ravel(), return_inverse=True)[1])
+    letters = ["".join(sorted(key.replace(" ", ""))) for key in keys]
+    blockings.append(np.unique(letters, return_inverse=True)[1])
+
+    pairs = []
+    for block_of in blockings:
+        order = np.argsort(block_of, kind="stable")
+        sorted_blocks = block_of[order]
+        for offset in range(1, BLOCK_WINDOW + 1):
+            same = np.flatnonzero(sorted_blocks[offset:] == sorted_blocks[:-offset])
+            if not len(same):
+                break
+            first, second = order[same], order[same + offset]
+            pairs.append(
+                np.minimum(first, second) * len(keys) + np.maximum(first, second)
+            )
+    for pair in np.unique(np.concatenate(pairs)).tolist() if pairs else []:
+        yield divmod(pair, len(keys))
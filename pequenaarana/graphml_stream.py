@@ -0,0 +1,276 @@
+import gzip
+import io
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+GRAPHML_NS = "{http://graphml.graphdrawing.org/xmlns}"
+
+GRAPHML_TYPES = {
+    "boolean": lambda text: text.strip().lower() in ("true", "1"),
+    "int": int,
+    "long": int,
+    "float": float,
+    "double": float,
+    "string": str,
+}
+
+PYTHON_TYPES = {bool: "boolean", int: "long", float: "double", str: "string"}
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def iter_graphml(filename: Path, progress=None, progress_interval: int = 10000):
+    """
+    Incrementally parses a GraphML file, yielding its contents element by element.
+
+    Each node and edge element is discarded as soon as it has been decoded, so
+    memory use does not grow with the size of the document. Gzip-compressed
+    files (e.g. .graphml.gz) are decompressed transparently.
+
+    Args:
+        filename (Path): The path to the GraphML file.
+        progress (callable, optional): Called as progress(bytes_read, total_bytes)
+            every progress_interval elements and once at the end. Raising from it
+            aborts the import.
+        progress_interval (int, optional): Nodes and edges between progress calls.
+            Defaults to 10000.
+
+    Yields:
+        tuple: ("graph", attributes) for graph-level data, ("node", id, attributes)
+        for each node and ("edge", source, target, attributes) for each edge.
+    """
+    keys = {}
+    defaults = {"node": {}, "edge": {}}
+    stack = []
+    elements = 0
+    total_bytes = os.path.getsize(filename)
+    with open(filename, "rb") as raw_file, _maybe_gunzip(raw_file) as graphml_file:
+        for event, elem in ET.iterparse(graphml_file, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            tag = elem.tag
+            if tag == f"{GRAPHML_NS}key":
+                name = elem.get("attr.name", elem.get("id"))
+                convert = GRAPHML_TYPES.get(elem.get("attr.type", "string"), str)
+                keys[elem.get("id")] = (name, convert)
+                default = elem.find(f"{GRAPHML_NS}default")
+                if default is not None and default.text is not None:
+                    domain = elem.get("for")
+                    for target in ("node", "edge") if domain == "all" else (domain,):
+                        if target in defaults:
+                            defaults[target][name] = convert(default.text)
+            elif (
+                tag == f"{GRAPHML_NS}data"
+                and stack
+                and stack[-1].tag == f"{GRAPHML_NS}graph"
+            ):
+                yield ("graph", _decode_data(keys, [elem]))
+                stack[-1].remove(elem)
+            elif tag in (f"{GRAPHML_NS}node", f"{GRAPHML_NS}edge"):
+                attributes = _decode_data(keys, elem.iter(f"{GRAPHML_NS}data"))
+                if tag == f"{GRAPHML_NS}node":
+                    yield ("node", elem.get("id"), defaults["node"] | attributes)
+                else:
+                    yield (
+                        "edge",
+                        elem.get("source"),
+                        elem.get("target"),
+                        defaults["edge"] | attributes,
+                    )
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+                elements += 1
+                if progress and elements % progress_interval == 0:
+                    progress(raw_file.tell(), total_bytes)
+        if progress:
+            progress(total_bytes, total_bytes)
+
+
+def _decode_data(keys: dict, data_elements) -> dict:
+    """
+    Converts <data> elements into an attribute dictionary using the declared keys.
+
+    Args:
+        keys (dict): Maps key ids to (attribute name, converter) tuples.
+        data_elements (iterable): The <data> elements to decode.
+
+    Returns:
+        dict: The decoded attributes. Empty elements decode to "" for string keys
+        and are ignored otherwise.
+    """
+    attributes = {}
+    for data in data_elements:
+        key = data.get("key")
+        if key not in keys:
+            raise ValueError(f"Bad GraphML data: no key {key}")
+        if len(data) == 0:
+            name, convert = keys[key]
+            if data.text is not None:
+                attributes[name] = convert(data.text)
+            elif convert is str:
+                attributes[name] = ""
+    return attributes
+
+
+def _maybe_gunzip(raw_file):
+    """
+    Wraps a binary file in a gzip decompressor if it starts with the gzip magic number.
+
+    Args:
+        raw_file (file): A binary file positioned at its start.
+
+    Returns:
+        file: A binary file object yielding the uncompressed content; raw_file itself
+            if it is not compressed.
+    """
+    if raw_file.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=raw_file, mode="rb")
+    return raw_file
+
+
+def write_graphml(
+    path: Path,
+    graph_attributes: dict,
+    nodes,
+    edges,
+    compress: bool = None,
+    progress=None,
+    progress_interval: int = 10000,
+) -> None:
+    """
+    Writes a graph to a GraphML file element by element.
+
+    Nothing but the distinct attribute names and types is collected before
+    writing, so memory use does not grow with the size of the graph.
+
+    Args:
+        path (Path): The path of the file to write.
+        graph_attributes (dict): Graph-level attributes.
+        nodes (iterable): (id, attributes) tuples. Must be iterable twice.
+        edges (iterable): (source, target, attributes) tuples. Must be iterable twice.
+        compress (bool, optional): Whether to gzip the output. Defaults to True
+            for paths ending in ".gz".
+        progress (callable, optional): Called as progress(elements_written, total_elements)
+            every progress_interval nodes and edges and once at the end. Raising
+            from it aborts the export.
+        progress_interval (int, optional): Nodes and edges between progress calls.
+            Defaults to 10000.
+
+    Returns:
+        None
+    """
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    counts = {"node": 0, "edge": 0}
+
+    def counted(domain, attribute_dicts):
+        for attributes in attribute_dicts:
+            counts[domain] += 1
+            yield attributes
+
+    keys = {
+        "graph": _declare_keys([graph_attributes]),
+        "node": _declare_keys(counted("node", (a for _, a in nodes))),
+        "edge": _declare_keys(counted("edge", (a for _, _, a in edges))),
+    }
+    total = counts["node"] + counts["edge"]
+    written = 0
+    key_ids = {}
+    opener = gzip.open if compress else open
+    with opener(path, "wb") as binary_file, io.TextIOWrapper(
+        binary_file, encoding="utf-8", newline="\n"
+    ) as out:
+        out.write(
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+            'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+        )
+        for domain, declared in keys.items():
+            key_ids[domain] = {}
+            for name, graphml_type in declared.items():
+                key_id = f"d{sum(len(ids) for ids in key_ids.values())}"
+                key_ids[domain][name] = key_id
+                out.write(
+                    f"  <key id={quoteattr(key_id)} for={quoteattr(domain)} "
+                    f"attr.name={quoteattr(name)} attr.type={quoteattr(graphml_type)} />\n"
+                )
+        out.write('  <graph edgedefault="directed">\n')
+        out.write(_data_elements(key_ids["graph"], graph_attributes, "    "))
+        for node_id, attributes in nodes:
+            out.write(
+                f"    <node id={quoteattr(str(node_id))}>\n"
+                f"{_data_elements(key_ids['node'], attributes, '      ')}"
+                "    </node>\n"
+            )
+            written += 1
+            if progress and written % progress_interval == 0:
+                progress(written, total)
+        for source, target, attributes in edges:
+            out.write(
+                f"    <edge source={quoteattr(str(source))} "
+                f"target={quoteattr(str(target))}>\n"
+                f"{_data_elements(key_ids['edge'], attributes, '      ')}"
+                "    </edge>\n"
+            )
+            written += 1
+            if progress and written % progress_interval == 0:
+                progress(written, total)
+        out.write("  </graph>\n</graphml>\n")
+    if progress:
+        progress(total, total)
+
+
+def _declare_keys(attribute_dicts) -> dict:
+    """
+    Collects the GraphML type of every attribute name used by a group of elements.
+
+    Attributes that hold values of different types are declared as strings.
+
+    Args:
+        attribute_dicts (iterable): The attribute dictionaries of the elements.
+
+    Returns:
+        dict: Maps attribute names to GraphML type names, in order of first use.
+    """
+    declared = {}
+    for attributes in attribute_dicts:
+        for name, value in attributes.items():
+            if value is None:
+                continue
+            graphml_type = PYTHON_TYPES.get(type(value), "string")
+            if declared.setdefault(name, graphml_type) != graphml_type:
+                declared[name] = "string"
+    return declared
+
+
+def _data_elements(key_ids: dict, attributes: dict, indent: str) -> str:
+    """
+    Renders the <data> elements of a single graph, node or edge.
+
+    Args:
+        key_ids (dict): Maps attribute names to their key ids.
+        attributes (dict): The attributes to render.
+        indent (str): The indentation to put in front of each element.
+
+    Returns:
+        str: The rendered elements, one per line.
+    """
+    return "".join(
+        f"{indent}<data key={quoteattr(key_ids[name])}>"
+        f"{escape(_format_value(value))}</data>\n"
+        for name, value in attributes.items()
+        if value is not None
+    )
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
@@ -0,0 +1,577 @@
+import logging
+from pequenaarana.skill_index import SkillIndex
+
+UNDO_LIMIT = 100
+
+
+class GraphDelta:
+    """
+    The states some nodes and edges of a graph had at one point in time: the
+    reverse of the changes made since.
+
+    A state is a copy of the element's attributes, or None if it did not exist.
+    Only the first state recorded for an element is kept, so a delta costs memory
+    in proportion to the number of elements changed, not to the size of the graph.
+    Wholesale replacements of the graph (clear) keep the replaced graph object.
+
+    Attributes:
+        nodes (dict): Maps node labels to their attributes, or None.
+        edges (dict): Maps (origin, endpoint) pairs to the edge's attributes, or None.
+        graph: The internal graph replaced by a new one, or None.
+
+    Methods:
+        preserve(self, graph, nodes=(), edges=()) -> None: Records the states of elements about to change.
+        apply(self, graph, undo: bool) -> tuple: Sets every recorded state, returning the delta reversing that.
+    """
+
+    def __init__(self, nodes: dict = None, edges: dict = None, graph=None):
+        self.nodes = {} if nodes is None else nodes
+        self.edges = {} if edges is None else edges
+        self.graph = graph
+
+    def __bool__(self):
+        return bool(self.nodes or self.edges or self.graph is not None)
+
+    def __len__(self):
+        return len(self.nodes) + len(self.edges)
+
+    def preserve(self, graph, nodes=(), edges=()) -> None:
+        """
+        Records the current states of nodes and edges about to change, unless an
+        earlier state of theirs was already recorded.
+
+        Args:
+            graph (nx.DiGraph or CSRDiGraph): The graph the elements belong to.
+            nodes (iterable, optional): Node labels. Defaults to ().
+            edges (iterable, optional): (origin, endpoint) pairs. Defaults to ().
+
+        Returns:
+            None
+        """
+        for label in nodes:
+            if label not in self.nodes:
+                self.nodes[label] = node_state(graph, label)
+        for edge in edges:
+            if edge not in self.edges:
+                self.edges[edge] = edge_state(graph, *edge)
+
+    def apply(self, graph, undo: bool) -> tuple:
+        """
+        Sets every recorded state, returning the delta that reverses this.
+
+        When the delta also replaced the graph, undoing sets the element states on
+        the current graph before swapping the replaced graph back, and redoing
+        swaps first, mirroring the order in which the change was made.
+
+        Args:
+            graph (nx.DiGraph or CSRDiGraph): The current graph.
+            undo (bool): Whether the delta is being undone rather than redone.
+
+        Returns:
+            tuple: The graph to use from now on, and the reverse GraphDelta.
+        """
+        reverse = GraphDelta()
+        if self.graph is not None and not undo:
+            graph, reverse.graph = self.graph, graph
+        reverse.nodes = {label: node_state(graph, label) for label in self.nodes}
+        reverse.edges = {edge: edge_state(graph, *edge) for edge in self.edges}
+        set_states(graph, self.nodes, self.edges)
+        if self.graph is not None and undo:
+            graph, reverse.graph = self.graph, graph
+        return graph, reverse
+
+
+def node_state(graph, label) -> dict:
+    """
+    Returns a copy of a node's attributes, or None if the graph has no such node.
+    """
+    return dict(graph.nodes[label]) if label in graph.nodes else None
+
+
+def edge_state(graph, origin, endpoint) -> dict:
+    """
+    Returns a copy of an edge's attributes, or None if the graph has no such edge.
+    """
+    edges = graph.edges
+    return dict(edges[origin, endpoint]) if (origin, endpoint) in edges else None
+
+
+def set_states(graph, nodes: dict, edges: dict) -> None:
+    """
+    Sets nodes and edges to the given states, adding, updating or removing them.
+
+    Nodes that must exist are set first and nodes that must not exist are removed
+    last, so that restored edges always have their endpoints.
+
+    Args:
+        graph (nx.DiGraph or CSRDiGraph): The graph to change.
+        nodes (dict): Maps node labels to their attributes, or None to remove them.
+        edges (dict): Maps (origin, endpoint) pairs to attributes, or None to remove them.
+
+    Returns:
+        None
+    """
+    for label, state in nodes.items():
+        if state is not None:
+            if label in graph.nodes:
+                graph.nodes[label].clear()
+            graph.add_node(label, **state)
+    for (origin, endpoint), state in edges.items():
+        if (origin, endpoint) in graph.edges:
+            graph.remove_edge(origin, endpoint)
+        if state is not None:
+            graph.add_edge(origin, endpoint, **state)
+    for label, state in nodes.items():
+        if state is None and label in graph.nodes:
+            graph.remove_node(label)
+
+
+class GraphHistory:
+    """
+    Undo and redo stacks of GraphDelta, one per operation on a ConnectionGraph.
+
+    Operations may call other operations (add_person calls add_node and add_edge);
+    begin and end calls nest, and only the outermost operation becomes an undo
+    step. Undoing a step applies its delta and pushes the reverse delta onto the
+    redo stack, and the other way round, so each step stores the states of the
+    elements it changed only once.
+
+    Attributes:
+        limit (int): The maximum number of undo steps kept.
+        _undo (list): The deltas undoing each step, most recent last.
+        _redo (list): The deltas redoing each undone step, most recent last.
+        _pending (GraphDelta): The delta of the operation in progress, or None.
+        _depth (int): The nesting depth of the operations in progress.
+
+    Methods:
+        begin(self) -> None: Starts an operation.
+        end(self) -> None: Ends an operation, pushing its delta onto the undo stack.
+        preserve(self, graph, nodes=(), edges=()) -> None: Records the states of elements about to change.
+        replace_graph(self, graph) -> None: Records that the graph is being replaced wholesale.
+        pop(self, undo: bool) -> GraphDelta: Takes the next step to undo or redo.
+        push(self, delta: GraphDelta, undo: bool) -> None: Stores the reverse of an undone or redone step.
+    """
+
+    def __init__(self, limit: int = UNDO_LIMIT):
+        self.limit = limit
+        self._undo = []
+        self._redo = []
+        self._pending = None
+        self._depth = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def begin(self) -> None:
+        """
+        Starts an operation, or a nested one.
+        """
+        if not self._depth:
+            self._pending = GraphDelta()
+        self._depth += 1
+
+    def end(self) -> None:
+        """
+        Ends an operation. Once the outermost one ends, its delta becomes an undo
+        step if anything changed, and the redo stack is emptied.
+        """
+        self._depth -= 1
+        if not self._depth:
+            if self._pending:
+                self._undo.append(self._pending)
+                del self._undo[: -self.limit or len(self._undo)]
+                self._redo.clear()
+            self._pending = None
+
+    def preserve(self, graph, nodes=(), edges=()) -> None:
+        """
+        Records the states of elements about to change, see GraphDelta.preserve.
+        Does nothing outside an operation.
+        """
+        if self._pending is not None:
+            self._pending.preserve(graph, nodes, edges)
+
+    def replace_graph(self, graph) -> None:
+        """
+        Records that the current graph is being replaced by a new one, e.g. by clear.
+
+        Args:
+            graph (nx.DiGraph or CSRDiGraph): The graph being replaced; it must not be changed afterwards.
+        """
+        if self._pending is not None and self._pending.graph is None:
+            self._pending.graph = graph
+
+    def pop(self, undo: bool) -> GraphDelta:
+        """
+        Takes the most recent step off the undo or redo stack.
+
+        Args:
+            undo (bool): Whether to take from the undo stack rather than the redo stack.
+
+        Returns:
+            GraphDelta: The delta to apply, or None if the stack is empty.
+        """
+        stack = self._undo if undo else self._redo
+        return stack.pop() if stack else None
+
+    def push(self, delta: GraphDelta, undo: bool) -> None:
+        """
+        Stores the reverse of a step that was just undone (onto the redo stack) or
+        redone (onto the undo stack).
+
+        Args:
+            delta (GraphDelta): The reverse delta returned by GraphDelta.apply.
+            undo (bool): Whether the step was undone.
+        """
+        (self._redo if undo else self._undo).append(delta)
+
+
+class GraphView:
+    """
+    A read-only view of a graph as it was when the view was taken, while the
+    graph itself keeps changing.
+
+    The view shares every element with the live graph, copy-on-write: before an
+    element of the graph changes, the graph hands its old state to the view
+    through preserve, so a view costs memory in proportion to the changes made
+    since it was taken. When the graph is replaced wholesale (e.g. by clear),
+    the view keeps reading from the replaced graph, which is left untouched.
+
+    Besides the raw nodes and edges, the view answers the read-only person
+    queries of ConnectionGraph (skill search, profiles, reverse lookups and
+    filters) as of when it was taken. The live graph's indexes describe its
+    current state, so the view builds its own skill index on its first skill
+    query; since the view never changes, that index never goes stale.
+
+    Attributes:
+        name (str): The name the view was taken under.
+        generation (int): The version of the graph the view shows.
+        _graph (nx.DiGraph or CSRDiGraph): The graph the view reads unchanged elements from.
+        _delta (GraphDelta): The states of the elements changed since the view was taken.
+        _successors (dict): Maps origins to the endpoints of their edges in the delta.
+        _predecessors (dict): Maps endpoints to the origins of their edges in the delta.
+        _person_links (dict): Maps profile fields to (node kind, edge kind) pairs, see ConnectionGraph.PERSON_LINKS.
+        _skill_index (SkillIndex): The skills of the view's persons, or None until first needed.
+
+    Methods:
+        preserve(self, graph, nodes=(), edges=()) -> None: Keeps the states of elements about to change.
+        node(self, label) -> dict: Returns a node's attributes.
+        edge(self, origin, endpoint) -> dict: Returns an edge's attributes.
+        nodes(self, data: bool = False): Iterates over the nodes.
+        edges(self, data: bool = False): Iterates over the edges.
+        successors(self, label) -> list: Returns the endpoints of a node's edges.
+        predecessors(self, label) -> list: Returns the origins of the edges into a node.
+        match_skills(self, skill: str, match: str = "exact", max_distance: int = None) -> list: Returns the skills matching a query.
+        persons_with_skill(self, skill: str, match: str = "exact", max_distance: int = None) -> list: Returns the persons with a matching skill.
+        search_person_profiles(self, skill: str, match: str = "exact", max_distance: int = None) -> dict: Returns the profiles of the persons with a matching skill.
+        get_person_profiles(self, names) -> dict: Returns resolved profiles for a batch of persons.
+        people_linked_to(self, target: str) -> set: Returns the persons linked to an organization, place or account.
+        filter_people(self, skills: str = "", place: str = "", org: str = "", account: str = "", match: str = "exact") -> list: Returns the persons meeting every criterion.
+    """
+
+    def __init__(
+        self,
+        graph,
+        name: str = None,
+        generation: int = 0,
+        person_links: dict = None,
+    ):
+        self.name = name
+        self.generation = generation
+        self._graph = graph
+        self._delta = GraphDelta()
+        self._successors = {}
+        self._predecessors = {}
+        self._person_links = {} if person_links is None else person_links
+        self._skill_index = None
+
+    def __contains__(self, label) -> bool:
+        return self.node(label) is not None
+
+    def __len__(self):
+        return sum(1 for _ in self.nodes())
+
+    def preserve(self, graph, nodes=(), edges=()) -> None:
+        """
+        Keeps the states of elements of a graph about to change. Changes to any
+        graph other than the one the view reads from do not concern it.
+
+        Args:
+            graph (nx.DiGraph or CSRDiGraph): The graph about to change.
+            nodes (iterable, optional): Node labels. Defaults to ().
+            edges (iterable, optional): (origin, endpoint) pairs. Defaults to ().
+
+        Returns:
+            None
+        """
+        if graph is not self._graph:
+            return
+        edges = [edge for edge in edges if edge not in self._delta.edges]
+        self._delta.preserve(graph, nodes, edges)
+        for origin, endpoint in edges:
+            self._successors.setdefault(origin, []).append(endpoint)
+            self._predecessors.setdefault(endpoint, []).append(origin)
+
+    def node(self, label) -> dict:
+        """
+        Returns a copy of a node's attributes, or None if the node did not exist.
+        """
+        if label in self._delta.nodes:
+            state = self._delta.nodes[label]
+            return None if state is None else dict(state)
+        return node_state(self._graph, label)
+
+    def edge(self, origin, endpoint) -> dict:
+        """
+        Returns a copy of an edge's attributes, or None if the edge did not exist.
+        """
+        if (origin, endpoint) in self._delta.edges:
+            state = self._delta.edges[origin, endpoint]
+            return None if state is None else dict(state)
+        return edge_state(self._graph, origin, endpoint)
+
+    def nodes(self, data: bool = False):
+        """
+        Iterates over the nodes, as labels or, with data, (label, attributes) tuples.
+        """
+        changed = self._delta.nodes
+        for label in self._graph.nodes:
+            if label not in changed:
+                yield (label, dict(self._graph.nodes[label])) if data else label
+        for label, state in changed.items():
+            if state is not None:
+                yield (label, dict(state)) if data else label
+
+    def edges(self, data: bool = False):
+        """
+        Iterates over the edges, as (origin, endpoint) or, with data,
+        (origin, endpoint, attributes) tuples.
+        """
+        changed = self._delta.edges
+        for edge in self._graph.edges:
+            if edge not in changed:
+                yield (*edge, dict(self._graph.edges[edge])) if data else edge
+        for edge, state in changed.items():
+            if state is not None:
+                yield (*edge, dict(state)) if data else edge
+
+    def successors(self, label) -> list:
+        """
+        Returns the endpoints of a node's edges.
+        """
+        return self._neighbors(label, self._graph.successors, self._successors, False)
+
+    def predecessors(self, label) -> list:
+        """
+        Returns the origins of the edges into a node.
+        """
+        return self._neighbors(
+            label, self._graph.predecessors, self._predecessors, True
+        )
+
+    def _neighbors(self, label, current, changed: dict, incoming: bool) -> list:
+        def edge(other):
+            return (other, label) if incoming else (label, other)
+
+        neighbors = []
+        if label in self._graph.nodes:
+            neighbors = [
+                other
+                for other in current(label)
+                if edge(other) not in self._delta.edges
+            ]
+        neighbors.extend(
+            other
+            for other in changed.get(label, ())
+            if self._delta.edges[edge(other)] is not None
+        )
+        return neighbors
+
+    def match_skills(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ) -> list:
+        """
+        Returns the distinct skills in the view that match a query.
+
+        Args:
+            skill (str): The skill to look for, e.g. "pyhton" or "kube".
+            match (str, optional): "exact", "prefix", "substring" or "fuzzy". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            list: The matching skills, closest matches first.
+        """
+        return self._skills().match_skills(skill, match, max_distance)
+
+    def persons_with_skill(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ) -> list:
+        """
+        Returns the persons in the view having any of the skills that match a query.
+
+        Args:
+            skill (str): The skill to search for.
+            match (str, optional): "exact", "prefix", "substring" or "fuzzy". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            list: The labels of the matching persons, in order of match quality and
+            sorted within each matched skill.
+        """
+        index = self._skills()
+        persons = {}
+        for matched_skill in index.match_skills(skill, match, max_distance):
+            persons.update(dict.fromkeys(sorted(index.get(matched_skill))))
+        return list(persons)
+
+    def search_person_profiles(
+        self, skill: str, match: str = "exact", max_distance: int = None
+    ) -> dict:
+        """
+        Searches the view for persons with a specific skill and returns their profiles.
+
+        Args:
+            skill (str): The skill to search for.
+            match (str, optional): "exact", "prefix", "substring" or "fuzzy". Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            dict: Maps the matching persons to their profiles, see get_person_profiles.
+        """
+        return self.get_person_profiles(
+            self.persons_with_skill(skill, match, max_distance)
+        )
+
+    def get_person_profiles(self, names) -> dict:
+        """
+        Returns fully resolved profiles for a batch of persons, as they were when
+        the view was taken.
+
+        Args:
+            names (iterable): The labels of the PERSON nodes.
+
+        Returns:
+            dict: Maps each name to a profile with "label", "role", "skills" and "notes"
+            strings, and "place", "org" and "account" lists of linked node labels, as
+            ConnectionGraph.get_person_profiles does. Names that were not PERSON nodes
+            are left out.
+        """
+        links = {
+            edge_kind: (field, node_kind)
+            for field, (node_kind, edge_kind) in self._person_links.items()
+        }
+        profiles = {}
+        for name in names:
+            attributes = self.node(name) or {}
+            if attributes.get("kind") != "PERSON":
+                continue
+            profile = {
+                "label": attributes.get("label", name),
+                "role": attributes.get("role") or "",
+                "skills": attributes.get("skills") or "",
+                "notes": attributes.get("notes") or "",
+                **{field: [] for field in self._person_links},
+            }
+            for target in self.successors(name):
+                edge_kind = self.edge(name, target).get("kind")
+                if edge_kind not in links:
+                    continue
+                field, node_kind = links[edge_kind]
+                target_attributes = self.node(target)
+                if target_attributes.get("kind") == node_kind:
+                    profile[field].append(target_attributes.get("label", target))
+            profiles[name] = profile
+        return profiles
+
+    def people_linked_to(self, target: str) -> set:
+        """
+        Returns the persons that were linked to an ORGANIZATION, PLACE or ACCOUNT
+        node through the edge kind the person links assign to it.
+
+        Args:
+            target (str): The label of the organization, place or account.
+
+        Returns:
+            set: The labels of the linked PERSON nodes.
+        """
+        attributes = self.node(target)
+        if attributes is None:
+            return set()
+        edge_kinds = dict(self._person_links.values())
+        kind = attributes.get("kind")
+        if kind not in edge_kinds:
+            logging.error(
+                "Node '%s' of kind %s has no linked persons. Doing nothing.",
+                target,
+                kind,
+            )
+            return set()
+        return {
+            source
+            for source in self.predecessors(target)
+            if self.edge(source, target).get("kind") == edge_kinds[kind]
+            and self.node(source).get("kind") == "PERSON"
+        }
+
+    def filter_people(
+        self,
+        skills: str = "",
+        place: str = "",
+        org: str = "",
+        account: str = "",
+        match: str = "exact",
+    ) -> list:
+        """
+        Returns the persons of the view meeting every given criterion, intersecting
+        the smallest candidate set first as ConnectionGraph.filter_people does.
+
+        Args:
+            skills (str, optional): CSV skills the persons must all have. Defaults to "".
+            place (str, optional): The place they must be based in. Defaults to "".
+            org (str, optional): The organization they must be associated with. Defaults to "".
+            account (str, optional): The account they must be on. Defaults to "".
+            match (str, optional): How to match each skill, see match_skills. Defaults to "exact".
+
+        Returns:
+            list: The labels of the matching persons, sorted. Empty if no criterion is given.
+        """
+        postings = [
+            set(self.persons_with_skill(skill, match))
+            for skill in SkillIndex.split_skills(skills)
+        ]
+        links = {"place": place, "org": org, "account": account}
+        for field, target in links.items():
+            if not target:
+                continue
+            attributes = self.node(target) or {}
+            if attributes.get("kind") == self._person_links[field][0]:
+                postings.append(self.people_linked_to(target))
+            else:
+                postings.append(set())
+        if not postings:
+            return []
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches &= posting
+        return sorted(matches)
+
+    def _skills(self) -> SkillIndex:
+        """
+        Returns the skill index of the view's persons, building it on first use.
+        """
+        if self._skill_index is None:
+            self._skill_index = SkillIndex()
+            self._skill_index.add_many(
+                (label, attributes.get("skills", ""))
+                for label, attributes in self.nodes(data=True)
+                if attributes.get("kind") == "PERSON"
+            )
+        return self._skill_index
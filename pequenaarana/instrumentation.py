@@ -0,0 +1,191 @@
+import atexit
+import functools
+import json
+import math
+import threading
+import time
+from pathlib import Path
+
+_hooks = []
+_hooks_lock = threading.Lock()
+
+
+def instrumented(function):
+    """
+    Makes a function or method an instrumented operation, named after its
+    qualified name (e.g. "ConnectionGraph.add_node" or "load_graph").
+
+    The function is wrapped once, where it is defined, so every reference to it
+    (including names imported with "from ... import") reports to the hooks.
+    While no hook is registered the wrapper only checks that the hook list is
+    empty before calling the function, which adds well under a microsecond.
+
+    Args:
+        function (callable): The function to instrument.
+
+    Returns:
+        callable: The instrumented function.
+    """
+    operation = function.__qualname__
+
+    @functools.wraps(function)
+    def instrumented_function(*args, **kwargs):
+        if not _hooks:
+            return function(*args, **kwargs)
+        hooks = tuple(_hooks)
+        error = None
+        start = time.perf_counter()
+        for _, on_start in hooks:
+            if on_start is not None:
+                on_start(operation, start)
+        try:
+            return function(*args, **kwargs)
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            for hook, _ in hooks:
+                hook(operation, start, seconds, error)
+
+    return instrumented_function
+
+
+def add_hook(hook, on_start=None) -> None:
+    """
+    Registers a hook called around every instrumented operation.
+
+    Hooks are called as hook(operation, start, seconds, error) once the
+    operation finishes, where start is a time.perf_counter() timestamp, seconds
+    the duration and error the exception the operation raised, or None. The
+    optional on_start callback is called as on_start(operation, start) just
+    before the operation runs, e.g. to open a tracing span. Operations calling
+    other operations (e.g. add_person calling add_node) report one span each, so
+    starts nest and the inner operations finish first. Hooks registered while an
+    operation runs only see the operations started afterwards. Hooks may be
+    called from the background worker thread.
+
+    Args:
+        hook (callable): The hook to register.
+        on_start (callable, optional): Called when each operation starts. Defaults to None.
+    """
+    with _hooks_lock:
+        _hooks.append((hook, on_start))
+
+
+def remove_hook(hook) -> None:
+    """
+    Unregisters a hook, along with its start callback.
+
+    Args:
+        hook (callable): The hook to unregister.
+
+    Raises:
+        ValueError: If the hook is not registered.
+    """
+    with _hooks_lock:
+        for i, (registered, _) in enumerate(_hooks):
+            if registered is hook:
+                del _hooks[i]
+                return
+    raise ValueError(f"{hook!r} is not a registered hook.")
+
+
+class OperationStats:
+    """
+    A hook that counts instrumented operations and keeps a latency histogram for each.
+
+    Latencies are bucketed by powers of two microseconds, so the histogram has a
+    fixed, small size however many operations are recorded.
+
+    Attributes:
+        _operations (dict): Per operation, a [count, errors, total_seconds,
+            max_seconds, histogram] list, where the histogram maps the upper
+            bound of each bucket in microseconds to its count.
+        _lock (threading.Lock): Guards _operations against concurrent hooks.
+
+    Methods:
+        as_dict(self) -> dict: Returns the counters, latency summaries and histograms.
+        write_json(self, path: Path) -> None: Writes as_dict to a JSON file.
+    """
+
+    def __init__(self):
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, operation: str, start: float, seconds: float, error) -> None:
+        bucket = 1 << max(0, math.ceil(seconds * 1e6) - 1).bit_length()
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = [0, 0, 0.0, 0.0, {}]
+            stats[0] += 1
+            stats[1] += error is not None
+            stats[2] += seconds
+            stats[3] = max(stats[3], seconds)
+            stats[4][bucket] = stats[4].get(bucket, 0) + 1
+
+    def as_dict(self) -> dict:
+        """
+        Returns the recorded statistics.
+
+        Returns:
+            dict: Per operation, its "count", "errors", "total_seconds",
+            "mean_seconds" and "max_seconds", the "p50_us", "p90_us" and "p99_us"
+            latency percentiles (as histogram bucket upper bounds) and the
+            "histogram_us" itself.
+        """
+        with self._lock:
+            result = {}
+            for operation, (count, errors, total, longest, histogram) in sorted(
+                self._operations.items()
+            ):
+                buckets = sorted(histogram.items())
+                result[operation] = {
+                    "count": count,
+                    "errors": errors,
+                    "total_seconds": total,
+                    "mean_seconds": total / count,
+                    "max_seconds": longest,
+                    **{
+                        f"p{percent}_us": _bucket_percentile(buckets, count, percent)
+                        for percent in (50, 90, 99)
+                    },
+                    "histogram_us": {str(bound): n for bound, n in buckets},
+                }
+            return result
+
+    def write_json(self, path: Path) -> None:
+        """
+        Writes the recorded statistics to a JSON file.
+
+        Args:
+            path (Path): The file to write.
+        """
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2))
+
+
+def _bucket_percentile(buckets: list, count: int, percent: int) -> int:
+    seen = 0
+    for bound, n in buckets:
+        seen += n
+        if 100 * seen >= percent * count:
+            return bound
+    return buckets[-1][0]
+
+
+def export_stats_on_exit(path: Path) -> OperationStats:
+    """
+    Starts recording operation statistics and writes them to a JSON file when
+    the interpreter exits.
+
+    Args:
+        path (Path): The file to write the statistics to.
+
+    Returns:
+        OperationStats: The registered hook, e.g. to read statistics earlier.
+    """
+    stats = OperationStats()
+    add_hook(stats)
+    atexit.register(stats.write_json, path)
+    return stats
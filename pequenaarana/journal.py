@@ -0,0 +1,203 @@
+import json
+import os
+from pathlib import Path
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class GraphJournal:
+    """
+    An append-only log of graph mutations kept next to a saved graph file.
+
+    Every mutation is appended (and flushed) as a JSON line as soon as it happens,
+    so it survives a crash. Saving only appends a commit marker, which makes a
+    save cost O(changes). The first line records the size and modification time
+    of the graph file the journal applies to, so a journal left over from an
+    older version of that file is ignored.
+
+    Attributes:
+        graph_path (Path): The graph file the journal belongs to.
+        path (Path): The journal file.
+        _file (file): The journal file, opened for appending.
+        _committed_size (int): The journal size in bytes at the last commit.
+
+    Methods:
+        journal_path(graph_path: Path) -> Path: Returns the journal path for a graph file.
+        create(graph_path: Path) -> GraphJournal: Starts an empty journal for a graph file.
+        read(graph_path: Path) -> tuple: Returns the committed and uncommitted entries of a journal.
+        open(graph_path: Path, keep_uncommitted: bool = False) -> GraphJournal: Opens a graph file's journal for appending.
+        append(self, entry: dict) -> None: Records a mutation.
+        commit(self) -> None: Marks every recorded mutation as saved.
+        discard_uncommitted(self) -> None: Drops the mutations recorded since the last commit.
+        close(self) -> None: Closes the journal file.
+    """
+
+    def __init__(self, graph_path: Path, committed_size: int):
+        self.graph_path = Path(graph_path)
+        self.path = self.journal_path(graph_path)
+        self._file = open(self.path, "ab")
+        self._committed_size = committed_size
+
+    @property
+    def size(self) -> int:
+        return self._file.tell()
+
+    @property
+    def has_uncommitted(self) -> bool:
+        return self.size > self._committed_size
+
+    @staticmethod
+    def journal_path(graph_path: Path) -> Path:
+        """
+        Returns the path of the journal belonging to a graph file.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+
+        Returns:
+            Path: The graph path with JOURNAL_SUFFIX appended.
+        """
+        return Path(f"{graph_path}{JOURNAL_SUFFIX}")
+
+    @staticmethod
+    def _base_entry(graph_path: Path) -> dict:
+        stat = os.stat(graph_path)
+        return {"op": "base", "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def _encode(entry: dict) -> bytes:
+        return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @classmethod
+    def create(cls, graph_path: Path):
+        """
+        Starts an empty journal for a graph file that was just written in full,
+        replacing any previous journal.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+
+        Returns:
+            GraphJournal: The new journal.
+        """
+        with open(cls.journal_path(graph_path), "wb") as journal:
+            journal.write(cls._encode(cls._base_entry(graph_path)))
+            size = journal.tell()
+            journal.flush()
+            os.fsync(journal.fileno())
+        return cls(graph_path, size)
+
+    @classmethod
+    def read(cls, graph_path: Path):
+        """
+        Reads the journal of a graph file.
+
+        A missing journal, a journal written for a different version of the graph
+        file, or a partially written last line are all tolerated.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+
+        Returns:
+            tuple: (committed, uncommitted) lists of entries.
+        """
+        committed, uncommitted, _, _ = cls._scan(graph_path)
+        return committed, uncommitted
+
+    @classmethod
+    def _scan(cls, graph_path: Path):
+        """
+        Reads the journal of a graph file along with the offsets needed to reopen it.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+
+        Returns:
+            tuple: (committed, uncommitted, committed_size, valid_size). The sizes are
+            the byte offsets of the last commit and of the end of the last complete
+            entry, or None if there is no usable journal.
+        """
+        path = cls.journal_path(graph_path)
+        if not path.exists():
+            return [], [], None, None
+        committed, pending = [], []
+        committed_size = valid_size = None
+        with open(path, "rb") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                if valid_size is None:
+                    if entry != cls._base_entry(graph_path):
+                        return [], [], None, None
+                    committed_size = journal.tell()
+                elif entry["op"] == "commit":
+                    committed += pending
+                    pending = []
+                    committed_size = journal.tell()
+                else:
+                    pending.append(entry)
+                valid_size = journal.tell()
+        return committed, pending, committed_size, valid_size
+
+    @classmethod
+    def open(cls, graph_path: Path, keep_uncommitted: bool = False):
+        """
+        Opens the journal of a graph file for appending, creating it if needed.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+            keep_uncommitted (bool, optional): Whether to keep mutations recorded
+                after the last commit (e.g. recovered after a crash). Defaults to False.
+
+        Returns:
+            GraphJournal: The opened journal.
+        """
+        _, _, committed_size, valid_size = cls._scan(graph_path)
+        if committed_size is None:
+            return cls.create(graph_path)
+        journal = cls(graph_path, committed_size)
+        journal._truncate(valid_size if keep_uncommitted else committed_size)
+        return journal
+
+    def append(self, entry: dict) -> None:
+        """
+        Records a mutation and flushes it to the operating system.
+
+        Args:
+            entry (dict): The mutation, with an "op" key naming the ConnectionGraph method.
+
+        Returns:
+            None
+        """
+        self._file.write(self._encode(entry))
+        self._file.flush()
+
+    def commit(self) -> None:
+        """
+        Marks every recorded mutation as saved and syncs the journal to disk.
+        """
+        self._file.write(self._encode({"op": "commit"}))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._committed_size = self.size
+
+    def discard_uncommitted(self) -> None:
+        """
+        Drops the mutations recorded since the last commit.
+        """
+        self._truncate(self._committed_size)
+
+    def _truncate(self, size: int) -> None:
+        self._file.flush()
+        self._file.truncate(size)
+        self._file.seek(size)
+
+    def close(self) -> None:
+        """
+        Closes the journal file.
+        """
+        self._file.close()
@@ -0,0 +1,118 @@
+class IntroductionSearch:
+    """
+    A resumable breadth-first search from one node, answering shortest path queries
+    to any other node with a bidirectional search.
+
+    The search from the source is kept between queries: every layer explored to
+    answer one query is reused by the next, and a target already reached is
+    answered from the parent map alone. Only the search from the target is thrown
+    away after each query, so the work spent on it is tallied: once it adds up to
+    the size of the source frontier, the next layer is expanded from the source
+    instead, where it is kept for every later query. The owner must discard the search when the graph
+    changes, e.g. by comparing generation against its own mutation counter.
+
+    Attributes:
+        source (str): The node the search starts from.
+        generation (int): The version of the graph the search was built on.
+        _neighbors (callable): Returns the nodes adjacent to a node, in both directions.
+        _parents (dict): Maps every node reached from the source to its parent and depth.
+        _frontier (list): The nodes at the deepest explored layer.
+        _discarded (int): The nodes reached by target searches since the source search last grew.
+
+    Methods:
+        path_to(self, target: str, max_length: int = None) -> list: Returns a shortest path from the source to a target.
+    """
+
+    def __init__(self, source: str, neighbors, generation: int = 0):
+        """
+        Starts a search.
+
+        Args:
+            source (str): The node to search from.
+            neighbors (callable): neighbors(node) returns the nodes to step to.
+            generation (int, optional): The version of the graph. Defaults to 0.
+        """
+        self.source = source
+        self.generation = generation
+        self._neighbors = neighbors
+        self._parents = {source: (None, 0)}
+        self._frontier = [source]
+        self._discarded = 0
+
+    def path_to(self, target: str, max_length: int = None) -> list:
+        """
+        Returns a shortest path from the source to a target.
+
+        Layers are expanded from whichever side has the smaller frontier, counting
+        the work already thrown away by earlier target searches against the
+        target's side, so a search meets in the middle instead of exploring
+        everything within the full distance of the source.
+
+        Args:
+            target (str): The node to reach.
+            max_length (int, optional): The longest path, in edges, worth finding. Defaults to None (no limit).
+
+        Returns:
+            list: The nodes along the path, from the source to the target, or an
+            empty list if there is no such path.
+        """
+        if target in self._parents:
+            path = self._trace(self._parents, target)[::-1]
+            return path if max_length is None or len(path) - 1 <= max_length else []
+        target_parents = {target: (None, 0)}
+        target_frontier = [target]
+        source_depth = self._parents[self._frontier[0]][1] if self._frontier else 0
+        target_depth = 0
+        while self._frontier and target_frontier:
+            if max_length is not None and source_depth + target_depth >= max_length:
+                return []
+            if len(self._frontier) <= len(target_frontier) + self._discarded:
+                self._frontier, meeting = _expand(
+                    self._frontier, self._parents, target_parents, self._neighbors
+                )
+                source_depth += 1
+                self._discarded = 0
+            else:
+                target_frontier, meeting = _expand(
+                    target_frontier, target_parents, self._parents, self._neighbors
+                )
+                target_depth += 1
+                self._discarded += len(target_frontier)
+            if meeting is not None:
+                return (
+                    self._trace(self._parents, meeting)[::-1]
+                    + self._trace(target_parents, meeting)[1:]
+                )
+        return []
+
+    @staticmethod
+    def _trace(parents: dict, node: str) -> list:
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node][0]
+        return path
+
+
+def _expand(frontier: list, parents: dict, other_parents: dict, neighbors):
+    """
+    Expands a search by one layer.
+
+    Returns:
+        tuple: The new frontier, and the newly reached node that is also reached by
+        the other search with the shortest combined distance, or None.
+    """
+    next_frontier = []
+    meeting, meeting_distance = None, None
+    for node in frontier:
+        depth = parents[node][1] + 1
+        for neighbor in neighbors(node):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = (node, depth)
+            next_frontier.append(neighbor)
+            if neighbor in other_parents:
+                distance = other_parents[neighbor][1]
+                if meeting is None or distance < meeting_distance:
+                    meeting, meeting_distance = neighbor, distance
+    return next_frontier, meeting
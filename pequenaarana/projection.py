@@ -0,0 +1,136 @@
+import heapq
+
+HOP_DECAY = 0.5
+HOP_FANOUT = 100
+
+
+class CoMembershipProjection:
+    """
+    A cached, weighted person-person projection of a graph's shared memberships.
+
+    Two persons are connected when they are linked to the same group node (e.g.
+    an ORGANIZATION or ACCOUNT) through the same edge kind, with a weight summing
+    the weights of every such shared membership. Rows are computed from the graph
+    the first time they are needed and then kept up to date one membership at a
+    time, so repeated queries never rebuild them.
+
+    Attributes:
+        weights (dict): Maps each projected edge kind to the weight of sharing a group through it.
+        _memberships (callable): Returns the (group, kind) pairs of a person's projected edges.
+        _members (callable): Returns the persons linked to a group through an edge kind.
+        _rows (dict): Maps each person whose row was computed to {person: weight}.
+
+    Methods:
+        row(self, person: str) -> dict: Returns the persons sharing a group with a person.
+        add_membership(self, person: str, group: str, kind: str) -> None: Records a new membership.
+        clear(self) -> None: Drops every cached row.
+        proximity(self, person: str, max_hops: int = 2) -> dict: Scores how closely others connect to a person.
+    """
+
+    def __init__(self, weights: dict, memberships, members):
+        """
+        Creates an empty projection.
+
+        Args:
+            weights (dict): Maps each projected edge kind to its weight.
+            memberships (callable): memberships(person) returns the (group, kind)
+                pairs of the person's edges of a projected kind.
+            members (callable): members(group, kind) returns the persons linked to
+                the group through edges of that kind.
+        """
+        self.weights = weights
+        self._memberships = memberships
+        self._members = members
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def row(self, person: str) -> dict:
+        """
+        Returns the persons sharing at least one group with a person.
+
+        Args:
+            person (str): The person.
+
+        Returns:
+            dict: Maps each other person to the summed weight of their shared memberships.
+        """
+        row = self._rows.get(person)
+        if row is None:
+            row = {}
+            for group, kind in self._memberships(person):
+                weight = self.weights[kind]
+                for other in self._members(group, kind):
+                    if other != person:
+                        row[other] = row.get(other, 0.0) + weight
+            self._rows[person] = row
+        return row
+
+    def add_membership(self, person: str, group: str, kind: str) -> None:
+        """
+        Updates the cached rows after a person was linked to a group.
+
+        Only the rows of the person and of the group's other members change, and
+        only those already computed are touched.
+
+        Args:
+            person (str): The person that was linked.
+            group (str): The group it was linked to.
+            kind (str): The kind of the new edge.
+
+        Returns:
+            None
+        """
+        if not self._rows or kind not in self.weights:
+            return
+        weight = self.weights[kind]
+        row = self._rows.get(person)
+        for other in self._members(group, kind):
+            if other == person:
+                continue
+            if row is not None:
+                row[other] = row.get(other, 0.0) + weight
+            other_row = self._rows.get(other)
+            if other_row is not None:
+                other_row[person] = other_row.get(person, 0.0) + weight
+
+    def clear(self) -> None:
+        """
+        Drops every cached row, e.g. after a bulk change to the graph.
+
+        Returns:
+            None
+        """
+        self._rows.clear()
+
+    def proximity(self, person: str, max_hops: int = 2) -> dict:
+        """
+        Scores how closely other persons connect to a person.
+
+        Direct co-members score the weight of their shared memberships. Persons two
+        hops away score HOP_DECAY times the strongest path through one of the
+        person's HOP_FANOUT strongest direct connections, where a path's strength is
+        the product of its two weights.
+
+        Args:
+            person (str): The person to start from.
+            max_hops (int, optional): 1 for direct co-members only, 2 to include their
+                co-members. Defaults to 2.
+
+        Returns:
+            dict: Maps each reachable person to a (proximity, hops) tuple.
+        """
+        direct = self.row(person)
+        result = {other: (weight, 1) for other, weight in direct.items()}
+        if max_hops < 2:
+            return result
+        strongest = heapq.nlargest(HOP_FANOUT, direct.items(), key=lambda item: item[1])
+        for middle, first_weight in strongest:
+            for other, second_weight in self.row(middle).items():
+                if other == person or other in direct:
+                    continue
+                score = HOP_DECAY * first_weight * second_weight
+                if score > result.get(other, (0.0, 2))[0]:
+                    result[other] = (score, 2)
+        return result
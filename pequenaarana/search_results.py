@@ -0,0 +1,108 @@
+import heapq
+import math
+
+RESULTS_PAGE_SIZE = 50
+
+
+class SearchResults:
+    """
+    A lazy, paginated cursor over the persons matched by a search, ordered by label
+    or by centrality.
+
+    Only the matching labels are collected up front. Pages are ordered with a
+    heap-based partial sort that grows as later pages are requested, and person
+    profiles are only resolved for the page being read, so a broad query costs
+    as much as the pages actually viewed rather than the whole result set.
+
+    Attributes:
+        page_size (int): The number of persons per page.
+        order (str): "label", or "centrality" for the best-connected persons first.
+        _graph (ConnectionGraph): The graph the persons belong to.
+        _persons (list): The matching persons, unordered.
+        _ordered (list): The first persons in order, as far as they were needed.
+        _scores (dict): The centrality of each person, when ordering by centrality.
+
+    Methods:
+        page(self, number: int) -> list: Returns the profiles on a page.
+        labels(self, start: int, stop: int) -> list: Returns a range of persons in order.
+        page_count(self) -> int: Returns the number of pages.
+    """
+
+    def __init__(
+        self,
+        graph,
+        persons,
+        page_size: int = RESULTS_PAGE_SIZE,
+        order: str = "label",
+        progress=None,
+    ):
+        self.page_size = page_size
+        self.order = order
+        self._graph = graph
+        self._persons = list(persons)
+        self._ordered = []
+        self._scores = (
+            graph.centrality(self._persons, progress) if order == "centrality" else {}
+        )
+
+    def __len__(self):
+        return len(self._persons)
+
+    def __iter__(self):
+        for number in range(self.page_count):
+            yield from self.page(number)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, math.ceil(len(self._persons) / self.page_size))
+
+    def page(self, number: int) -> list:
+        """
+        Returns the resolved profiles of the persons on a page.
+
+        Args:
+            number (int): The zero-based page number.
+
+        Returns:
+            list: Profiles as returned by ConnectionGraph.get_person_profiles, in
+            order. Empty past the last page.
+        """
+        start = number * self.page_size
+        profiles = self._graph.get_person_profiles(
+            self.labels(start, start + self.page_size)
+        )
+        return list(profiles.values())
+
+    def labels(self, start: int, stop: int) -> list:
+        """
+        Returns a range of the matching persons in order.
+
+        The ordered prefix is extended with heapq.nsmallest, at least doubling
+        each time, and the whole list is sorted once more than a quarter of it
+        is needed.
+
+        Args:
+            start (int): The index of the first person.
+            stop (int): The index after the last person.
+
+        Returns:
+            list: The labels of the persons in the range.
+        """
+        stop = min(stop, len(self._persons))
+        if stop > len(self._ordered):
+            wanted = max(stop, 2 * len(self._ordered))
+            if 4 * wanted >= len(self._persons):
+                self._ordered = sorted(self._persons, key=self._sort_key)
+            else:
+                self._ordered = heapq.nsmallest(
+                    wanted, self._persons, key=self._sort_key
+                )
+        return self._ordered[start:stop]
+
+    def _sort_key(self, person: str) -> tuple:
+        attributes = self._graph.nodes[person]
+        return (
+            -self._scores.get(person, 0.0),
+            str(attributes.get("label", person)),
+            str(person),
+        )
@@ -0,0 +1,260 @@
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDINGS_SUFFIX = ".embeddings.npz"
+EMBEDDING_DIMENSIONS = 64
+CONTEXT_SMOOTHING = 0.75
+OVERSAMPLING = 10
+POWER_ITERATIONS = 4
+WARM_POWER_ITERATIONS = 1
+
+
+class SkillEmbeddings:
+    """
+    Dense skill vectors learned locally from which skills people list together.
+
+    Training counts how often every two skills appear on the same person, turns
+    the counts into positive pointwise mutual information (PPMI, with the skill
+    frequencies smoothed by CONTEXT_SMOOTHING so rare skills do not dominate)
+    and factors that matrix. It is symmetric but usually has negative eigenvalues
+    too, so the components kept are those with the largest eigenvalues in
+    magnitude, each eigenvector scaled by the square root of that magnitude:
+    the truncated SVD of the matrix, whose singular values are the eigenvalue
+    magnitudes. Skills used in similar company end up close together: "ml" lands
+    near "machine learning" and "pytorch" even if nobody lists them together.
+    Everything runs on NumPy with a randomized solver over the sparse PPMI
+    entries, so training needs neither a download nor a GPU, and retraining
+    starts from the previous vectors.
+
+    Attributes:
+        skills (list): The skills with a vector, in row order.
+        vectors (np.ndarray): A float32 skills x dimensions matrix.
+        _rows (dict): Maps each skill to its row.
+        _unit_vectors (np.ndarray): The vectors scaled to unit length, for cosine similarity.
+
+    Methods:
+        train(cls, skill_sets, dimensions: int = EMBEDDING_DIMENSIONS, previous=None): Learns vectors from the skills people list together.
+        most_similar(self, skills, k: int = 10) -> list: Returns the skills closest to some skills.
+        save(self, path: Path) -> None: Writes the vectors to a compressed NumPy file.
+        load(cls, path: Path): Reads vectors written by save.
+        path_for(graph_path: Path) -> Path: Returns where the embeddings of a graph file are kept.
+    """
+
+    def __init__(self, skills: list, vectors: np.ndarray):
+        self.skills = list(skills)
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self._rows = {skill: row for row, skill in enumerate(self.skills)}
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self._unit_vectors = np.divide(
+            self.vectors, norms, out=np.zeros_like(self.vectors), where=norms > 0
+        )
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill) -> bool:
+        return skill in self._rows
+
+    @classmethod
+    def train(cls, skill_sets, dimensions: int = EMBEDDING_DIMENSIONS, previous=None):
+        """
+        Learns skill vectors from the skills people list together.
+
+        Args:
+            skill_sets (iterable): The normalized skills of each person.
+            dimensions (int, optional): The length of the vectors. Defaults to EMBEDDING_DIMENSIONS.
+            previous (SkillEmbeddings, optional): Embeddings trained earlier on
+                similar data. Their skills keep their rows and their vectors seed
+                the solver, which then needs fewer iterations. Defaults to None.
+
+        Returns:
+            SkillEmbeddings: The trained embeddings.
+        """
+        skills = list(previous.skills) if previous is not None else []
+        columns = {skill: column for column, skill in enumerate(skills)}
+        entry_rows, entry_columns = [], []
+        for person, person_skills in enumerate(skill_sets):
+            for skill in person_skills:
+                column = columns.get(skill)
+                if column is None:
+                    column = columns[skill] = len(skills)
+                    skills.append(skill)
+                entry_rows.append(person)
+                entry_columns.append(column)
+        rows, cols, counts = _cooccurrences(
+            np.array(entry_rows, dtype=np.int64),
+            np.array(entry_columns, dtype=np.int64),
+        )
+        values = _ppmi(rows, cols, counts, len(skills))
+        keep = values > 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+
+        start = None
+        if previous is not None and len(previous.vectors):
+            start = np.zeros((len(skills), previous.vectors.shape[1]))
+            start[: len(previous)] = previous.vectors
+        eigenvalues, eigenvectors = _top_eigenpairs(
+            rows, cols, values, len(skills), dimensions, start
+        )
+        vectors = eigenvectors * np.sqrt(np.abs(eigenvalues))
+        return cls(skills, vectors)
+
+    def most_similar(self, skills, k: int = 10) -> list:
+        """
+        Returns the skills whose vectors are closest to the mean of some skills' vectors.
+
+        Args:
+            skills (iterable): Normalized skills; those without a vector are ignored.
+            k (int, optional): The maximum number of results. Defaults to 10.
+
+        Returns:
+            list: (skill, cosine similarity) tuples with a positive similarity,
+            most similar first, including the given skills themselves.
+        """
+        rows = [self._rows[skill] for skill in skills if skill in self._rows]
+        if not rows:
+            return []
+        query = self._unit_vectors[rows].sum(axis=0)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        similarities = self._unit_vectors @ (query / norm)
+        candidates = np.flatnonzero(similarities > 0)
+        if len(candidates) > k:
+            candidates = candidates[
+                np.argpartition(-similarities[candidates], k - 1)[:k]
+            ]
+        return sorted(
+            ((self.skills[row], float(similarities[row])) for row in candidates),
+            key=lambda result: (-result[1], result[0]),
+        )
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the skills and float32 vectors to a compressed NumPy (.npz) file.
+
+        Args:
+            path (Path): The file to write.
+
+        Returns:
+            None
+        """
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file, skills=np.array(self.skills, dtype=str), vectors=self.vectors
+            )
+
+    @classmethod
+    def load(cls, path: Path):
+        """
+        Reads embeddings written by save.
+
+        Args:
+            path (Path): The file to read.
+
+        Returns:
+            SkillEmbeddings: The embeddings.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["skills"].tolist(), data["vectors"])
+
+    @staticmethod
+    def path_for(graph_path: Path) -> Path:
+        """
+        Returns the path of the embeddings kept next to a graph file.
+
+        Args:
+            graph_path (Path): The path of the graph file.
+
+        Returns:
+            Path: The graph path with EMBEDDINGS_SUFFIX appended.
+        """
+        return Path(f"{graph_path}{EMBEDDINGS_SUFFIX}")
+
+
+def _cooccurrences(entry_rows: np.ndarray, entry_columns: np.ndarray) -> tuple:
+    """
+    Counts how many people list each ordered pair of distinct skills, given the
+    (person, skill) entries of a binary person x skill matrix.
+
+    Returns:
+        tuple: The rows, columns and counts of the symmetric co-occurrence matrix.
+    """
+    order = np.lexsort((entry_columns, entry_rows))
+    entry_rows, entry_columns = entry_rows[order], entry_columns[order]
+    firsts, seconds = [], []
+    for offset in range(1, len(entry_rows)):
+        same = np.flatnonzero(entry_rows[offset:] == entry_rows[:-offset])
+        if not len(same):
+            break
+        firsts.append(entry_columns[same])
+        seconds.append(entry_columns[same + offset])
+    if not firsts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    size = int(max(first.max(), second.max())) + 1
+    pairs, counts = np.unique(
+        np.concatenate((first * size + second, second * size + first)),
+        return_counts=True,
+    )
+    return pairs // size, pairs % size, counts
+
+
+def _ppmi(rows: np.ndarray, cols: np.ndarray, counts: np.ndarray, size: int):
+    """
+    Returns the positive pointwise mutual information of co-occurrence counts,
+    with the skill frequencies smoothed by CONTEXT_SMOOTHING on both sides so
+    that the matrix stays symmetric.
+    """
+    if not len(counts):
+        return np.zeros(0)
+    frequencies = np.bincount(rows, weights=counts, minlength=size)
+    smoothed = frequencies**CONTEXT_SMOOTHING
+    smoothed /= smoothed.sum()
+    joint = counts / counts.sum()
+    return np.maximum(np.log(joint / (smoothed[rows] * smoothed[cols])), 0.0)
+
+
+def _top_eigenpairs(rows, cols, values, size: int, rank: int, start=None) -> tuple:
+    """
+    Returns the eigenvalues of largest magnitude, whatever their sign, and their
+    eigenvectors of a symmetric sparse matrix given by its coordinates, by
+    randomized subspace iteration (which converges to the dominant eigenvalues
+    in magnitude).
+
+    Args:
+        start (np.ndarray, optional): Columns spanning an approximation of the
+            wanted subspace, e.g. earlier vectors; they replace the random start
+            and reduce the iterations to WARM_POWER_ITERATIONS.
+
+    Returns:
+        tuple: Up to rank eigenvalues, largest in magnitude first, and a size x
+        rank matrix of eigenvectors.
+    """
+    rank = min(rank, size)
+    width = min(size, rank + OVERSAMPLING)
+    if not size:
+        return np.zeros(0), np.zeros((0, 0))
+
+    def multiply(dense):
+        return np.column_stack(
+            [
+                np.bincount(rows, weights=values * dense[cols, i], minlength=size)
+                for i in range(dense.shape[1])
+            ]
+        )
+
+    random = np.random.default_rng(0).standard_normal((size, width))
+    iterations = POWER_ITERATIONS
+    if start is not None:
+        columns = min(start.shape[1], width)
+        random[:, :columns] = start[:, :columns]
+        iterations = WARM_POWER_ITERATIONS
+    basis = np.linalg.qr(random)[0]
+    for _ in range(iterations):
+        basis = np.linalg.qr(multiply(basis))[0]
+    eigenvalues, eigenvectors = np.linalg.eigh(basis.T @ multiply(basis))
+    order = np.argsort(-np.abs(eigenvalues), kind="stable")[:rank]
+    return eigenvalues[order], basis @ eigenvectors[:, order]
@@ -0,0 +1,404 @@
+import bisect
+import logging
+
+
+class SkillVocabulary:
+    """
+    An index over the distinct skills of a graph supporting partial and misspelled lookups.
+
+    Prefix lookups use a sorted list of skills, while substring and edit-distance
+    lookups first narrow the vocabulary down with a bigram index and only then
+    verify the remaining candidates.
+
+    Attributes:
+        GRAM_SIZE (int): The length of the n-grams used to find candidates.
+        _sorted_skills (list): All skills in lexicographic order.
+        _grams (dict): Maps each padded bigram to the skills that contain it.
+
+    Methods:
+        add(self, skill: str) -> None: Adds a skill to the vocabulary.
+        discard(self, skill: str) -> None: Removes a skill from the vocabulary.
+        clear(self) -> None: Removes every skill from the vocabulary.
+        prefix(self, query: str) -> list: Returns the skills starting with a query.
+        substring(self, query: str) -> list: Returns the skills containing a query.
+        similar(self, query: str, max_distance: int = None) -> list: Returns the skills within an edit distance of a query.
+        edit_distance(a: str, b: str, limit: int) -> int: Computes a bounded edit distance between two strings.
+    """
+
+    GRAM_SIZE = 2
+
+    def __init__(self):
+        self._sorted_skills = []
+        self._grams = {}
+
+    def __len__(self):
+        return len(self._sorted_skills)
+
+    def __contains__(self, skill: str) -> bool:
+        i = bisect.bisect_left(self._sorted_skills, skill)
+        return i < len(self._sorted_skills) and self._sorted_skills[i] == skill
+
+    def _padded_grams(self, skill: str) -> set:
+        padded = f"^{skill}$"
+        return {
+            padded[i : i + self.GRAM_SIZE]
+            for i in range(len(padded) - self.GRAM_SIZE + 1)
+        } or {padded}
+
+    def add(self, skill: str) -> None:
+        """
+        Adds a skill to the vocabulary. Does nothing if it is already present.
+
+        Args:
+            skill (str): The normalized skill.
+
+        Returns:
+            None
+        """
+        if skill in self:
+            return
+        bisect.insort(self._sorted_skills, skill)
+        for gram in self._padded_grams(skill):
+            self._grams.setdefault(gram, set()).add(skill)
+
+    def discard(self, skill: str) -> None:
+        """
+        Removes a skill from the vocabulary. Does nothing if it is not present.
+
+        Args:
+            skill (str): The normalized skill.
+
+        Returns:
+            None
+        """
+        if skill not in self:
+            return
+        del self._sorted_skills[bisect.bisect_left(self._sorted_skills, skill)]
+        for gram in self._padded_grams(skill):
+            skills = self._grams[gram]
+            skills.discard(skill)
+            if not skills:
+                del self._grams[gram]
+
+    def clear(self) -> None:
+        """
+        Removes every skill from the vocabulary.
+        """
+        self._sorted_skills.clear()
+        self._grams.clear()
+
+    def prefix(self, query: str) -> list:
+        """
+        Returns the skills that start with a query, e.g. "kube" -> "kubernetes".
+
+        Args:
+            query (str): The normalized query.
+
+        Returns:
+            list: The matching skills in lexicographic order.
+        """
+        start = bisect.bisect_left(self._sorted_skills, query)
+        end = start
+        while end < len(self._sorted_skills) and self._sorted_skills[end].startswith(
+            query
+        ):
+            end += 1
+        return self._sorted_skills[start:end]
+
+    def substring(self, query: str) -> list:
+        """
+        Returns the skills that contain a query anywhere, e.g. "sql" -> "postgresql".
+
+        Args:
+            query (str): The normalized query.
+
+        Returns:
+            list: The matching skills in lexicographic order.
+        """
+        if len(query) < self.GRAM_SIZE:
+            candidates = self._sorted_skills
+        else:
+            grams = [
+                query[i : i + self.GRAM_SIZE]
+                for i in range(len(query) - self.GRAM_SIZE + 1)
+            ]
+            postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings)
+        return sorted(skill for skill in candidates if query in skill)
+
+    def similar(self, query: str, max_distance: int = None) -> list:
+        """
+        Returns the skills within a small edit distance of a query, e.g. "pyhton" -> "python".
+
+        Insertions, deletions, substitutions and transpositions of adjacent
+        characters each count as one edit.
+
+        Args:
+            query (str): The normalized query.
+            max_distance (int, optional): The maximum number of edits. Defaults to 1 for
+                queries shorter than eight characters and 2 otherwise.
+
+        Returns:
+            list: (skill, distance) tuples ordered by distance, then by skill.
+        """
+        if max_distance is None:
+            max_distance = 1 if len(query) < 8 else 2
+        query_grams = self._padded_grams(query)
+        # Each edit (a transposition included) destroys at most GRAM_SIZE + 1
+        # of the query's grams, so a match must still share this many of them.
+        min_shared = len(query_grams) - (self.GRAM_SIZE + 1) * max_distance
+        if min_shared <= 0:
+            candidates = self._sorted_skills
+        else:
+            shared = {}
+            for gram in query_grams:
+                for skill in self._grams.get(gram, ()):
+                    shared[skill] = shared.get(skill, 0) + 1
+            candidates = [skill for skill, n in shared.items() if n >= min_shared]
+
+        matches = []
+        for skill in candidates:
+            if abs(len(skill) - len(query)) > max_distance:
+                continue
+            distance = self.edit_distance(query, skill, max_distance)
+            if distance <= max_distance:
+                matches.append((skill, distance))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    @staticmethod
+    def edit_distance(a: str, b: str, limit: int) -> int:
+        """
+        Computes the optimal string alignment distance between two strings.
+
+        Args:
+            a (str): The first string.
+            b (str): The second string.
+            limit (int): Distances above this value are not computed exactly.
+
+        Returns:
+            int: The distance, or limit + 1 if it exceeds the limit.
+        """
+        previous_row = None
+        row = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            previous_row, prior_row = row, previous_row
+            row = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                row[j] = min(
+                    previous_row[j] + 1,
+                    row[j - 1] + 1,
+                    previous_row[j - 1] + cost,
+                )
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    row[j] = min(row[j], prior_row[j - 2] + 1)
+            if min(row) > limit:
+                return limit + 1
+        return min(row[len(b)], limit + 1)
+
+
+class SkillIndex:
+    """
+    An inverted index mapping normalized skills to the PERSON nodes that list them.
+
+    Attributes:
+        _postings (dict): Maps each skill to the set of person labels that have it.
+        _person_skills (dict): Maps each indexed person to the skills it was indexed with.
+        _vocabulary (SkillVocabulary): The distinct skills, indexed for partial and fuzzy lookups.
+        MATCH_MODES (list): The supported ways of matching a query against the vocabulary.
+
+    Methods:
+        split_skills(skills: str) -> list: Normalizes a CSV skills string into a list of skills.
+        add(self, person: str, skills: str) -> bool: Indexes (or re-indexes) a person.
+        add_many(self, people) -> list: Indexes many people at once.
+        discard(self, person: str) -> None: Removes a person from the index.
+        clear(self) -> None: Removes every entry from the index.
+        document_frequency(self, skill: str) -> int: Returns the number of persons with a skill.
+        get(self, skill: str) -> set: Returns the persons that have a skill.
+        skills_of(self, person: str) -> tuple: Returns the skills a person was indexed with.
+        persons(self): Returns every indexed person.
+        match_skills(self, query: str, match: str = "exact", max_distance: int = None) -> list: Returns the skills matching a query.
+    """
+
+    MATCH_MODES = ["exact", "prefix", "substring", "fuzzy"]
+
+    def __init__(self):
+        self._postings = {}
+        self._person_skills = {}
+        self._vocabulary = SkillVocabulary()
+
+    def __len__(self):
+        return len(self._person_skills)
+
+    def __contains__(self, person: str) -> bool:
+        return person in self._person_skills
+
+    @property
+    def vocabulary(self):
+        return self._vocabulary
+
+    @staticmethod
+    def split_skills(skills: str) -> list:
+        """
+        Splits a CSV skills string into normalized (lowercase, stripped) skills.
+
+        Args:
+            skills (str): The CSV skills string, e.g. "Python, Spark".
+
+        Returns:
+            list: The distinct, non-empty skills in their original order.
+        """
+        if not isinstance(skills, str):
+            return []
+        stripped = [skill.strip() for skill in skills.lower().split(",")]
+        return [skill for skill in dict.fromkeys(stripped) if skill]
+
+    def add(self, person: str, skills: str) -> bool:
+        """
+        Indexes a person under each of its skills, replacing any previous entry.
+
+        Args:
+            person (str): The label of the PERSON node.
+            skills (str): The person's CSV skills string.
+
+        Returns:
+            bool: True if the person was not indexed with these skills before.
+        """
+        new_skills = tuple(self.split_skills(skills))
+        if self._person_skills.get(person) == new_skills:
+            return False
+        self.discard(person)
+        self._person_skills[person] = new_skills
+        for skill in new_skills:
+            if skill not in self._postings:
+                self._postings[skill] = set()
+                self._vocabulary.add(skill)
+            self._postings[skill].add(person)
+        return True
+
+    def add_many(self, people) -> list:
+        """
+        Indexes many people at once. Equivalent to calling add for each of them.
+
+        Args:
+            people (iterable): (person, skills) tuples with CSV skills strings.
+
+        Returns:
+            list: The persons whose indexed skills changed.
+        """
+        changed = []
+        postings = self._postings
+        person_skills = self._person_skills
+        for person, skills in people:
+            new_skills = tuple(self.split_skills(skills))
+            if person in person_skills:
+                if person_skills[person] == new_skills:
+                    continue
+                self.discard(person)
+            person_skills[person] = new_skills
+            for skill in new_skills:
+                posting = postings.get(skill)
+                if posting is None:
+                    posting = postings[skill] = set()
+                    self._vocabulary.add(skill)
+                posting.add(person)
+            changed.append(person)
+        return changed
+
+    def discard(self, person: str) -> None:
+        """
+        Removes a person from the index. Does nothing if it was not indexed.
+
+        Args:
+            person (str): The label of the PERSON node.
+
+        Returns:
+            None
+        """
+        for skill in self._person_skills.pop(person, ()):
+            posting = self._postings[skill]
+            posting.discard(person)
+            if not posting:
+                del self._postings[skill]
+                self._vocabulary.discard(skill)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the index.
+        """
+        self._postings.clear()
+        self._person_skills.clear()
+        self._vocabulary.clear()
+
+    def document_frequency(self, skill: str) -> int:
+        """
+        Returns the number of persons indexed under a normalized skill.
+
+        Args:
+            skill (str): The normalized skill.
+
+        Returns:
+            int: The size of the skill's posting list.
+        """
+        return len(self._postings.get(skill, ()))
+
+    def get(self, skill: str) -> set:
+        """
+        Returns the persons indexed under a skill.
+
+        Args:
+            skill (str): The skill to look up. Matching is case-insensitive.
+
+        Returns:
+            set: The labels of the matching persons. The set must not be modified.
+        """
+        return self._postings.get(skill.strip().lower(), set())
+
+    def skills_of(self, person: str) -> tuple:
+        """
+        Returns the normalized skills a person was indexed with.
+
+        Args:
+            person (str): The label of the PERSON node.
+
+        Returns:
+            tuple: The person's skills, or an empty tuple if it is not indexed.
+        """
+        return self._person_skills.get(person, ())
+
+    def persons(self):
+        """
+        Returns every indexed person, including those without any skill.
+
+        Returns:
+            KeysView: The labels of the indexed PERSON nodes.
+        """
+        return self._person_skills.keys()
+
+    def match_skills(
+        self, query: str, match: str = "exact", max_distance: int = None
+    ) -> list:
+        """
+        Returns the indexed skills that match a query.
+
+        Args:
+            query (str): The skill to look for. Matching is case-insensitive.
+            match (str, optional): One of MATCH_MODES. Defaults to "exact".
+            max_distance (int, optional): The maximum edit distance for "fuzzy" matches.
+
+        Returns:
+            list: The matching skills, closest matches first.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        if match == "exact":
+            return [query] if query in self._postings else []
+        if match == "prefix":
+            return self._vocabulary.prefix(query)
+        if match == "substring":
+            return self._vocabulary.substring(query)
+        if match == "fuzzy":
+            return [skill for skill, _ in self._vocabulary.similar(query, max_distance)]
+        logging.error("Unknown skill match mode '%s'. Matching nothing.", match)
+        return []
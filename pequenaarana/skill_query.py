@@ -0,0 +1,221 @@
+import functools
+import re
+
+from pequenaarana.skill_index import SkillIndex
+
+QUERY_KEYWORDS = ["AND", "OR", "NOT"]
+QUERY_CACHE_SIZE = 256
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+)|(\S))')
+
+
+@functools.lru_cache(maxsize=QUERY_CACHE_SIZE)
+def parse_skill_query(query: str) -> tuple:
+    """
+    Compiles a boolean skill query such as "(python OR scala) AND spark AND NOT junior".
+
+    Operators are AND, OR and NOT (in any case), with NOT binding tightest and
+    AND binding tighter than OR; parentheses group. Consecutive words form a
+    single skill ("machine learning"), double quotes protect words that would
+    otherwise be operators ("research and development"), and a trailing "*"
+    matches every skill starting with the given prefix ("kube*"). Compiled
+    queries are cached, so repeating a search does not parse it again.
+
+    Args:
+        query (str): The query to compile.
+
+    Returns:
+        tuple: The query tree. Leaves are ("skill", skill) and ("prefix", prefix);
+        inner nodes are ("not", node), ("and", nodes) and ("or", nodes).
+
+    Raises:
+        ValueError: If the query is empty or malformed.
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        raise ValueError("The skill query is empty.")
+    tree, position = _parse_or(tokens, 0)
+    if position < len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position][1]}' in the skill query.")
+    return tree
+
+
+def _tokenize(query: str) -> list:
+    """
+    Splits a query into parenthesis, ("operator", name), ("word", words) and
+    ("quoted", text) tokens, merging consecutive unquoted words into one token.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(query):
+        opening, closing, quoted, word, stray = match.groups()
+        if stray is not None:
+            raise ValueError(f"Unexpected '{stray}' in the skill query.")
+        if opening or closing:
+            tokens.append((opening or closing, opening or closing))
+        elif word is not None and word.upper() in QUERY_KEYWORDS:
+            tokens.append(("operator", word.upper()))
+        elif word is not None and tokens and tokens[-1][0] == "word":
+            tokens[-1] = ("word", f"{tokens[-1][1]} {word}")
+        elif word is not None:
+            tokens.append(("word", word))
+        else:
+            tokens.append(("quoted", quoted))
+    return tokens
+
+
+def _parse_or(tokens: list, position: int):
+    children = []
+    while True:
+        child, position = _parse_and(tokens, position)
+        children.append(child)
+        if position < len(tokens) and tokens[position] == ("operator", "OR"):
+            position += 1
+        else:
+            return _combine("or", children), position
+
+
+def _parse_and(tokens: list, position: int):
+    children = []
+    while True:
+        child, position = _parse_not(tokens, position)
+        children.append(child)
+        if position < len(tokens) and tokens[position] == ("operator", "AND"):
+            position += 1
+        else:
+            return _combine("and", children), position
+
+
+def _parse_not(tokens: list, position: int):
+    if position >= len(tokens):
+        raise ValueError("The skill query ends with an operator.")
+    kind, value = tokens[position]
+    if kind == "operator" and value == "NOT":
+        child, position = _parse_not(tokens, position + 1)
+        return ("not", child), position
+    if kind == "(":
+        child, position = _parse_or(tokens, position + 1)
+        if position >= len(tokens) or tokens[position][0] != ")":
+            raise ValueError("Unbalanced parentheses in the skill query.")
+        return child, position + 1
+    if kind in ("word", "quoted"):
+        skill = value.strip().lower()
+        if not skill:
+            raise ValueError("The skill query has an empty skill.")
+        if kind == "word" and len(skill) > 1 and skill.endswith("*"):
+            return ("prefix", skill[:-1].rstrip()), position + 1
+        return ("skill", skill), position + 1
+    raise ValueError(f"Unexpected '{value}' in the skill query.")
+
+
+def _combine(operator: str, children: list) -> tuple:
+    if len(children) == 1:
+        return children[0]
+    flattened = []
+    for child in children:
+        flattened.extend(child[1] if child[0] == operator else [child])
+    return (operator, tuple(flattened))
+
+
+def estimate_cost(tree: tuple, index: SkillIndex) -> int:
+    """
+    Estimates how many persons a query tree matches, from posting list sizes alone,
+    to order the terms of an AND.
+
+    The estimate is exact for single skills and an upper bound for prefixes, ORs
+    and ANDs of those, but not a bound in general: a NOT subtracts its operand's
+    estimate from the number of persons, so NOT (a AND b) may be underestimated.
+    It only guides planning; the results never depend on it.
+
+    Args:
+        tree (tuple): A tree returned by parse_skill_query.
+        index (SkillIndex): The skill index to consult.
+
+    Returns:
+        int: The estimated number of matching persons.
+    """
+    operator, operand = tree
+    if operator == "skill":
+        return index.document_frequency(operand)
+    if operator == "prefix":
+        return sum(
+            index.document_frequency(skill)
+            for skill in index.match_skills(operand, "prefix")
+        )
+    if operator == "not":
+        return len(index) - estimate_cost(operand, index)
+    costs = [estimate_cost(child, index) for child in operand]
+    return min(costs) if operator == "and" else min(sum(costs), len(index))
+
+
+def evaluate_skill_query(tree: tuple, index: SkillIndex, progress=None) -> set:
+    """
+    Returns the persons matching a query tree.
+
+    The terms of an AND are planned by their estimated cost: only the most
+    selective one is materialized, every other term is checked against its
+    candidates one person at a time, and evaluation stops as soon as no
+    candidate is left. A query therefore costs roughly as much as its most
+    selective term rather than one scan per term.
+
+    Args:
+        tree (tuple): A tree returned by parse_skill_query.
+        index (SkillIndex): The skill index to consult.
+        progress (callable, optional): Called as progress(done, total) after each
+            term of a top-level AND or OR is evaluated. Defaults to None.
+
+    Returns:
+        set: The labels of the matching persons.
+    """
+    operator, operand = tree
+    if operator == "skill":
+        return set(index.get(operand))
+    if operator == "prefix":
+        return set().union(
+            *(index.get(skill) for skill in index.match_skills(operand, "prefix"))
+        )
+    if operator == "not":
+        excluded = evaluate_skill_query(operand, index)
+        return {person for person in index.persons() if person not in excluded}
+    if operator == "or":
+        matches = set()
+        for done, child in enumerate(operand, 1):
+            matches |= evaluate_skill_query(child, index)
+            if progress is not None:
+                progress(done, len(operand))
+        return matches
+
+    plan = sorted(
+        operand,
+        key=lambda child: (child[0] == "not", estimate_cost(child, index)),
+    )
+    total = len(plan)
+    if plan[0][0] == "not":
+        candidates = set(index.persons())
+    else:
+        candidates = evaluate_skill_query(plan[0], index)
+        plan = plan[1:]
+    done = total - len(plan)
+    for child in plan:
+        if not candidates:
+            break
+        candidates = {person for person in candidates if _matches(child, person, index)}
+        done += 1
+        if progress is not None:
+            progress(done, total)
+    return candidates
+
+
+def _matches(tree: tuple, person: str, index: SkillIndex) -> bool:
+    """
+    Checks whether a single person matches a query tree.
+    """
+    operator, operand = tree
+    if operator == "skill":
+        return person in index.get(operand)
+    if operator == "prefix":
+        return any(skill.startswith(operand) for skill in index.skills_of(person))
+    if operator == "not":
+        return not _matches(operand, person, index)
+    if operator == "and":
+        return all(_matches(child, person, index) for child in operand)
+    return any(_matches(child, person, index) for child in operand)
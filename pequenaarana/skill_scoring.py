@@ -0,0 +1,271 @@
+import math
+import numpy as np
+
+
+class SkillMatrix:
+    """
+    A sparse, binary person x skill matrix used to rank people against multi-skill queries.
+
+    Rows are stored in CSR form (indptr/indices arrays). New and updated people are
+    appended to a pending buffer that is folded into the arrays on the next query, and
+    replaced rows are tombstoned rather than rewritten, so keeping the matrix in sync
+    with the graph costs O(skills) per person.
+
+    Attributes:
+        _row_persons (list): Maps each row to its person, or None for a tombstoned row.
+        _person_rows (dict): Maps each person to its live row.
+        _skill_columns (dict): Maps each skill to its column.
+        _indptr (np.ndarray): CSR row pointers of the flushed rows.
+        _indices (np.ndarray): CSR column indices of the flushed rows.
+        _nnz_rows (np.ndarray): The row of every stored entry, aligned with _indices.
+        _alive (np.ndarray): Whether each flushed row is still live.
+        _pending (list): Column index lists of rows not yet flushed into the arrays.
+
+    Methods:
+        update(self, person: str, skills: tuple) -> None: Sets the skills of a person.
+        update_many(self, people) -> None: Sets the skills of many people at once.
+        discard(self, person: str) -> None: Removes a person from the matrix.
+        clear(self) -> None: Removes every person from the matrix.
+        scores(self, weights: dict) -> np.ndarray: Multiplies the matrix by a skill weight vector.
+        top_k(self, weights: dict, k: int = 10) -> list: Returns the best scoring people.
+        scores_of(self, weights: dict, persons) -> dict: Returns the scores of some people.
+        skill_sets(self): Yields the skills of every person.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._person_rows)
+
+    def clear(self) -> None:
+        """
+        Removes every person from the matrix.
+        """
+        self._row_persons = []
+        self._person_rows = {}
+        self._skill_columns = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._nnz_rows = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._pending = []
+
+    def update(self, person: str, skills: tuple) -> None:
+        """
+        Sets the skills of a person, appending a new row for it.
+
+        Args:
+            person (str): The label of the PERSON node.
+            skills (tuple): The person's normalized skills.
+
+        Returns:
+            None
+        """
+        self.discard(person)
+        columns = [
+            self._skill_columns.setdefault(skill, len(self._skill_columns))
+            for skill in skills
+        ]
+        self._person_rows[person] = len(self._row_persons)
+        self._row_persons.append(person)
+        self._pending.append(columns)
+
+    def update_many(self, people) -> None:
+        """
+        Sets the skills of many people at once. Equivalent to calling update for each.
+
+        Args:
+            people (iterable): (person, skills) tuples with normalized skills.
+
+        Returns:
+            None
+        """
+        columns_of = self._skill_columns
+        for person, skills in people:
+            if person in self._person_rows:
+                self.discard(person)
+            columns = []
+            for skill in skills:
+                column = columns_of.get(skill)
+                if column is None:
+                    column = columns_of[skill] = len(columns_of)
+                columns.append(column)
+            self._person_rows[person] = len(self._row_persons)
+            self._row_persons.append(person)
+            self._pending.append(columns)
+
+    def discard(self, person: str) -> None:
+        """
+        Removes a person from the matrix by tombstoning its row.
+
+        Args:
+            person (str): The label of the PERSON node.
+
+        Returns:
+            None
+        """
+        row = self._person_rows.pop(person, None)
+        if row is not None:
+            self._row_persons[row] = None
+            if row < len(self._alive):
+                self._alive[row] = False
+
+    def _flush(self) -> None:
+        """
+        Folds pending rows into the CSR arrays, compacting away tombstones when
+        they make up more than half of the rows.
+        """
+        if self._pending:
+            lengths = np.fromiter(
+                (len(columns) for columns in self._pending),
+                dtype=np.int64,
+                count=len(self._pending),
+            )
+            first_row = len(self._indptr) - 1
+            self._indptr = np.concatenate(
+                [self._indptr, self._indptr[-1] + np.cumsum(lengths)]
+            )
+            new_indices = np.fromiter(
+                (column for columns in self._pending for column in columns),
+                dtype=np.int32,
+                count=int(lengths.sum()),
+            )
+            self._indices = np.concatenate([self._indices, new_indices])
+            self._nnz_rows = np.concatenate(
+                [
+                    self._nnz_rows,
+                    np.repeat(
+                        np.arange(first_row, first_row + len(lengths), dtype=np.int32),
+                        lengths,
+                    ),
+                ]
+            )
+            self._alive = np.concatenate(
+                [
+                    self._alive,
+                    [person is not None for person in self._row_persons[first_row:]],
+                ]
+            )
+            self._pending = []
+
+        if len(self._row_persons) > 2 * len(self._person_rows) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        """
+        Drops tombstoned rows and renumbers the remaining ones.
+        """
+        alive = self._alive
+        keep = alive[self._nnz_rows]
+        lengths = np.diff(self._indptr)[alive]
+        self._indices = self._indices[keep]
+        self._indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self._nnz_rows = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+        self._row_persons = [p for p in self._row_persons if p is not None]
+        self._person_rows = {p: row for row, p in enumerate(self._row_persons)}
+        self._alive = np.ones(len(self._row_persons), dtype=bool)
+
+    def scores(self, weights: dict) -> np.ndarray:
+        """
+        Multiplies the matrix by a sparse query vector.
+
+        Args:
+            weights (dict): Maps skills to their weight in the query.
+
+        Returns:
+            np.ndarray: One score per row; tombstoned rows score zero.
+        """
+        self._flush()
+        query = np.zeros(len(self._skill_columns), dtype=np.float64)
+        for skill, weight in weights.items():
+            column = self._skill_columns.get(skill)
+            if column is not None:
+                query[column] = weight
+        row_scores = np.bincount(
+            self._nnz_rows,
+            weights=query[self._indices],
+            minlength=len(self._row_persons),
+        )
+        row_scores[~self._alive] = 0.0
+        return row_scores
+
+    def top_k(self, weights: dict, k: int = 10) -> list:
+        """
+        Returns the best scoring people for a query.
+
+        Args:
+            weights (dict): Maps skills to their weight in the query.
+            k (int, optional): The maximum number of results. Defaults to 10.
+
+        Returns:
+            list: (person, score) tuples with a positive score, best first and ties by name.
+        """
+        row_scores = self.scores(weights)
+        candidates = np.flatnonzero(row_scores > 0)
+        if k is not None and len(candidates) > k:
+            # Keep every candidate tied with the k-th best so ties are broken by name.
+            kth = np.partition(row_scores[candidates], len(candidates) - k)[
+                len(candidates) - k
+            ]
+            candidates = candidates[row_scores[candidates] >= kth]
+        results = sorted(
+            ((self._row_persons[row], float(row_scores[row])) for row in candidates),
+            key=lambda result: (-result[1], result[0]),
+        )
+        return results if k is None else results[:k]
+
+    def scores_of(self, weights: dict, persons) -> dict:
+        """
+        Returns the scores of some people for a query.
+
+        Args:
+            weights (dict): Maps skills to their weight in the query.
+            persons (iterable): The people to score.
+
+        Returns:
+            dict: Maps each given person with a positive score to that score.
+        """
+        row_scores = self.scores(weights)
+        result = {}
+        for person in persons:
+            row = self._person_rows.get(person)
+            if row is not None and row_scores[row] > 0:
+                result[person] = float(row_scores[row])
+        return result
+
+    def skill_sets(self):
+        """
+        Yields the skills of every person in the matrix, e.g. to learn which skills go together.
+
+        Yields:
+            tuple: The skills of one person.
+        """
+        self._flush()
+        skills = list(self._skill_columns)
+        for row in np.flatnonzero(self._alive).tolist():
+            columns = self._indices[self._indptr[row] : self._indptr[row + 1]]
+            yield tuple(skills[column] for column in columns.tolist())
+
+
+def idf_weights(skills: list, document_frequencies: list, total: int) -> dict:
+    """
+    Computes normalized inverse document frequency weights for the skills of a query.
+
+    Rare skills weigh more than common ones, and the weights sum to one, so multiplying
+    them by the binary person x skill matrix gives the fraction of the query a person covers.
+
+    Args:
+        skills (list): The normalized query skills.
+        document_frequencies (list): The number of people with each skill.
+        total (int): The number of people in the graph.
+
+    Returns:
+        dict: Maps each skill to its weight.
+    """
+    raw = {
+        skill: math.log((1 + total) / (1 + df)) + 1.0
+        for skill, df in zip(skills, document_frequencies)
+    }
+    norm = sum(raw.values())
+    return {skill: weight / norm for skill, weight in raw.items()} if norm else {}
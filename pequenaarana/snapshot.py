@@ -0,0 +1,331 @@
+import json
+import numpy as np
+from pathlib import Path
+
+SNAPSHOT_SIGNATURE = b"PQARANA"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_MAGIC = SNAPSHOT_SIGNATURE + bytes([SNAPSHOT_VERSION])
+ALIGNMENT = 8
+
+# Column type -> (array dtype, value used for missing entries)
+COLUMN_TYPES = {
+    "str": ("<i4", -1),
+    "int": ("<i8", 0),
+    "float": ("<f8", 0.0),
+    "bool": ("i1", -1),
+    "mixed": ("<i8", 0),
+}
+PYTHON_COLUMN_TYPES = {str: "str", int: "int", float: "float", bool: "bool"}
+# The type tags of the values of "mixed" columns, in tag order.
+MIXED_VALUE_TYPES = ["str", "int", "float", "bool"]
+
+
+def write_snapshot(path: Path, graph_attributes: dict, nodes, edges) -> None:
+    """
+    Writes a graph to a compact binary snapshot file.
+
+    The file holds a JSON header followed by 8-byte aligned arrays: a table of
+    interned strings (their UTF-8 text and the offset at which each starts),
+    one typed column per node and edge attribute, and the edges as pairs of
+    node indices. Graph-level attributes are kept in the header and must be
+    JSON serializable.
+
+    Args:
+        path (Path): The path of the file to write.
+        graph_attributes (dict): Graph-level attributes.
+        nodes (iterable): (id, attributes) tuples.
+        edges (iterable): (source, target, attributes) tuples.
+
+    Returns:
+        None
+    """
+    strings = {}
+    node_ids = []
+    node_attributes = []
+    for node_id, attributes in nodes:
+        node_ids.append(strings.setdefault(str(node_id), len(strings)))
+        node_attributes.append(attributes)
+    node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    sources, targets, edge_attributes = [], [], []
+    for source, target, attributes in edges:
+        sources.append(node_index[strings[str(source)]])
+        targets.append(node_index[strings[str(target)]])
+        edge_attributes.append(attributes)
+
+    arrays = {
+        "node_ids": np.array(node_ids, dtype="<i4"),
+        "edge_sources": np.array(sources, dtype="<i4"),
+        "edge_targets": np.array(targets, dtype="<i4"),
+    }
+    header = {
+        "graph": graph_attributes,
+        "node_count": len(node_ids),
+        "edge_count": len(sources),
+        "node_columns": _encode_columns("node", node_attributes, strings, arrays),
+        "edge_columns": _encode_columns("edge", edge_attributes, strings, arrays),
+    }
+    arrays["strings"] = np.frombuffer("".join(strings).encode("utf-8"), np.uint8)
+    arrays["string_offsets"] = np.zeros(len(strings) + 1, dtype="<i8")
+    np.cumsum([len(string) for string in strings], out=arrays["string_offsets"][1:])
+
+    header["arrays"] = {}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "offset": offset,
+            "length": len(array),
+        }
+        offset += _aligned(array.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (_aligned(len(header_bytes)) - len(header_bytes))
+
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(SNAPSHOT_MAGIC)
+        snapshot_file.write(np.uint64(len(header_bytes)).tobytes())
+        snapshot_file.write(header_bytes)
+        for array in arrays.values():
+            snapshot_file.write(array.tobytes())
+            snapshot_file.write(b"\0" * (_aligned(array.nbytes) - array.nbytes))
+
+
+def read_snapshot(path: Path):
+    """
+    Reads a binary snapshot file written by write_snapshot.
+
+    Args:
+        path (Path): The path of the snapshot file.
+
+    Returns:
+        tuple: (graph_attributes, nodes, edges), where nodes is a list of
+        (id, attributes) tuples and edges a list of (source, target, attributes) tuples.
+
+    Raises:
+        ValueError: If the file is not a snapshot, or was written by another
+            version of the format.
+    """
+    graph_attributes, node_ids, node_columns, sources, targets, edge_columns = (
+        read_snapshot_columns(path)
+    )
+    sources = [node_ids[i] for i in sources.tolist()]
+    targets = [node_ids[i] for i in targets.tolist()]
+    return (
+        graph_attributes,
+        list(zip(node_ids, column_rows(node_columns, len(node_ids)))),
+        list(zip(sources, targets, column_rows(edge_columns, len(sources)))),
+    )
+
+
+def read_snapshot_columns(path: Path, missing=None) -> tuple:
+    """
+    Reads a binary snapshot file written by write_snapshot, column by column.
+
+    The file is read in one call and decoded one whole array at a time into
+    Python lists and NumPy arrays, with no per-element parsing and without
+    building a dictionary per node or edge, so that a graph backend can be
+    filled from the columns in bulk. Nothing refers to the file afterwards, so
+    it can be overwritten while the graph is open.
+
+    Args:
+        path (Path): The path of the snapshot file.
+        missing (optional): The value of a column for the elements without that
+            attribute. Defaults to None.
+
+    Returns:
+        tuple: (graph_attributes, node_ids, node_columns, edge_sources,
+        edge_targets, edge_columns), where node_ids is a list, the columns are
+        dicts mapping attribute names to lists of values, one per node or edge,
+        and the edge sources and targets are integer arrays of node positions.
+
+    Raises:
+        ValueError: If the file is not a snapshot, or was written by another
+            version of the format.
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+    if bytes(data[: len(SNAPSHOT_SIGNATURE)]) != SNAPSHOT_SIGNATURE:
+        raise ValueError(f"'{path}' is not a Pequeña Araña snapshot file.")
+    if bytes(data[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        raise ValueError(
+            f"'{path}' was written by an unsupported version of the snapshot format."
+        )
+    header_start = len(SNAPSHOT_MAGIC) + 8
+    header_length = int(data[len(SNAPSHOT_MAGIC) : header_start].view("<u8")[0])
+    header = json.loads(bytes(data[header_start : header_start + header_length]))
+    body = header_start + header_length
+
+    def array(name):
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        start = body + spec["offset"]
+        return data[start : start + spec["length"] * dtype.itemsize].view(dtype)
+
+    text = bytes(array("strings")).decode("utf-8")
+    offsets = array("string_offsets").tolist()
+    strings = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+    node_ids = [strings[i] for i in array("node_ids").tolist()]
+    node_columns = _decode_columns(
+        "node", header["node_columns"], strings, array, missing
+    )
+    edge_columns = _decode_columns(
+        "edge", header["edge_columns"], strings, array, missing
+    )
+    sources = array("edge_sources").astype(np.int32)
+    targets = array("edge_targets").astype(np.int32)
+    return header["graph"], node_ids, node_columns, sources, targets, edge_columns
+
+
+def is_snapshot_file(path: Path) -> bool:
+    """
+    Checks whether a file starts with the snapshot signature, whatever its version.
+
+    Args:
+        path (Path): The path of the file to check.
+
+    Returns:
+        bool: True if the file is a snapshot.
+    """
+    with open(path, "rb") as snapshot_file:
+        return snapshot_file.read(len(SNAPSHOT_SIGNATURE)) == SNAPSHOT_SIGNATURE
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _encode_columns(
+    prefix: str, attribute_dicts: list, strings: dict, arrays: dict
+) -> list:
+    """
+    Converts per-element attribute dictionaries into typed columns.
+
+    Attributes holding values of different types are stored as "mixed" columns,
+    which add a type tag per value (its index in MIXED_VALUE_TYPES) and keep
+    floats as their 64-bit pattern. Values of other types are stored as strings.
+
+    Args:
+        prefix (str): Prefix of the array names, "node" or "edge".
+        attribute_dicts (list): One attribute dictionary per element.
+        strings (dict): The interned string table, extended in place.
+        arrays (dict): The arrays to write, extended in place.
+
+    Returns:
+        list: (name, type) pairs describing the columns, in array order.
+    """
+    column_types = {}
+    for attributes in attribute_dicts:
+        for name, value in attributes.items():
+            if value is None:
+                continue
+            column_type = PYTHON_COLUMN_TYPES.get(type(value), "str")
+            if column_types.setdefault(name, column_type) != column_type:
+                column_types[name] = "mixed"
+
+    columns = []
+    for number, (name, column_type) in enumerate(column_types.items()):
+        dtype, missing = COLUMN_TYPES[column_type]
+        present = np.zeros(len(attribute_dicts), dtype=np.uint8)
+        values = []
+        tags = []
+        for i, attributes in enumerate(attribute_dicts):
+            value = attributes.get(name)
+            if value is None:
+                values.append(missing)
+                tags.append(-1)
+                continue
+            present[i] = 1
+            value_type = column_type
+            if column_type == "mixed":
+                value_type = PYTHON_COLUMN_TYPES.get(type(value), "str")
+                tags.append(MIXED_VALUE_TYPES.index(value_type))
+                if value_type == "float":
+                    value = int(np.float64(value).view("<i8"))
+            if value_type == "str":
+                value = strings.setdefault(str(value), len(strings))
+            values.append(value)
+        arrays[f"{prefix}_{number}_values"] = np.array(values, dtype=dtype)
+        arrays[f"{prefix}_{number}_present"] = present
+        if column_type == "mixed":
+            arrays[f"{prefix}_{number}_tags"] = np.array(tags, dtype="i1")
+        columns.append((name, column_type))
+    return columns
+
+
+def _decode_columns(
+    prefix: str, columns: list, strings: list, array, missing=None
+) -> dict:
+    """
+    Decodes typed columns into lists of values.
+
+    Args:
+        prefix (str): Prefix of the array names, "node" or "edge".
+        columns (list): (name, type) pairs as returned by _encode_columns.
+        strings (list): The interned string table.
+        array (callable): Returns a named array from the snapshot.
+        missing (optional): The value of absent entries. Defaults to None.
+
+    Returns:
+        dict: Maps attribute names to lists holding one value per element.
+    """
+    decoded = {}
+    table = strings + [missing]
+    for number, (name, column_type) in enumerate(columns):
+        values = array(f"{prefix}_{number}_values")
+        if column_type == "str":
+            decoded[name] = list(map(table.__getitem__, values.tolist()))
+            continue
+        if column_type == "mixed":
+            tags = array(f"{prefix}_{number}_tags").tolist()
+            decoded[name] = _decode_mixed(values, tags, strings, missing)
+            continue
+        if column_type == "bool":
+            values = values.astype(bool)
+        decoded[name] = values.tolist()
+        present = array(f"{prefix}_{number}_present").astype(bool)
+        if not present.all():
+            for i in np.flatnonzero(~present).tolist():
+                decoded[name][i] = missing
+    return decoded
+
+
+def column_rows(columns: dict, count: int, missing=None) -> list:
+    """
+    Rebuilds one attribute dictionary per element from decoded columns.
+
+    Args:
+        columns (dict): Columns as returned by read_snapshot_columns.
+        count (int): The number of elements.
+        missing (optional): The value of absent entries. Defaults to None.
+
+    Returns:
+        list: One attribute dictionary per element.
+    """
+    rows = [{} for _ in range(count)]
+    for name, values in columns.items():
+        for row, value in zip(rows, values):
+            if value is not missing:
+                row[name] = value
+    return rows
+
+
+def _decode_mixed(values: np.ndarray, tags: list, strings: list, missing) -> list:
+    """
+    Decodes the values of a "mixed" column according to their type tags.
+    """
+    integers = values.tolist()
+    floats = values.view("<f8").tolist()
+    decoded = []
+    for tag, integer, real in zip(tags, integers, floats):
+        if tag < 0:
+            decoded.append(missing)
+        else:
+            value_type = MIXED_VALUE_TYPES[tag]
+            if value_type == "str":
+                decoded.append(strings[integer])
+            elif value_type == "float":
+                decoded.append(real)
+            elif value_type == "bool":
+                decoded.append(bool(integer))
+            else:
+                decoded.append(integer)
+    return decoded
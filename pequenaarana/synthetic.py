@@ -0,0 +1,123 @@
+import bisect
+import itertools
+import random
+
+from pequenaarana.connection_graph import ConnectionGraph
+
+ROLES = ["Engineer", "Manager", "Analyst", "Designer", "Consultant", "Director"]
+
+_SYLLABLES = "ka lo mi ner po ru sa ti ven zu dex gra".split()
+
+
+def zipf_cumulative_weights(count: int, exponent: float) -> list:
+    """
+    Returns the cumulative weights of a Zipf distribution over ranks 1 to count.
+
+    Args:
+        count (int): The number of ranks.
+        exponent (float): The skew of the distribution; 0 is uniform.
+
+    Returns:
+        list: Cumulative weights, for random.choices(cum_weights=...).
+    """
+    return list(itertools.accumulate(rank**-exponent for rank in range(1, count + 1)))
+
+
+def skill_name(rank: int) -> str:
+    """
+    Returns a pronounceable, unique skill name for a popularity rank, so that
+    prefix, substring and fuzzy lookups see realistic n-gram statistics.
+
+    Args:
+        rank (int): The zero-based popularity rank of the skill.
+
+    Returns:
+        str: The skill name.
+    """
+    syllables = []
+    rank += len(_SYLLABLES)
+    while rank:
+        rank, digit = divmod(rank, len(_SYLLABLES))
+        syllables.append(_SYLLABLES[digit])
+    return "".join(reversed(syllables))
+
+
+def generate_people(
+    count: int,
+    skills: int = 2000,
+    skills_per_person: int = 5,
+    orgs: int = 500,
+    places: int = 200,
+    accounts: int = 1000,
+    account_share: float = 0.5,
+    exponent: float = 1.1,
+    seed: int = 0,
+):
+    """
+    Generates person records for a synthetic professional graph.
+
+    Skills, organizations, places and accounts are drawn from Zipf distributions,
+    so a few of each are very common and most are rare, as in real HR exports.
+    The records are accepted by ConnectionGraph.add_people and add_person, and
+    the same seed always produces the same records.
+
+    Args:
+        count (int): The number of people.
+        skills (int, optional): The number of distinct skills. Defaults to 2000.
+        skills_per_person (int, optional): The mean number of skills per person. Defaults to 5.
+        orgs (int, optional): The number of distinct organizations. Defaults to 500.
+        places (int, optional): The number of distinct places. Defaults to 200.
+        accounts (int, optional): The number of distinct accounts. Defaults to 1000.
+        account_share (float, optional): The fraction of people linked to an account. Defaults to 0.5.
+        exponent (float, optional): The skew of the Zipf distributions. Defaults to 1.1.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Yields:
+        dict: Records with "name", "role", "place", "org", "account", "skills" and "notes" entries.
+    """
+    rng = random.Random(seed)
+    skill_names = [skill_name(rank) for rank in range(skills)]
+    skill_weights = zipf_cumulative_weights(skills, exponent)
+    org_weights = zipf_cumulative_weights(orgs, exponent)
+    place_weights = zipf_cumulative_weights(places, exponent)
+    account_weights = zipf_cumulative_weights(accounts, exponent)
+
+    def draw(weights):
+        return bisect.bisect(weights, rng.random() * weights[-1])
+
+    for i in range(count):
+        drawn = rng.choices(
+            skill_names,
+            cum_weights=skill_weights,
+            k=rng.randint(1, 2 * skills_per_person - 1),
+        )
+        yield {
+            "name": f"Person {i:07d}",
+            "role": rng.choice(ROLES),
+            "place": f"Place {draw(place_weights)}",
+            "org": f"Org {draw(org_weights)}",
+            "account": (
+                f"Account {draw(account_weights)}"
+                if rng.random() < account_share
+                else ""
+            ),
+            "skills": ", ".join(dict.fromkeys(drawn)),
+            "notes": "",
+        }
+
+
+def generate_graph(count: int, backend: str = "networkx", **options) -> ConnectionGraph:
+    """
+    Builds a synthetic professional graph that follows the expected schema.
+
+    Args:
+        count (int): The number of people.
+        backend (str, optional): The graph backend, see ConnectionGraph.BACKENDS. Defaults to "networkx".
+        **options: Further arguments for generate_people.
+
+    Returns:
+        ConnectionGraph: The generated graph.
+    """
+    g = ConnectionGraph({"name": f"synthetic-{count}"}, backend=backend)
+    g.add_people(generate_people(count, **options))
+    return g
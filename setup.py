@@ -4,7 +4,7 @@ setup(
     name="pequena-arana",
     version="1.0",
     packages=find_packages(),
-    install_requires=["networkx", "pytest", "npyscreen"],
+    install_requires=["networkx", "numpy", "pytest", "npyscreen"],
     license="MIT",
     long_description=open("README.md").read(),
 )
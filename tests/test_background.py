@@ -0,0 +1,96 @@
+import threading
+import pytest
+from pathlib import Path
+from pequenaarana.background import BackgroundTask, TaskCancelled
+from pequenaarana.connection_graph import ConnectionGraph, load_graph, save_graph
+
+
+def test_background_task_result_and_progress():
+    """
+    Test function to verify that a background task loads a graph and reports its progress.
+    """
+    graph = ConnectionGraph()
+    graph.add_people(
+        {"name": f"person-{i}", "org": "Company", "skills": "Python"}
+        for i in range(200)
+    )
+    filename = Path("/tmp/background_task.graphml")
+    save_graph(graph, filename, compact=True)
+
+    task = BackgroundTask(load_graph, filename, report_progress=True, status="Load")
+    loaded = task.result(timeout=30)
+    assert task.done and not task.cancelled
+    assert task.fraction == 1.0
+    assert task.progress[0] == task.progress[1] == filename.stat().st_size
+    assert len(loaded.nodes) == 201
+
+
+def test_background_task_cancellation():
+    """
+    Test function to verify that cancelling a task stops it at its next progress report.
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def operation(progress):
+        started.set()
+        release.wait(10)
+        progress(1, 2)
+        return "finished"
+
+    task = BackgroundTask(operation, report_progress=True)
+    started.wait(10)
+    task.cancel()
+    release.set()
+    with pytest.raises(TaskCancelled):
+        task.result(timeout=10)
+    assert task.cancelled
+
+
+def test_cancelled_save_keeps_existing_file():
+    """
+    Test function to verify that aborting a save through its progress callback leaves the file untouched.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company")
+    filename = Path("/tmp/cancelled_save.graphml")
+    filename.write_text("previous", encoding="utf-8")
+
+    def cancel(written, total):
+        raise TaskCancelled()
+
+    with pytest.raises(TaskCancelled):
+        save_graph(graph, filename, progress=cancel)
+    assert filename.read_text(encoding="utf-8") == "previous"
+    assert not Path("/tmp/.tmp-cancelled_save.graphml").exists()
+
+
+@pytest.mark.parametrize(
+    "match, order", [("exact", "label"), ("boolean", "label"), ("exact", "centrality")]
+)
+def test_search_reports_progress_and_can_be_cancelled(match, order):
+    """
+    Test function to verify that search_people reports progress in every stage and stops when its callback raises.
+    """
+    graph = ConnectionGraph()
+    graph.add_people(
+        {"name": f"person-{i}", "org": f"org-{i % 7}", "skills": "Python, Go"}
+        for i in range(200)
+    )
+    graph._invalidate_indexes()
+    query = "python AND go" if match == "boolean" else "python"
+    reports = []
+    results = graph.search_people(
+        query, match, order=order, progress=lambda *report: reports.append(report)
+    )
+    assert len(results) == 200
+    assert reports and all(done <= total for done, total in reports)
+    assert reports == sorted(reports, key=lambda report: report[0] / report[1])
+
+    def cancel(done, total):
+        raise TaskCancelled()
+
+    graph._invalidate_indexes()
+    with pytest.raises(TaskCancelled):
+        graph.search_people(query, match, order=order, progress=cancel)
+    assert graph._indexes_stale
+    assert len(graph.search_people(query, match, order=order)) == 200
@@ -1,8 +1,14 @@
+import networkx as nx
+import pytest
 from pathlib import Path
 from pequenaarana.connection_graph import (
     ConnectionGraph,
     export_graph_to_graphml_file,
     import_graph_from_graphml_file,
+    import_graphs_from_directory,
+    import_people_from_csv_file,
+    load_graph,
+    save_graph,
 )
 
 
@@ -81,3 +87,678 @@ def test_search_for_person_with_skill():
     )
     records, _ = graph.search_for_person_with_skill("Python")
     assert "John Doe" in records
+
+
+def test_skill_index_tracks_updates():
+    """
+    Test function to verify that the skill index follows updates to PERSON nodes.
+
+    It checks re-adding a person with new skills, skills with surrounding whitespace and clearing the graph.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", skills="Python, Spark")
+    graph.add_person("John Doe", skills="python")
+
+    records, _ = graph.search_for_person_with_skill(" SPARK ")
+    assert set(records) == {"Jane Roe"}
+
+    graph.add_person("Jane Roe", skills="Scala")
+    records, _ = graph.search_for_person_with_skill("python")
+    assert set(records) == {"John Doe"}
+    records, _ = graph.search_for_person_with_skill("scala")
+    assert set(records) == {"Jane Roe"}
+
+    graph.clear()
+    records, _ = graph.search_for_person_with_skill("scala")
+    assert records == {}
+
+
+def test_skill_index_rebuilt_on_import():
+    """
+    Test function to verify that an imported graph can be searched by skill.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("John Doe", org="Company", skills="Python,Kafka")
+
+    filename = Path("/tmp/graph_skill_index.graphml")
+    export_graph_to_graphml_file(graph, filename)
+    imported_graph = import_graph_from_graphml_file(filename)
+
+    records, neighbors = imported_graph.search_for_person_with_skill("kafka")
+    assert set(records) == {"John Doe"}
+    assert "Company" in neighbors["John Doe"]
+
+
+def test_search_for_person_with_partial_skill():
+    """
+    Test function to verify prefix, substring and fuzzy skill searches.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", skills="Kubernetes, Python")
+    graph.add_person("John Doe", skills="PostgreSQL")
+
+    records, _ = graph.search_for_person_with_skill("kube")
+    assert records == {}
+    records, _ = graph.search_for_person_with_skill("kube", match="prefix")
+    assert set(records) == {"Jane Roe"}
+    records, _ = graph.search_for_person_with_skill("sql", match="substring")
+    assert set(records) == {"John Doe"}
+    records, _ = graph.search_for_person_with_skill("pyhton", match="fuzzy")
+    assert set(records) == {"Jane Roe"}
+
+
+def test_rank_people_by_skills():
+    """
+    Test function to verify that multi-skill queries rank people by weighted coverage.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", skills="Python, Spark, AWS")
+    graph.add_person("John Doe", skills="Python, AWS")
+    graph.add_person("Max Mustermann", skills="Spark")
+    graph.add_person("Erika Mustermann", skills="Python")
+    graph.add_person("Juan Perez", skills="Java")
+
+    ranking = graph.rank_people_by_skills("python, spark, aws")
+    names = [name for name, _ in ranking]
+    assert names[0] == "Jane Roe"
+    assert ranking[0][1] == pytest.approx(1.0)
+    assert "Juan Perez" not in names
+    assert names.index("Max Mustermann") < names.index("Erika Mustermann")
+
+    graph.add_person("Juan Perez", skills="Java, Spark, AWS, Python")
+    assert graph.rank_people_by_skills("python, spark, aws", k=2)[1][0] == "Juan Perez"
+
+
+def test_add_people_matches_add_person():
+    """
+    Test function to verify that bulk ingestion builds the same graph as repeated add_person calls.
+    """
+    people = [
+        {"name": "Jane Roe", "org": "Company", "place": "Madrid", "skills": "Kafka"},
+        {"name": "John Doe", "org": "Company", "account": "ACME", "role": "Lead"},
+        {"name": "Max Mustermann", "place": "Madrid", "skills": "Python"},
+    ]
+    expected = ConnectionGraph()
+    for person in people:
+        expected.add_person(**person)
+
+    graph = ConnectionGraph()
+    assert graph.add_people(people) == 3
+
+    assert dict(graph.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert dict(graph.edges) == dict(expected.edges)
+    records, _ = graph.search_for_person_with_skill("kafka")
+    assert set(records) == {"Jane Roe"}
+
+
+def test_add_nodes_and_edges_skip_unknown_kinds():
+    """
+    Test function to verify that bulk node and edge insertion skips unknown kinds.
+    """
+    graph = ConnectionGraph()
+    added = graph.add_nodes(
+        [("node1", "PERSON", {"skills": "Go"}), ("node2", "ORGANIZATION"), ("x", "PET")]
+    )
+    assert added == 2
+    assert "x" not in graph.nodes
+    assert (
+        graph.add_edges([("node1", "node2", "ASSOCWITH"), ("node1", "x", "OWNS")]) == 1
+    )
+    assert graph.edges["node1", "node2"]["kind"] == "ASSOCWITH"
+    records, _ = graph.search_for_person_with_skill("go")
+    assert set(records) == {"node1"}
+
+
+def test_import_people_from_csv_file():
+    """
+    Test function to verify that people can be bulk loaded from a CSV file.
+    """
+    filename = Path("/tmp/people.csv")
+    filename.write_text(
+        "name,role,place,org,account,skills,notes\n"
+        'Jane Roe,Engineer,Madrid,Company,ACME,"Python, Kafka",\n'
+        "John Doe,,,Company,,Scala,\n",
+        encoding="utf-8",
+    )
+    graph = ConnectionGraph()
+    assert import_people_from_csv_file(graph, filename) == 2
+    assert graph.nodes["Company"]["kind"] == "ORGANIZATION"
+    assert ("John Doe", "Company") in graph.edges
+    assert graph.nodes["Jane Roe"]["role"] == "Engineer"
+
+
+def test_import_graph_validates_kinds():
+    """
+    Test function to verify that importing skips nodes and edges of unknown kinds and reports progress.
+    """
+    filename = Path("/tmp/graph_invalid_kinds.graphml")
+    filename.write_text(
+        """<?xml version='1.0' encoding='utf-8'?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="kind" attr.type="string" />
+  <key id="d1" for="edge" attr.name="kind" attr.type="string" />
+  <key id="d2" for="node" attr.name="skills" attr.type="string" />
+  <graph edgedefault="directed">
+    <edge source="Jane Roe" target="Company"><data key="d1">ASSOCWITH</data></edge>
+    <node id="Jane Roe"><data key="d0">PERSON</data><data key="d2">Go</data></node>
+    <node id="Company"><data key="d0">ORGANIZATION</data></node>
+    <node id="Rex"><data key="d0">PET</data></node>
+    <edge source="Jane Roe" target="Rex"><data key="d1">ASSOCWITH</data></edge>
+    <edge source="Jane Roe" target="Company"><data key="d1">OWNS</data></edge>
+  </graph>
+</graphml>
+""",
+        encoding="utf-8",
+    )
+    progress = []
+    graph = import_graph_from_graphml_file(
+        filename, progress=lambda read, total: progress.append(read)
+    )
+
+    assert set(graph.nodes) == {"Jane Roe", "Company"}
+    assert list(graph.edges(data="kind")) == [("Jane Roe", "Company", "ASSOCWITH")]
+    assert progress[-1] == filename.stat().st_size
+    records, _ = graph.search_for_person_with_skill("go")
+    assert set(records) == {"Jane Roe"}
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_save_and_load_graph_formats(backend):
+    """
+    Test function to verify that graphs round trip through both the snapshot and GraphML formats.
+    """
+    graph = ConnectionGraph({"name": "team"}, backend=backend)
+    graph.add_person("Jane Roe", org="Company", account="ACME", skills="Python")
+    assert graph.graph == {"name": "team"}
+
+    for filename in (
+        Path(f"/tmp/graph_format_{backend}.pqa"),
+        Path(f"/tmp/graph_format_{backend}.graphml"),
+    ):
+        save_graph(graph, filename)
+        loaded = load_graph(filename, backend=backend)
+        assert loaded.backend == backend
+        assert loaded.nodes == graph.nodes
+        assert dict(loaded.edges) == dict(graph.edges)
+        assert loaded.graph == {"name": "team"}
+        records, _ = loaded.search_for_person_with_skill("python")
+        assert set(records) == {"Jane Roe"}
+
+
+def test_node_style_written_on_export_only():
+    """
+    Test function to verify that node labels, colors and sizes are only materialized on GraphML export.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company", skills="Python")
+    graph.add_node("Madrid", "PLACE")
+    graph.nodes["Madrid"]["r"] = 1
+    assert graph.nodes["Company"] == {"kind": "ORGANIZATION"}
+
+    filename = Path("/tmp/graph_style.graphml")
+    export_graph_to_graphml_file(graph, filename)
+    exported = nx.read_graphml(filename)
+    assert exported.nodes["Company"] == {
+        "label": "Company",
+        "kind": "ORGANIZATION",
+        **ConnectionGraph.NODECOLORS["ORGANIZATION"],
+        **ConnectionGraph.NODESIZE,
+    }
+    assert exported.nodes["Madrid"]["r"] == 1
+
+    loaded = import_graph_from_graphml_file(filename)
+    assert dict(loaded.nodes(data=True)) == dict(graph.nodes(data=True))
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_get_person_profiles(backend):
+    """
+    Test function to verify that person profiles resolve linked places, organizations and accounts.
+    """
+    graph = ConnectionGraph(backend=backend)
+    graph.add_person(
+        "Jane Roe", role="Engineer", place="Madrid", org="Company", skills="Go"
+    )
+    graph.add_person("John Doe", org="Company", account="ACME", skills="Go, Kafka")
+    graph.add_person_org_edge("John Doe", "Other Company")
+    graph.add_edge("John Doe", "Jane Roe", "ASSOCWITH")
+
+    profiles = graph.get_person_profiles(["Jane Roe", "John Doe", "Company", "Nobody"])
+    assert set(profiles) == {"Jane Roe", "John Doe"}
+    assert profiles["Jane Roe"] == {
+        "label": "Jane Roe",
+        "role": "Engineer",
+        "skills": "Go",
+        "notes": "",
+        "place": ["Madrid"],
+        "org": ["Company"],
+        "account": [],
+    }
+    assert sorted(profiles["John Doe"]["org"]) == ["Company", "Other Company"]
+    assert profiles["John Doe"]["account"] == ["ACME"]
+    assert set(graph.search_person_profiles("kafka")) == {"John Doe"}
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_filter_people(backend):
+    """
+    Test function to verify reverse lookups and compound filters over skills, places, organizations and accounts.
+    """
+    graph = ConnectionGraph(backend=backend)
+    graph.add_person("Jane Roe", place="Madrid", account="ACME", skills="Kafka, Go")
+    graph.add_person("John Doe", place="Madrid", account="ACME", skills="Python")
+    graph.add_person("Max Mustermann", place="Berlin", account="ACME", skills="Kafka")
+    graph.add_person("Erika Mustermann", place="Madrid", org="ACME Corp")
+
+    assert graph.people_linked_to("ACME") == {"Jane Roe", "John Doe", "Max Mustermann"}
+    assert graph.people_linked_to("Madrid") == {
+        "Jane Roe",
+        "John Doe",
+        "Erika Mustermann",
+    }
+    assert graph.people_linked_to("Jane Roe") == set()
+    assert graph.filter_people(skills="kafka", place="Madrid", account="ACME") == [
+        "Jane Roe"
+    ]
+    assert graph.filter_people(skills="kafk", match="prefix") == [
+        "Jane Roe",
+        "Max Mustermann",
+    ]
+    assert graph.filter_people(skills="kafka, python") == []
+    assert graph.filter_people(place="ACME") == []
+    assert graph.filter_people(org="ACME Corp", place="Madrid") == ["Erika Mustermann"]
+    assert graph.filter_people() == []
+
+
+def test_query_people():
+    """
+    Test function to verify that boolean skill queries run against the graph.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", skills="Python, Spark")
+    graph.add_person("John Doe", skills="Scala, Spark, Junior")
+    graph.add_person("Max Mustermann", skills="Java")
+    assert graph.query_people("(python OR scala) AND spark AND NOT junior") == [
+        "Jane Roe"
+    ]
+    with pytest.raises(ValueError):
+        graph.query_people("python AND (")
+
+
+def test_import_graphs_from_directory():
+    """
+    Test function to verify that a directory of GraphML files is merged into one graph with deduplicated nodes.
+    """
+    directory = Path("/tmp/graph_directory")
+    directory.mkdir(exist_ok=True)
+    for path in directory.iterdir():
+        path.unlink()
+    first = ConnectionGraph({"name": "first"})
+    first.add_person("Jane Roe", role="CTO", org="ACME Corp", skills="Python, Go")
+    first.add_person("John Doe", place="Madrid")
+    second = ConnectionGraph({"name": "second"})
+    second.add_person("Jane Roe", org="acme  corp", place="madrid", skills="go, Rust")
+    second.add_person("Ann Lee", org="Initech", account="Globex")
+    export_graph_to_graphml_file(first, directory / "a.graphml")
+    export_graph_to_graphml_file(second, directory / "b.graphml.gz")
+    (directory / "notes.txt").write_text("not a graph")
+
+    progress = []
+    g = import_graphs_from_directory(
+        directory, workers=2, progress=lambda *step: progress.append(step)
+    )
+    assert progress == [(1, 2), (2, 2)]
+    assert g.graph["name"] == "first"
+    assert sorted(g.nodes) == [
+        "ACME Corp",
+        "Ann Lee",
+        "Globex",
+        "Initech",
+        "Jane Roe",
+        "John Doe",
+        "Madrid",
+    ]
+    assert g.nodes["Jane Roe"]["skills"] == "Python, Go, Rust"
+    assert g.nodes["Jane Roe"]["role"] == "CTO"
+    assert set(g._internal_graph.successors("Jane Roe")) == {"ACME Corp", "Madrid"}
+    assert sorted(g.people_linked_to("Madrid")) == ["Jane Roe", "John Doe"]
+    assert set(g.search_for_person_with_skill("rust")[0]) == {"Jane Roe"}
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_deduplicate_nodes(backend):
+    """
+    Test function to verify that duplicate organizations and places are merged and their edges rewired.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Jane Roe", org="Acme Inc", place="Madrid", skills="Python")
+    g.add_person("John Doe", org="ACME", place="Madird")
+    g.add_person("Ann Lee", org="Acme, Inc.", place="Team 1")
+    g.add_person("Bob Ray", org="Acme Inc", place="Team 2")
+    g.add_person("Jane  Roe", org="Initech")
+    g.add_person("Eve Ito", place="Madrid")
+
+    assert g.find_duplicate_nodes("ORGANIZATION") == [
+        ["ACME", "Acme Inc", "Acme, Inc."]
+    ]
+    merged = g.deduplicate_nodes()
+    assert merged == {"Acme Inc": ["ACME", "Acme, Inc."], "Madrid": ["Madird"]}
+    assert "ACME" not in g.nodes and "Madird" not in g.nodes
+    assert g.people_linked_to("Acme Inc") == {
+        "Jane Roe",
+        "John Doe",
+        "Ann Lee",
+        "Bob Ray",
+    }
+    assert g.people_linked_to("Madrid") == {"Jane Roe", "John Doe", "Eve Ito"}
+    assert {"Team 1", "Team 2", "Jane  Roe"} <= set(g.nodes)
+    assert len(g.edges) == 10
+
+
+def test_merge_nodes_replayed_from_journal():
+    """
+    Test function to verify that merged persons keep the union of their skills, also after reloading the journal.
+    """
+    filename = Path("/tmp/graph_merge_nodes.pqa")
+    g = ConnectionGraph()
+    g.add_person("Jane Roe", org="Company", skills="Python")
+    save_graph(g, filename, compact=True)
+    g.add_person("J. Roe", org="Other", role="CTO", skills="python, Go")
+    assert g.merge_nodes("Jane Roe", ["J. Roe", "Nobody"]) == 1
+    assert g.merge_nodes("Nobody", ["Jane Roe"]) == 0
+    save_graph(g, filename)
+
+    loaded = load_graph(filename)
+    for graph in (g, loaded):
+        assert graph.nodes["Jane Roe"]["skills"] == "Python, Go"
+        assert graph.nodes["Jane Roe"]["role"] == "CTO"
+        assert set(graph._internal_graph.successors("Jane Roe")) == {"Company", "Other"}
+        assert set(graph.search_for_person_with_skill("go")[0]) == {"Jane Roe"}
+    loaded.detach_journal()
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_find_experts(backend):
+    """
+    Test function to verify that experts are ranked by skill and closeness, and that the projection is updated incrementally.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Ana", org="Acme", account="Globex", skills="Go")
+    g.add_person("Bo", org="Acme", skills="Python")
+    g.add_person("Cy", account="Globex", skills="python, SQL")
+    g.add_person("Ed", org="Initech", skills="Python")
+    g.add_person("Fay", place="Madrid", skills="Python")
+    g.add_person_org_edge("Bo", "Initech")
+
+    assert g.find_experts("Ana", "python") == [
+        ("Bo", 1.0, 1),
+        ("Cy", 0.5, 1),
+        ("Ed", 0.5, 2),
+    ]
+    assert g.find_experts("Ana", "python", max_hops=1, k=1) == [("Bo", 1.0, 1)]
+    assert g.find_experts("Acme", "python") == []
+
+    row = g._projection.row("Ana")
+    g.add_person_org_edge("Fay", "Acme")
+    g.add_person_account_edge("Bo", "Globex")
+    assert g._projection.row("Ana") is row
+    assert row == {"Bo": 1.5, "Cy": 0.5, "Fay": 1.0}
+    assert g._projection.row("Bo")["Fay"] == 1.0
+    assert [name for name, _, _ in g.find_experts("Ana", "python")] == [
+        "Bo",
+        "Fay",
+        "Ed",
+        "Cy",
+    ]
+
+    g._projection.clear()
+    assert g._projection.row("Ana") == row
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_introduction_path(backend):
+    """
+    Test function to verify that introduction paths follow shared nodes both ways and that cached searches are invalidated by mutations.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Me", org="Acme")
+    g.add_person("Bo", org="Acme", place="Madrid")
+    g.add_person("Cy", place="Madrid", account="Globex")
+    g.add_person("Jane", account="Globex")
+    g.add_person("Ed", org="Initech")
+
+    assert g.introduction_path("Me", "Jane") == [
+        "Me",
+        "Acme",
+        "Bo",
+        "Madrid",
+        "Cy",
+        "Globex",
+        "Jane",
+    ]
+    assert g.introduction_path("Me", "Me") == ["Me"]
+    assert g.introduction_path("Me", "Cy") == ["Me", "Acme", "Bo", "Madrid", "Cy"]
+    assert g.introduction_path("Me", "Jane", max_length=2) == []
+    assert g.introduction_path("Me", "Jane", via=["org", "account"]) == []
+    assert g.introduction_path("Me", "Ed") == []
+    assert g.introduction_path("Me", "Acme") == []
+    assert g.introduction_path("Me", "Jane", via=["friends"]) == []
+
+    search = g._introductions[("Me", frozenset(["ASSOCWITH", "ONACCOUNT", "BASEDIN"]))]
+    g.introduction_path("Me", "Bo")
+    assert (
+        g._introductions[("Me", frozenset(["ASSOCWITH", "ONACCOUNT", "BASEDIN"]))]
+        is search
+    )
+
+    g.add_person_account_edge("Bo", "Globex")
+    assert g.introduction_path("Me", "Jane") == [
+        "Me",
+        "Acme",
+        "Bo",
+        "Globex",
+        "Jane",
+    ]
+    g.merge_nodes("Acme", ["Initech"])
+    assert g.introduction_path("Me", "Ed") == ["Me", "Acme", "Ed"]
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_centrality(backend):
+    """
+    Test function to verify that centrality scores are cached per graph version and recomputed after changes.
+    """
+    g = ConnectionGraph(backend=backend)
+    for name in ["Ana", "Bo", "Cy"]:
+        g.add_person(name, org="Acme")
+    g.add_person("Ed", org="Initech")
+    g.add_person("Fay")
+
+    scores = g.centrality()
+    assert set(scores) == {"Ana", "Bo", "Cy", "Ed", "Fay"}
+    assert scores["Ana"] == pytest.approx(scores["Cy"])
+    assert scores["Ed"] > scores["Ana"] > scores["Fay"]
+    assert sum(g.centrality(g.nodes).values()) == pytest.approx(1.0)
+    assert g.centrality(["Ana", "Nobody"]) == {"Ana": scores["Ana"]}
+    cached = g._centrality
+    g.centrality()
+    assert g._centrality is cached
+
+    g.add_person_place_edge("Bo", "Madrid")
+    g.add_person_place_edge("Fay", "Madrid")
+    updated = g.centrality()
+    assert g._centrality is not cached
+    assert updated["Bo"] > updated["Ana"]
+    assert updated["Fay"] > scores["Fay"]
+    g.merge_nodes("Acme", ["Initech"])
+    assert g.centrality()["Ed"] == pytest.approx(g.centrality()["Ana"])
+
+
+def test_rank_people_semantically():
+    """
+    Test function to verify that semantic search finds people with related skills and that embeddings are saved and loaded with the graph.
+    """
+    g = ConnectionGraph()
+    assert g.rank_people_semantically("ml") == []
+    g.add_people(
+        {"name": f"Person {i}", "skills": ", ".join(skills)}
+        for i, skills in enumerate(
+            [
+                ("ml", "pytorch", "python"),
+                ("ml", "tensorflow"),
+                ("java", "spring"),
+                ("java", "kotlin", "spring"),
+                ("excel", "sap"),
+            ]
+        )
+    )
+    g.add_person("Jane Roe", skills="machine learning, pytorch, tensorflow")
+    g.add_person("John Doe", skills="Spring, Hibernate, Java")
+    g.train_skill_embeddings(dimensions=4)
+
+    ranked = [person for person, _ in g.rank_people_semantically("ML", k=None)]
+    assert "Jane Roe" in ranked[:3]
+    assert "John Doe" not in ranked
+
+    save_graph(g, Path("/tmp/test_semantic.pqa"))
+    loaded = load_graph(Path("/tmp/test_semantic.pqa"))
+    assert loaded._skill_embeddings.skills == g._skill_embeddings.skills
+    assert [
+        person for person, _ in loaded.rank_people_semantically("ML", k=None)
+    ] == ranked
+    loaded.detach_journal()
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_undo_redo(backend):
+    """
+    Test function to verify that operations are undone and redone as single steps, including clear.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Ana", org="Acme", skills="Python")
+    g.enable_history()
+    assert not g.can_undo and not g.undo()
+
+    g.add_person("Bo", org="Acme", place="Madrid", skills="Go")
+    g.merge_nodes("Ana", ["Bo"])
+    assert set(g.nodes) == {"Ana", "Acme", "Madrid"}
+    assert g.undo()
+    assert set(g.nodes) == {"Ana", "Bo", "Acme", "Madrid"}
+    assert ("Bo", "Madrid") in g.edges and ("Ana", "Madrid") not in g.edges
+    assert g.nodes["Ana"]["skills"] == "Python"
+    assert g.query_people("go") == ["Bo"]
+    assert g.undo()
+    assert set(g.nodes) == {"Ana", "Acme"}
+    assert g.query_people("go") == []
+    assert g.redo() and g.redo() and not g.redo()
+    assert ("Ana", "Madrid") in g.edges and "Bo" not in g.nodes
+
+    g.clear()
+    assert len(g.nodes) == 0
+    assert g.undo()
+    assert set(g.nodes) == {"Ana", "Acme", "Madrid"}
+    assert g.query_people("go") == ["Ana"]
+    g.add_node("Initech", "ORGANIZATION")
+    assert not g.can_redo
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_snapshots(backend):
+    """
+    Test function to verify that snapshots show the graph as it was while it keeps changing, and can be restored.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Ana", org="Acme", skills="Python")
+    g.add_person("Bo", org="Acme")
+    view = g.snapshot("before")
+    assert view.name == "before"
+
+    g.add_person("Cy", org="Acme")
+    g.add_person("Ana", place="Madrid", skills="Go")
+    g.merge_nodes("Ana", ["Bo"])
+    assert set(view.nodes()) == {"Ana", "Bo", "Acme"}
+    assert sorted(view.predecessors("Acme")) == ["Ana", "Bo"]
+    assert view.successors("Ana") == ["Acme"]
+    assert view.node("Ana")["skills"] == "Python"
+    assert view.edge("Ana", "Madrid") is None and "Cy" not in view
+
+    g.clear()
+    g.add_person("Ed", org="Initech")
+    assert set(view.edges()) == {("Ana", "Acme"), ("Bo", "Acme")}
+    assert g.restore("before")
+    assert set(g.nodes) == {"Ana", "Bo", "Acme"}
+    assert g.query_people("python") == ["Ana"]
+
+    g.add_person("Fay", org="Acme")
+    assert g.restore("before")
+    assert "Fay" not in g.nodes
+    assert not g.restore("missing")
+    g.drop_snapshot("before")
+    assert not g._snapshots
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_snapshot_queries(backend):
+    """
+    Test function to verify that snapshots answer skill searches, profiles and filters as of when they were taken.
+    """
+    g = ConnectionGraph(backend=backend)
+    g.add_person("Ana", role="Lead", org="Acme", place="Madrid", skills="Python, Kafka")
+    g.add_person("Bo", org="Acme", account="Bank", skills="Python")
+    view = g.snapshot("before")
+
+    g.add_person("Cy", org="Acme", place="Madrid", skills="Python, Kafka")
+    g.add_person("Ana", place="Lima", skills="Go")
+    g.merge_nodes("Ana", ["Bo"])
+    assert g.filter_people(skills="python", place="Madrid") == ["Ana", "Cy"]
+    assert g.filter_people(skills="go", place="Lima") == ["Ana"]
+    assert view.filter_people(skills="go", place="Lima") == []
+
+    assert view.persons_with_skill("PYTHON") == ["Ana", "Bo"]
+    assert view.persons_with_skill("pyhton", match="fuzzy") == ["Ana", "Bo"]
+    assert view.match_skills("kaf", match="prefix") == ["kafka"]
+    assert view.people_linked_to("Acme") == {"Ana", "Bo"}
+    assert view.people_linked_to("Lima") == set()
+    assert view.filter_people(skills="python", place="Madrid") == ["Ana"]
+    assert view.filter_people(org="Acme", account="Bank") == ["Bo"]
+    assert view.filter_people() == []
+    profiles = view.search_person_profiles("kafka")
+    assert profiles == {
+        "Ana": {
+            "label": "Ana",
+            "role": "Lead",
+            "skills": "Python, Kafka",
+            "notes": "",
+            "place": ["Madrid"],
+            "org": ["Acme"],
+            "account": [],
+        }
+    }
+    assert view.get_person_profiles(["Bo", "Cy", "Acme"])["Bo"]["account"] == ["Bank"]
+    assert set(view.get_person_profiles(["Bo", "Cy", "Acme"])) == {"Bo"}
+
+
+def test_undo_journaled(tmp_path):
+    """
+    Test function to verify that undone changes are journaled, so that a reloaded graph matches.
+    """
+    path = tmp_path / "test_undo_journaled.pqa"
+    g = ConnectionGraph()
+    loaded = None
+    try:
+        g.add_person("Ana", org="Acme")
+        save_graph(g, path, compact=True)
+        g.enable_history()
+        g.add_person("Bo", org="Acme")
+        g.add_person("Cy", place="Madrid")
+        g.undo()
+        g.clear()
+        g.undo()
+        save_graph(g, path)
+        loaded = load_graph(path)
+        assert set(loaded.nodes) == set(g.nodes) == {"Ana", "Bo", "Acme"}
+        assert set(loaded.edges) == set(g.edges)
+    finally:
+        if loaded is not None:
+            loaded.detach_journal()
+        g.detach_journal()
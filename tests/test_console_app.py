@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from pathlib import Path
+
+CONSOLE_APP = Path(__file__).resolve().parent.parent / "console-app.py"
+
+
+def test_console_app_defers_graph_imports():
+    """
+    Test function to verify that loading the console tool does not import networkx or the graph code.
+    """
+    script = (
+        "import importlib.util, sys; "
+        f"spec = importlib.util.spec_from_file_location('console_app', {str(CONSOLE_APP)!r}); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec)); "
+        "print(sorted(m for m in ('networkx', 'numpy', 'pequenaarana.connection_graph') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,153 @@
+import networkx as nx
+import pytest
+from pathlib import Path
+from pequenaarana import csr_graph
+from pequenaarana.connection_graph import (
+    ConnectionGraph,
+    import_graph_from_snapshot_file,
+    load_graph,
+    save_graph,
+)
+from pequenaarana.csr_graph import CSRDiGraph
+from pequenaarana.snapshot import write_snapshot
+
+
+def _build(graph):
+    graph.add_node("Jane Roe", kind="PERSON", skills="Python")
+    graph.add_nodes_from([("Company", {"kind": "ORGANIZATION"}), "Madrid"])
+    graph.add_edge("Jane Roe", "Company", label="ASSOCWITH", kind="ASSOCWITH")
+    graph.add_edges_from(
+        [
+            ("Jane Roe", "Madrid", {"label": "BASEDIN", "kind": "BASEDIN"}),
+            ("John Doe", "Company", {"label": "ASSOCWITH", "kind": "ASSOCWITH"}),
+        ]
+    )
+    graph.add_edge("John Doe", "Company", since=2019)
+    graph.nodes["Madrid"]["kind"] = "PLACE"
+    return graph
+
+
+def test_csr_graph_matches_networkx():
+    """
+    Test function to verify that CSRDiGraph answers the same queries as nx.DiGraph.
+    """
+    expected = _build(nx.DiGraph())
+    graph = _build(CSRDiGraph())
+
+    assert graph.nodes == expected.nodes
+    assert dict(graph.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert dict(graph.edges) == dict(expected.edges)
+    assert sorted(graph.edges(data="kind")) == sorted(expected.edges(data="kind"))
+    assert graph["Jane Roe"] == dict(expected["Jane Roe"])
+    assert sorted(graph.predecessors("Company")) == ["Jane Roe", "John Doe"]
+    assert graph.successors("John Doe") == ["Company"]
+    assert ("Company", "Jane Roe") not in graph.edges
+    assert len(graph.edges) == 3
+
+
+def test_csr_graph_merges_pending_edges(monkeypatch):
+    """
+    Test function to verify that edges survive merges into the CSR arrays, updates and removals.
+    """
+    monkeypatch.setattr(csr_graph, "MERGE_MIN_PENDING", 4)
+    graph = CSRDiGraph()
+    for i in range(20):
+        graph.add_edge(f"p{i}", f"o{i % 3}", label="ASSOCWITH", kind="ASSOCWITH")
+    assert graph._pending_count < 20
+
+    graph.add_edge("p0", "o0", label="BASEDIN", kind="BASEDIN")
+    graph.remove_edge("p1", "o1")
+    graph.remove_node("o2")
+    graph._merge()
+
+    assert graph.edges["p0", "o0"] == {"label": "BASEDIN", "kind": "BASEDIN"}
+    assert ("p1", "o1") not in graph.edges
+    assert "o2" not in graph.nodes
+    assert sorted(graph.predecessors("o1")) == ["p10", "p13", "p16", "p19", "p4", "p7"]
+    assert len(graph.edges) == len(list(graph.edges)) == 13
+    with pytest.raises(KeyError):
+        graph.remove_edge("p1", "o1")
+
+
+def test_connection_graph_csr_backend():
+    """
+    Test function to verify that ConnectionGraph works the same on the CSR backend, including saving and loading.
+    """
+    graph = ConnectionGraph({"name": "team"}, backend="csr")
+    graph.add_person("Jane Roe", org="Company", place="Madrid", skills="Python, Go")
+    graph.add_people([{"name": "John Doe", "org": "Company", "skills": "Go"}])
+    assert graph.backend == "csr"
+
+    records, neighbors = graph.search_for_person_with_skill("go")
+    assert set(records) == {"Jane Roe", "John Doe"}
+    assert set(neighbors["Jane Roe"]) == {"Company", "Madrid"}
+
+    filename = Path("/tmp/graph_backend.pqa")
+    save_graph(graph, filename)
+    loaded = load_graph(filename, backend="csr")
+    assert loaded.backend == "csr"
+    assert loaded.nodes == graph.nodes
+    assert dict(loaded.edges) == dict(graph.edges)
+    assert dict(load_graph(filename).edges) == dict(graph.edges)
+
+
+@pytest.mark.parametrize("graph_type", [nx.DiGraph, CSRDiGraph])
+def test_edge_attributes_write_through(graph_type):
+    """
+    Test function to verify that edge attributes can be changed in place on both backends.
+    """
+    graph = _build(graph_type())
+    graph.edges["Jane Roe", "Company"]["since"] = 2020
+    graph.edges["Jane Roe", "Company"]["kind"] = "ONACCOUNT"
+    del graph.edges["Jane Roe", "Madrid"]["label"]
+    graph.edges["John Doe", "Company"]["since"] += 1
+
+    assert dict(graph.edges["Jane Roe", "Company"]) == {
+        "label": "ASSOCWITH",
+        "kind": "ONACCOUNT",
+        "since": 2020,
+    }
+    assert dict(graph.edges["Jane Roe", "Madrid"]) == {"kind": "BASEDIN"}
+    assert graph.edges["John Doe", "Company"]["since"] == 2020
+    assert sorted(graph.edges(data="kind")) == [
+        ("Jane Roe", "Company", "ONACCOUNT"),
+        ("Jane Roe", "Madrid", "BASEDIN"),
+        ("John Doe", "Company", "ASSOCWITH"),
+    ]
+    assert len(graph.edges) == 3
+
+
+def test_csr_graph_from_snapshot_columns():
+    """
+    Test function to verify that a CSR graph built from snapshot columns matches one loaded into networkx.
+    """
+    filename = Path("/tmp/graph_columns.pqa")
+    write_snapshot(
+        filename,
+        {"name": "team"},
+        [
+            ("Jane Roe", {"kind": "PERSON", "skills": "Python"}),
+            ("Company", {"kind": "ORGANIZATION"}),
+            ("Madrid", {}),
+            ("John Doe", {"kind": "PERSON"}),
+        ],
+        [
+            ("Jane Roe", "Company", {"label": "ASSOCWITH", "kind": "ASSOCWITH"}),
+            ("Jane Roe", "Madrid", {"label": "lives in", "kind": "BASEDIN"}),
+            ("John Doe", "Company", {"kind": "ASSOCWITH", "since": 2019}),
+            ("John Doe", "Madrid", {"label": "visits"}),
+        ],
+    )
+    expected = import_graph_from_snapshot_file(filename)
+    loaded = import_graph_from_snapshot_file(filename, backend="csr")
+
+    assert loaded.graph == {"name": "team"}
+    assert dict(loaded.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert sorted(loaded.edges(data=True)) == sorted(expected.edges(data=True))
+    assert sorted(loaded._internal_graph.predecessors("Company")) == [
+        "Jane Roe",
+        "John Doe",
+    ]
+    loaded.add_person("Ana", org="Company")
+    assert loaded.edges["Ana", "Company"]["kind"] == "ASSOCWITH"
+    assert len(loaded.edges) == 5
@@ -0,0 +1,39 @@
+from pequenaarana.entity_resolution import find_duplicates, normalize_label
+
+
+def test_normalize_label():
+    """
+    Test function to verify that labels lose case, punctuation and legal suffixes.
+    """
+    assert normalize_label("Acme, Inc.") == "acme"
+    assert normalize_label("  Globex   Corp ") == "globex"
+    assert normalize_label("Inc.") == "inc"
+    assert normalize_label("...") == "..."
+
+
+def test_find_duplicates():
+    """
+    Test function to verify that near-duplicate labels are grouped and distinct ones kept apart.
+    """
+    labels = [
+        "Acme Inc",
+        "ACME",
+        "Acme, Inc.",
+        "Globex",
+        "Glboex",
+        "Initech",
+        "Initech Systems",
+        "Umbrella Corporation",
+        "Umbrela Corporation",
+        "Team 1",
+        "Team 2",
+        "IBM",
+        "IMB",
+    ]
+    assert find_duplicates(labels) == [
+        ["ACME", "Acme Inc", "Acme, Inc."],
+        ["Glboex", "Globex"],
+        ["Umbrela Corporation", "Umbrella Corporation"],
+    ]
+    assert find_duplicates(["Team 1", "Team 1"]) == [["Team 1", "Team 1"]]
+    assert find_duplicates([]) == []
@@ -0,0 +1,78 @@
+import networkx as nx
+from pathlib import Path
+from pequenaarana.graphml_stream import iter_graphml, write_graphml
+
+GRAPHML = """<?xml version='1.0' encoding='utf-8'?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="kind" attr.type="string" />
+  <key id="d1" for="node" attr.name="size" attr.type="double">
+    <default>5.0</default>
+  </key>
+  <key id="d2" for="node" attr.name="r" attr.type="long" />
+  <key id="d3" for="edge" attr.name="kind" attr.type="string" />
+  <key id="d4" for="graph" attr.name="name" attr.type="string" />
+  <key id="d5" for="node" attr.name="active" attr.type="boolean" />
+  <graph edgedefault="directed">
+    <data key="d4">team</data>
+    <node id="Jane Roe">
+      <data key="d0">PERSON</data>
+      <data key="d2">217</data>
+      <data key="d5">true</data>
+    </node>
+    <node id="ACME"><data key="d0">ACCOUNT</data><data key="d1">12.5</data></node>
+    <edge source="Jane Roe" target="ACME"><data key="d3">ONACCOUNT</data></edge>
+  </graph>
+</graphml>
+"""
+
+
+def test_iter_graphml_decodes_elements():
+    """
+    Test function to verify that streamed GraphML elements are decoded with their declared types and defaults.
+    """
+    filename = Path("/tmp/stream_test.graphml")
+    filename.write_text(GRAPHML, encoding="utf-8")
+    progress = []
+
+    elements = list(
+        iter_graphml(filename, progress=lambda *args: progress.append(args))
+    )
+
+    assert elements == [
+        ("graph", {"name": "team"}),
+        ("node", "Jane Roe", {"kind": "PERSON", "size": 5.0, "r": 217, "active": True}),
+        ("node", "ACME", {"kind": "ACCOUNT", "size": 12.5}),
+        ("edge", "Jane Roe", "ACME", {"kind": "ONACCOUNT"}),
+    ]
+    size = filename.stat().st_size
+    assert progress[-1] == (size, size)
+
+
+def test_write_graphml_round_trip():
+    """
+    Test function to verify that streamed GraphML output can be read back, compressed or not.
+    """
+    nodes = [
+        (
+            "Jane <Roe>",
+            {"kind": "PERSON", "skills": "C++ & Go", "r": 217, "size": 10.0},
+        ),
+        ("ACME", {"kind": "ACCOUNT", "active": False}),
+    ]
+    edges = [("Jane <Roe>", "ACME", {"kind": "ONACCOUNT"})]
+
+    for filename in (
+        Path("/tmp/write_test.graphml"),
+        Path("/tmp/write_test.graphml.gz"),
+    ):
+        write_graphml(filename, {"name": "team"}, nodes, edges)
+        assert list(iter_graphml(filename)) == [
+            ("graph", {"name": "team"}),
+            ("node", *nodes[0]),
+            ("node", *nodes[1]),
+            ("edge", *edges[0]),
+        ]
+
+    assert Path("/tmp/write_test.graphml.gz").read_bytes()[:2] == b"\x1f\x8b"
+    networkx_graph = nx.read_graphml("/tmp/write_test.graphml")
+    assert networkx_graph.nodes["Jane <Roe>"]["skills"] == "C++ & Go"
@@ -0,0 +1,52 @@
+import json
+import pytest
+from pathlib import Path
+from pequenaarana import instrumentation
+from pequenaarana.connection_graph import ConnectionGraph, load_graph
+from pequenaarana.instrumentation import OperationStats, add_hook, remove_hook
+
+
+def test_instrumentation_hooks():
+    """
+    Test function to verify that hooks see the start and end of every instrumented operation, including through names imported earlier.
+    """
+    stats = OperationStats()
+    spans = []
+    starts = []
+    add_hook(stats)
+    add_hook(lambda *span: spans.append(span), lambda *start: starts.append(start))
+    try:
+        g = ConnectionGraph()
+        g.add_person("Jane Roe", org="Company", skills="Python")
+        g.search_for_person_with_skill("python")
+        with pytest.raises(FileNotFoundError):
+            load_graph(Path("/tmp/missing-graph.pqa"))
+    finally:
+        for hook, _ in list(instrumentation._hooks):
+            remove_hook(hook)
+    g.add_node("Madrid", "PLACE")
+    with pytest.raises(ValueError):
+        remove_hook(stats)
+
+    assert [start[0] for start in starts[:4]] == [
+        "ConnectionGraph.add_person",
+        "ConnectionGraph.add_node",
+        "ConnectionGraph.add_node",
+        "ConnectionGraph.add_edge",
+    ]
+    assert starts[0][1] == spans[3][1]
+    assert [span[0] for span in spans[:4]] == [
+        "ConnectionGraph.add_node",
+        "ConnectionGraph.add_node",
+        "ConnectionGraph.add_edge",
+        "ConnectionGraph.add_person",
+    ]
+    result = stats.as_dict()
+    assert result["ConnectionGraph.add_node"]["count"] == 2
+    assert result["ConnectionGraph.search_for_person_with_skill"]["count"] == 1
+    assert result["load_graph"]["errors"] == 1
+    assert sum(result["ConnectionGraph.add_node"]["histogram_us"].values()) == 2
+
+    path = Path("/tmp/operation_stats.json")
+    stats.write_json(path)
+    assert json.loads(path.read_text()) == result
@@ -0,0 +1,139 @@
+import pytest
+from pathlib import Path
+from pequenaarana.connection_graph import (
+    ConnectionGraph,
+    has_unsaved_changes,
+    load_graph,
+    save_graph,
+)
+from pequenaarana.journal import GraphJournal
+
+
+def _fresh_path(name: str) -> Path:
+    path = Path("/tmp") / name
+    for stale in (path, GraphJournal.journal_path(path)):
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def test_save_appends_to_journal_instead_of_rewriting():
+    """
+    Test function to verify that saving a loaded graph only commits its journal.
+    """
+    path = _fresh_path("journaled.pqa")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company", skills="Python")
+    save_graph(graph, path)
+    written = path.stat().st_mtime_ns
+
+    graph.add_person("John Doe", org="Company", skills="Scala")
+    graph.add_people([{"name": "Max Mustermann", "place": "Madrid"}])
+    save_graph(graph, path)
+    graph.detach_journal()
+
+    assert path.stat().st_mtime_ns == written
+    loaded = load_graph(path)
+    assert loaded.nodes == graph.nodes
+    assert dict(loaded.edges) == dict(graph.edges)
+    records, _ = loaded.search_for_person_with_skill("scala")
+    assert set(records) == {"John Doe"}
+    loaded.detach_journal()
+
+
+def test_unsaved_changes_can_be_recovered():
+    """
+    Test function to verify that changes recorded but never saved survive until recovered or discarded.
+    """
+    path = _fresh_path("recoverable.graphml")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company")
+    save_graph(graph, path)
+    graph.add_person("John Doe", account="ACME")
+    graph.add_edges([("Jane Roe", "ACME", "ONACCOUNT")])
+    # Simulate a crash: the journal is left behind without a commit.
+    assert has_unsaved_changes(path)
+
+    recovered = load_graph(path, recover_unsaved=True)
+    assert ("Jane Roe", "ACME") in recovered.edges
+    assert "John Doe" in recovered.nodes
+    recovered.detach_journal(discard_unsaved=True)
+
+    assert not has_unsaved_changes(path)
+    assert "John Doe" not in load_graph(path).nodes
+
+
+def test_compaction_rewrites_file_and_resets_journal():
+    """
+    Test function to verify that compacting folds the journal into the graph file.
+    """
+    path = _fresh_path("compacted.pqa")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe")
+    save_graph(graph, path)
+    graph.clear()
+    graph.add_person("John Doe")
+    save_graph(graph, path, compact=True)
+
+    assert GraphJournal.read(path) == ([], [])
+    assert set(load_graph(path).nodes) == {"John Doe"}
+
+
+def test_stale_journal_is_ignored():
+    """
+    Test function to verify that a journal is ignored once its graph file is replaced.
+    """
+    path = _fresh_path("stale.pqa")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe")
+    save_graph(graph, path)
+    graph.add_person("John Doe")
+    save_graph(graph, path)
+
+    other = ConnectionGraph()
+    other.add_node("Company", "ORGANIZATION")
+    save_graph(other, Path("/tmp/stale_other.pqa"))
+    Path("/tmp/stale_other.pqa").replace(path)
+
+    assert set(load_graph(path).nodes) == {"Company"}
+
+
+def test_save_rewrites_missing_file():
+    """
+    Test function to verify that saving rewrites the graph file in full if it was deleted since the last save.
+    """
+    path = _fresh_path("deleted.pqa")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company", skills="Python")
+    save_graph(graph, path)
+    path.unlink()
+
+    graph.add_person("John Doe", org="Company", skills="Scala")
+    save_graph(graph, path)
+    graph.detach_journal()
+
+    loaded = load_graph(path)
+    assert loaded.nodes == graph.nodes
+    loaded.detach_journal()
+
+
+def test_unserializable_change_is_not_applied():
+    """
+    Test function to verify that a change that cannot be journaled leaves the graph untouched.
+    """
+    path = _fresh_path("unserializable.pqa")
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", org="Company")
+    save_graph(graph, path)
+
+    with pytest.raises(TypeError):
+        graph.add_edge("Jane Roe", "Madrid", "BASEDIN", keys={"since": {1, 2}})
+    with pytest.raises(TypeError):
+        graph.add_node("Madrid", "PLACE", keys={"since": {1, 2}})
+    assert "Madrid" not in graph.nodes
+    save_graph(graph, path)
+    graph.detach_journal()
+
+    loaded = load_graph(path)
+    assert loaded.nodes == graph.nodes
+    assert dict(loaded.edges) == dict(graph.edges)
+    loaded.detach_journal()
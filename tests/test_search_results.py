@@ -0,0 +1,59 @@
+from pequenaarana.connection_graph import ConnectionGraph
+
+
+def test_search_results_pages():
+    """
+    Test function to verify that search results are ordered and resolved page by page.
+    """
+    graph = ConnectionGraph()
+    for i in range(100):
+        graph.add_person(f"person-{i:03d}", org=f"org-{i % 3}", skills="Python")
+    graph.add_person("zed", skills="Go")
+
+    results = graph.search_people("python", page_size=8)
+    assert len(results) == 100
+    assert results.page_count == 13
+    first = results.page(0)
+    assert [profile["label"] for profile in first] == [
+        f"person-{i:03d}" for i in range(8)
+    ]
+    assert first[1]["org"] == ["org-1"]
+    assert len(results._ordered) < 100
+    assert [profile["label"] for profile in results.page(12)] == [
+        f"person-{i:03d}" for i in range(96, 100)
+    ]
+    assert results.page(13) == []
+    assert [profile["label"] for profile in results] == sorted(
+        f"person-{i:03d}" for i in range(100)
+    )
+
+
+def test_search_results_modes():
+    """
+    Test function to verify that search_people supports the partial and boolean match modes.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Jane Roe", skills="Python, Spark")
+    graph.add_person("John Doe", skills="Pytorch")
+    assert len(graph.search_people("py", match="prefix")) == 2
+    assert [p["label"] for p in graph.search_people("spark OR pytorch", "boolean")] == [
+        "Jane Roe",
+        "John Doe",
+    ]
+    assert len(graph.search_people("cobol")) == 0
+    assert graph.search_people("cobol").page_count == 1
+
+
+def test_search_results_by_centrality():
+    """
+    Test function to verify that search results can be ordered by centrality, best connected first.
+    """
+    graph = ConnectionGraph()
+    graph.add_person("Ana", org="Acme", skills="Python")
+    graph.add_person(
+        "Bo", org="Acme", place="Madrid", account="Globex", skills="Python"
+    )
+    graph.add_person("Cy", skills="Python")
+    graph.add_person("Ed", place="Madrid", account="Globex")
+    results = graph.search_people("python", order="centrality")
+    assert [profile["label"] for profile in results] == ["Bo", "Ana", "Cy"]
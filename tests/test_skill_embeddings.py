@@ -0,0 +1,53 @@
+import numpy as np
+from pequenaarana.skill_embeddings import SkillEmbeddings, _top_eigenpairs
+
+SKILL_SETS = [
+    ("ml", "pytorch", "python"),
+    ("ml", "tensorflow"),
+    ("machine learning", "pytorch", "tensorflow"),
+    ("machine learning", "python", "pytorch"),
+    ("java", "spring"),
+    ("java", "kotlin", "spring"),
+    ("kotlin", "android"),
+    ("spring", "hibernate", "java"),
+    ("excel", "accounting"),
+    ("accounting", "sap"),
+    ("excel", "sap"),
+]
+
+
+def test_skill_embeddings_train_and_save():
+    """
+    Test function to verify that skills listed in similar company get similar vectors, and that embeddings round-trip through a file.
+    """
+    embeddings = SkillEmbeddings.train(SKILL_SETS, dimensions=4)
+    assert embeddings.vectors.shape == (13, 4)
+    assert embeddings.vectors.dtype == "float32"
+    similar = [skill for skill, _ in embeddings.most_similar(["ml"], k=5)]
+    assert "machine learning" in similar and "pytorch" in similar
+    assert "java" not in similar and "excel" not in similar
+    assert embeddings.most_similar(["cobol"]) == []
+
+    retrained = SkillEmbeddings.train(
+        SKILL_SETS + [("ml", "keras")], dimensions=4, previous=embeddings
+    )
+    assert retrained.skills[:13] == embeddings.skills
+    assert "keras" in retrained
+
+    path = SkillEmbeddings.path_for("/tmp/test_embeddings.pqa")
+    embeddings.save(path)
+    loaded = SkillEmbeddings.load(path)
+    assert loaded.skills == embeddings.skills
+    assert (loaded.vectors == embeddings.vectors).all()
+
+
+def test_top_eigenpairs_ranks_by_magnitude():
+    """
+    Test function to verify that the solver keeps the eigenpairs of largest magnitude, negative ones included.
+    """
+    rows = np.array([0, 1, 2, 3, 4])
+    cols = np.array([1, 0, 2, 3, 4])
+    values = np.array([5.0, 5.0, 1.0, 0.5, 0.25])
+    eigenvalues, eigenvectors = _top_eigenpairs(rows, cols, values, 5, 2)
+    assert np.allclose(sorted(eigenvalues), [-5.0, 5.0])
+    assert np.allclose(np.abs(eigenvectors[2:]), 0.0)
@@ -0,0 +1,55 @@
+from pequenaarana.skill_index import SkillIndex, SkillVocabulary
+
+
+def test_split_skills():
+    """
+    Test function to verify that CSV skill strings are normalized.
+    """
+    assert SkillIndex.split_skills(" Python,SPARK , ,python") == ["python", "spark"]
+    assert SkillIndex.split_skills(None) == []
+
+
+def test_vocabulary_partial_matches():
+    """
+    Test function to verify prefix and substring lookups over the skill vocabulary.
+    """
+    vocabulary = SkillVocabulary()
+    for skill in ["kubernetes", "kafka", "postgresql", "sql", "python"]:
+        vocabulary.add(skill)
+
+    assert vocabulary.prefix("kube") == ["kubernetes"]
+    assert vocabulary.prefix("k") == ["kafka", "kubernetes"]
+    assert vocabulary.substring("sql") == ["postgresql", "sql"]
+    assert vocabulary.substring("s") == ["kubernetes", "postgresql", "sql"]
+
+    vocabulary.discard("sql")
+    assert vocabulary.substring("sql") == ["postgresql"]
+
+
+def test_vocabulary_similar_matches():
+    """
+    Test function to verify edit-distance lookups, including transpositions.
+    """
+    vocabulary = SkillVocabulary()
+    for skill in ["python", "typescript", "java", "javascript"]:
+        vocabulary.add(skill)
+
+    assert vocabulary.similar("pyhton") == [("python", 1)]
+    assert vocabulary.similar("jav") == [("java", 1)]
+    assert vocabulary.similar("javascrpt") == [("javascript", 1)]
+    assert vocabulary.similar("rust") == []
+
+
+def test_index_keeps_vocabulary_in_sync():
+    """
+    Test function to verify that skills leave the vocabulary once nobody has them.
+    """
+    index = SkillIndex()
+    index.add("Jane Roe", "Python, Kubernetes")
+    index.add("John Doe", "python")
+    assert index.match_skills("kube", match="prefix") == ["kubernetes"]
+
+    index.add("Jane Roe", "Scala")
+    assert index.match_skills("kube", match="prefix") == []
+    assert index.match_skills("pyton", match="fuzzy") == ["python"]
+    assert index.match_skills("pyton", match="unknown") == []
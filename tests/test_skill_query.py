@@ -0,0 +1,72 @@
+import pytest
+from pequenaarana.skill_index import SkillIndex
+from pequenaarana.skill_query import (
+    estimate_cost,
+    evaluate_skill_query,
+    parse_skill_query,
+)
+
+
+def _index():
+    index = SkillIndex()
+    index.add("Jane Roe", "Python, Spark, Machine Learning")
+    index.add("John Doe", "Scala, Spark, Junior")
+    index.add("Max Mustermann", "Scala, Spark")
+    index.add("Erika Mustermann", "Python, Kubernetes, Research and Development")
+    index.add("Juan Perez", "")
+    return index
+
+
+def test_parse_skill_query():
+    """
+    Test function to verify operator precedence, multi-word skills, quoting and prefixes.
+    """
+    assert parse_skill_query("(python OR scala) AND spark AND NOT junior") == (
+        "and",
+        (
+            ("or", (("skill", "python"), ("skill", "scala"))),
+            ("skill", "spark"),
+            ("not", ("skill", "junior")),
+        ),
+    )
+    assert parse_skill_query("Machine Learning or kube*") == (
+        "or",
+        (("skill", "machine learning"), ("prefix", "kube")),
+    )
+    assert parse_skill_query('"research and development"') == (
+        "skill",
+        "research and development",
+    )
+    assert parse_skill_query("a or b and c")[1][1][0] == "and"
+
+
+@pytest.mark.parametrize(
+    "query", ["", "python AND", "(python", "python)", "NOT", 'say "hi', "AND go"]
+)
+def test_parse_skill_query_rejects_malformed_queries(query):
+    """
+    Test function to verify that malformed queries raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        parse_skill_query(query)
+
+
+def test_evaluate_skill_query():
+    """
+    Test function to verify that boolean queries match the expected persons.
+    """
+    index = _index()
+
+    def run(query):
+        return evaluate_skill_query(parse_skill_query(query), index)
+
+    assert run("(python OR scala) AND spark AND NOT junior") == {
+        "Jane Roe",
+        "Max Mustermann",
+    }
+    assert run("NOT spark") == {"Erika Mustermann", "Juan Perez"}
+    assert run("NOT spark AND NOT kube*") == {"Juan Perez"}
+    assert run("kube* OR machine learning") == {"Jane Roe", "Erika Mustermann"}
+    assert run("cobol AND python") == set()
+    assert run('"research and development"') == {"Erika Mustermann"}
+    assert estimate_cost(parse_skill_query("spark AND junior"), index) == 1
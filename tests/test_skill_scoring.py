@@ -0,0 +1,45 @@
+import pytest
+from pequenaarana.skill_scoring import SkillMatrix, idf_weights
+
+
+def test_skill_matrix_scores_rows():
+    """
+    Test function to verify that the matrix-vector product scores each person.
+    """
+    matrix = SkillMatrix()
+    matrix.update("Jane Roe", ("python", "spark"))
+    matrix.update("John Doe", ("python",))
+    matrix.update("Max Mustermann", ("java",))
+
+    results = matrix.top_k({"python": 0.5, "spark": 0.5}, k=None)
+    assert results == [("Jane Roe", 1.0), ("John Doe", 0.5)]
+    assert matrix.top_k({"python": 0.5, "spark": 0.5}, k=1) == [("Jane Roe", 1.0)]
+
+
+def test_skill_matrix_updates_and_compaction():
+    """
+    Test function to verify that updated and removed people are reflected in the scores.
+    """
+    matrix = SkillMatrix()
+    for i in range(200):
+        matrix.update(f"person{i:03}", ("python",))
+    matrix.top_k({"python": 1.0})
+    for i in range(150):
+        matrix.update(f"person{i:03}", ("scala",))
+    matrix.discard("person199")
+
+    assert len(matrix.top_k({"python": 1.0}, k=None)) == 49
+    assert len(matrix.top_k({"scala": 1.0}, k=None)) == 150
+    assert matrix.top_k({"scala": 1.0}, k=2) == [
+        ("person000", 1.0),
+        ("person001", 1.0),
+    ]
+
+
+def test_idf_weights_favor_rare_skills():
+    """
+    Test function to verify that rarer skills receive larger, normalized weights.
+    """
+    weights = idf_weights(["python", "spark"], [90, 3], total=100)
+    assert weights["spark"] > weights["python"]
+    assert sum(weights.values()) == pytest.approx(1.0)
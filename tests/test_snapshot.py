@@ -0,0 +1,59 @@
+import pytest
+from pathlib import Path
+from pequenaarana.snapshot import is_snapshot_file, read_snapshot, write_snapshot
+
+
+def test_snapshot_round_trip():
+    """
+    Test function to verify that typed and missing attributes survive a snapshot round trip.
+    """
+    filename = Path("/tmp/round_trip.pqa")
+    nodes = [
+        ("Jane Roe", {"kind": "PERSON", "r": 217, "size": 10.0, "active": True}),
+        ("ACME", {"kind": "ACCOUNT", "active": False, "note": None}),
+        ("Zürich", {"kind": "PLACE", "mixed": 5}),
+        ("Bern", {"kind": "PLACE", "mixed": "five"}),
+        ("Basel", {"kind": "PLACE", "mixed": 5.5}),
+        ("Lu\0gano", {"kind": "PLACE", "mixed": False}),
+    ]
+    edges = [
+        ("Jane Roe", "ACME", {"kind": "ONACCOUNT", "since": 2019}),
+        ("Jane Roe", "Lu\0gano", {"kind": "BASEDIN", "since": "2019"}),
+    ]
+
+    write_snapshot(filename, {"name": "team"}, nodes, edges)
+    graph_attributes, read_nodes, read_edges = read_snapshot(filename)
+
+    assert graph_attributes == {"name": "team"}
+    assert read_nodes == [
+        ("Jane Roe", {"kind": "PERSON", "r": 217, "size": 10.0, "active": True}),
+        ("ACME", {"kind": "ACCOUNT", "active": False}),
+        ("Zürich", {"kind": "PLACE", "mixed": 5}),
+        ("Bern", {"kind": "PLACE", "mixed": "five"}),
+        ("Basel", {"kind": "PLACE", "mixed": 5.5}),
+        ("Lu\0gano", {"kind": "PLACE", "mixed": False}),
+    ]
+    assert [type(attributes["mixed"]) for _, attributes in read_nodes[2:]] == [
+        int,
+        str,
+        float,
+        bool,
+    ]
+    assert read_edges == edges
+    assert is_snapshot_file(filename)
+
+
+def test_read_snapshot_rejects_other_files():
+    """
+    Test function to verify that files without the snapshot header are rejected.
+    """
+    filename = Path("/tmp/not_a_snapshot.pqa")
+    filename.write_text("<graphml/>", encoding="utf-8")
+    assert not is_snapshot_file(filename)
+    with pytest.raises(ValueError):
+        read_snapshot(filename)
+
+    filename.write_bytes(b"PQARANA\x01")
+    assert is_snapshot_file(filename)
+    with pytest.raises(ValueError, match="version"):
+        read_snapshot(filename)
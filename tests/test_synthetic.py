@@ -0,0 +1,32 @@
+from collections import Counter
+
+from pequenaarana.synthetic import generate_graph, generate_people, skill_name
+
+
+def test_generate_people():
+    """
+    Test function to verify that synthetic people are reproducible and their skills Zipf-distributed.
+    """
+    people = list(generate_people(2000, skills=100, orgs=10, places=5, seed=1))
+    assert people == list(generate_people(2000, skills=100, orgs=10, places=5, seed=1))
+    assert people != list(generate_people(2000, skills=100, orgs=10, places=5, seed=2))
+    assert len({person["name"] for person in people}) == 2000
+    assert len({person["org"] for person in people}) <= 10
+
+    counts = Counter(
+        skill for person in people for skill in person["skills"].split(", ")
+    )
+    assert set(counts) <= {skill_name(rank) for rank in range(100)}
+    assert counts[skill_name(0)] > 5 * counts[skill_name(20)]
+
+
+def test_generate_graph():
+    """
+    Test function to verify that a synthetic graph follows the schema and can be searched.
+    """
+    g = generate_graph(500, backend="csr", account_share=1)
+    kinds = Counter(kind for _, kind in g.nodes(data="kind"))
+    assert kinds["PERSON"] == 500
+    assert set(kinds) == {"PERSON", "ORGANIZATION", "PLACE", "ACCOUNT"}
+    assert len(g.edges) == 1500
+    assert g.search_for_person_with_skill(skill_name(0))[0]